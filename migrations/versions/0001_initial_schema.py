@@ -0,0 +1,82 @@
+"""Initial schema: products, attributes, visual assets and readiness masks.
+
+Databases created by ``Base.metadata.create_all`` before migrations existed
+already have these tables; mark them with ``alembic stamp 0001``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=True)
+    )
+    op.create_index("ix_products_id", "products", ["id"])
+    op.create_index("ix_products_product_id", "products", ["product_id"], unique=True)
+    
+    op.create_table(
+        "product_attributes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("attribute_name", sa.String(), nullable=False),
+        sa.Column("attribute_type", sa.String(), nullable=False),
+        sa.Column("attribute_value", sa.Text(), nullable=False),
+        sa.Column("unit", sa.String(), nullable=True),
+        sa.Column("display_name", sa.String(), nullable=True)
+    )
+    op.create_index("ix_product_attributes_id", "product_attributes", ["id"])
+    
+    op.create_table(
+        "visual_assets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("asset_type", sa.String(), nullable=False),
+        sa.Column("asset_url", sa.String(), nullable=False),
+        sa.Column("asset_metadata", sa.JSON(), nullable=True)
+    )
+    op.create_index("ix_visual_assets_id", "visual_assets", ["id"])
+    
+    op.create_table(
+        "readiness_vocabulary",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("bit", sa.Integer(), nullable=False),
+        sa.UniqueConstraint("kind", "name"),
+        sa.UniqueConstraint("kind", "bit")
+    )
+    op.create_index("ix_readiness_vocabulary_id", "readiness_vocabulary", ["id"])
+    
+    op.create_table(
+        "product_readiness",
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), primary_key=True),
+        sa.Column("asset_mask", sa.Text(), nullable=False),
+        sa.Column("attribute_mask", sa.Text(), nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_table("product_readiness")
+    op.drop_index("ix_readiness_vocabulary_id", table_name="readiness_vocabulary")
+    op.drop_table("readiness_vocabulary")
+    op.drop_index("ix_visual_assets_id", table_name="visual_assets")
+    op.drop_table("visual_assets")
+    op.drop_index("ix_product_attributes_id", table_name="product_attributes")
+    op.drop_table("product_attributes")
+    op.drop_index("ix_products_product_id", table_name="products")
+    op.drop_index("ix_products_id", table_name="products")
+    op.drop_table("products")
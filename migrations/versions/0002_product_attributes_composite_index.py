@@ -0,0 +1,27 @@
+"""Composite index on product_attributes(product_id, attribute_name).
+
+Serves attribute lookups by product and the attribute coverage aggregate.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_product_attributes_product_id_attribute_name",
+        "product_attributes",
+        ["product_id", "attribute_name"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_product_attributes_product_id_attribute_name", table_name="product_attributes")
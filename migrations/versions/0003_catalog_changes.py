@@ -0,0 +1,37 @@
+"""Catalog change log for delta sync (GET /products/changes).
+
+Existing products are logged as upserts, so replicas syncing from
+generation 0 receive the whole catalog.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "catalog_changes",
+        sa.Column("seq", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("product_id", sa.String(), nullable=False),
+        sa.Column("change", sa.String(), nullable=False),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_catalog_changes_product_id", "catalog_changes", ["product_id"])
+    op.execute(
+        "INSERT INTO catalog_changes (product_id, change) "
+        "SELECT product_id, 'upsert' FROM products ORDER BY id"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_catalog_changes_product_id", table_name="catalog_changes")
+    op.drop_table("catalog_changes")
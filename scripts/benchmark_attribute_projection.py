@@ -0,0 +1,91 @@
+"""Benchmark rows and bytes fetched per intent plan with and without attribute projection."""
+import sys
+import os
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base
+from src.schemas.product import ProductCreate
+from src.data.product_service import ProductService
+from src.intents.intent_mappings import INTENT_MAPPINGS
+
+XLSX_PATH = os.path.join(os.path.dirname(__file__), '..', 'Product Attributes- Phase 3 Akari.xlsx')
+
+
+def load_workbook_products(extra_attributes=0):
+    """Parse the Akari workbook, optionally padding each product with filler columns."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        from update_from_xlsx import parse_xlsx
+        products, _ = parse_xlsx(XLSX_PATH)
+    
+    seen = set()
+    unique = []
+    for product in products:
+        if product["product_id"] not in seen:
+            seen.add(product["product_id"])
+            for i in range(extra_attributes):
+                product["attributes"][f"column_{i:02d}"] = f"value {i} of {product['product_id']}"
+            unique.append(product)
+    return unique
+
+
+def transfer(db, product_ids, attribute_names):
+    """Rows and payload bytes of the attribute query."""
+    rows = ProductService._attribute_rows_query(db, product_ids, attribute_names).all()
+    size = sum(len(str(value).encode("utf-8")) for row in rows for value in row if value is not None)
+    return len(rows), size
+
+
+def median_ms(run, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def main(extra_attributes=0, repeats=50):
+    products = load_workbook_products(extra_attributes)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        service = ProductService()
+        for product in products:
+            service.create_product(db, ProductCreate(**product))
+        
+        product_ids = [product["product_id"] for product in products]
+        width = sum(len(product["attributes"]) for product in products) / len(products)
+        print(f"Akari workbook: {len(products)} products, {width:.1f} attributes per product")
+        full_rows, full_bytes = transfer(db, product_ids, None)
+        full_ms = median_ms(lambda: service.get_products_attributes(db, product_ids), repeats)
+        print(f"{'plan':<16s} {'attrs':>5s} {'rows':>11s} {'bytes':>15s} {'time (ms)':>15s}")
+        print(f"{'(all)':<16s} {'-':>5s} {full_rows:11d} {full_bytes:15d} {full_ms:15.2f}")
+        for intent, mapping in INTENT_MAPPINGS.items():
+            attributes = mapping.get("attributes", [])
+            rows, size = transfer(db, product_ids, attributes)
+            elapsed = median_ms(lambda: service.get_products_attributes(db, product_ids, attributes), repeats)
+            print(
+                f"{intent:<16s} {len(attributes):5d} {rows:5d} ({rows / full_rows:4.0%}) "
+                f"{size:8d} ({size / full_bytes:4.0%}) {elapsed:8.2f} ({elapsed / full_ms:4.0%})"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--extra-attributes", type=int, default=0,
+        help="Filler attributes added to every product to model wider sheets"
+    )
+    args = parser.parse_args()
+    main(args.extra_attributes)
@@ -0,0 +1,120 @@
+"""Benchmark vectorized batch pre-decision checks against running the checks per product."""
+import sys
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base
+from src.models.product import Product, ProductAttribute, VisualAsset
+from src.data.catalog_snapshot import invalidate_catalog_snapshot
+from src.data.readiness import rebuild_readiness
+from src.intents.choose_handler import ChooseHandler
+from src.intents.intent_mappings import INTENT_MAPPINGS
+
+ATTRIBUTES = [f"attr_{i:02d}" for i in range(40)] + INTENT_MAPPINGS["choose"]["attributes"]
+USAGE_CONTEXTS = ["travel", "commute", "gym", "office", "lifestyle"]
+USER_CONTEXT = {"usage_context": "travel", "mentioned_attributes": ["weight", "battery_life"]}
+USER_QUERY = "which of these should I choose for travel"
+
+
+def populate(db, products, seed=38):
+    """Insert products with random attribute and asset subsets, then build readiness."""
+    rng = random.Random(seed)
+    db.bulk_insert_mappings(Product, [
+        {"id": i + 1, "product_id": f"SKU-{i:05d}", "name": f"Product {i}", "category": "Headphones"}
+        for i in range(products)
+    ])
+    attributes, assets = [], []
+    for pk in range(1, products + 1):
+        for name in rng.sample(ATTRIBUTES, rng.randint(10, 30)):
+            attribute_type, value = "number", "1"
+            if name == "usage_context":
+                attribute_type, value = "string", rng.choice(USAGE_CONTEXTS)
+            attributes.append({
+                "product_id": pk, "attribute_name": name, "attribute_type": attribute_type, "attribute_value": value
+            })
+        if rng.random() < 0.95:
+            assets.append({"product_id": pk, "asset_type": "main_image", "asset_url": f"https://example.com/{pk}.jpg"})
+    db.bulk_insert_mappings(ProductAttribute, attributes)
+    db.bulk_insert_mappings(VisualAsset, assets)
+    rebuild_readiness(db)
+    db.commit()
+
+
+def per_product_checks(handler, db, product_ids, attributes):
+    """The CHOOSE pipeline's check stages, run once per product."""
+    results = {}
+    for product_id in product_ids:
+        r = {
+            "db": db,
+            "products": [product_id],
+            "selection": (attributes, []),
+            "detect": SimpleNamespace(extracted_context=USER_CONTEXT),
+            "user_query": USER_QUERY
+        }
+        r["attribute_check"] = handler._attribute_check_stage(r)
+        r["context_check"] = handler._context_check_stage(r)
+        r["visualization_check"] = handler._visualization_check_stage(r)
+        results[product_id] = handler._combine_checks_stage(r)
+    return results
+
+
+def agree(looped, batch):
+    """Whether the batch per-product results match the looped checks."""
+    for product_id, result in looped.items():
+        checks = result["checks"]
+        row = batch["products"][product_id]
+        if (
+            row["passed"] != result["passed"]
+            or abs(row["confidence"] - checks["decision_confidence"]["confidence"]) > 1e-9
+            or row["missing_attributes"] != checks["attribute_completeness"]["missing_attributes"]
+            or row["visualization_ready"] != checks["visualization_ready"]["passed"]
+            or sorted(row["matched_context"]) != sorted(checks["user_context"]["matched_attributes"])
+        ):
+            return False
+    return True
+
+
+def main(catalog=10_000, batch_sizes=(100, 1_000, 5_000), repeats=3):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, catalog)
+        invalidate_catalog_snapshot()
+        
+        handler = ChooseHandler()
+        attributes = INTENT_MAPPINGS["choose"]["attributes"]
+        rng = random.Random(1)
+        print(f"Catalog: {catalog:,} products, {len(attributes)} required attributes")
+        print(f"{'products':>8s} {'per product':>14s} {'batch':>10s} {'speedup':>8s} {'agree':>6s}")
+        for size in batch_sizes:
+            product_ids = rng.sample([f"SKU-{i:05d}" for i in range(catalog)], size)
+            handler._run_batch_checks(db, product_ids, attributes, USER_CONTEXT, USER_QUERY)  # warm the snapshot
+            
+            start = time.perf_counter()
+            looped = per_product_checks(handler, db, product_ids, attributes)
+            looped_s = time.perf_counter() - start
+            
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                batch = handler._run_batch_checks(db, product_ids, attributes, USER_CONTEXT, USER_QUERY)
+                timings.append(time.perf_counter() - start)
+            batch_s = sorted(timings)[len(timings) // 2]
+            print(
+                f"{size:8d} {looped_s * 1000:12.1f}ms {batch_s * 1000:8.1f}ms "
+                f"{looped_s / batch_s:7.0f}x {str(agree(looped, batch)):>6s}"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark the batch intent detection endpoint against one /intent/detect request per query."""
+import sys
+import os
+import argparse
+import json
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from src.main import app
+
+QUERIES = [
+    "Compare AirPods Max vs AirPods Pro for travel",
+    "Which headphones should I choose for the gym?",
+    "Why is this so expensive compared to the others?",
+    "How comfortable are these for long flights, do they clamp?",
+    "What does the battery life mean for my commute?",
+    "I need something light for the office, which one would you recommend?",
+    "Explain the difference in noise cancellation between these two",
+    "Are these a good fit for small ears, what size are the cushions?"
+]
+
+
+def single(client, queries):
+    """One /intent/detect request per query."""
+    return [client.post("/api/v1/intent/detect", json={"user_query": query}).json() for query in queries]
+
+
+def batch_json(client, queries):
+    """One batch request with a JSON body."""
+    response = client.post("/api/v1/intent/detect/batch", json={"queries": queries})
+    return [json.loads(line) for line in response.iter_lines()]
+
+
+def batch_ndjson(client, queries):
+    """One batch request streaming the queries as NDJSON."""
+    body = (json.dumps(query).encode() + b"\n" for query in queries)
+    response = client.post(
+        "/api/v1/intent/detect/batch", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    return [json.loads(line) for line in response.iter_lines()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    queries = [f"{rng.choice(QUERIES)} ({i})" for i in range(args.queries)]
+    client = TestClient(app)
+    print(f"{len(queries):,} queries")
+    
+    results = {}
+    for label, run in (("single", single), ("batch json", batch_json), ("batch ndjson", batch_ndjson)):
+        start = time.perf_counter()
+        results[label] = run(client, queries)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<13s} {len(queries) / elapsed:10,.0f} queries/s")
+    print(f"results agree: {results['single'] == results['batch json'] == results['batch ndjson']}")
+
+
+if __name__ == "__main__":
+    main()
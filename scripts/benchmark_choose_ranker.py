@@ -0,0 +1,76 @@
+"""Benchmark vectorized CHOOSE ranking over large candidate sets."""
+import sys
+import os
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.catalog_snapshot import CatalogSnapshot
+from src.intents.choose_ranker import ChooseRanker
+
+CONTEXTS = ["travel", "gym", "work", "home", "office", "commute"]
+
+
+def generate_snapshot(products, seed=3):
+    """Build a synthetic snapshot holding the CHOOSE mapping attributes."""
+    rng = random.Random(seed)
+    attributes = []
+    for _ in range(products):
+        attrs = {
+            "price": round(rng.uniform(50, 600), 2),
+            "weight": round(rng.uniform(5, 400), 1),
+            "battery_life": round(rng.uniform(4, 40), 1),
+            "noise_cancellation": rng.randint(0, 100),
+            "usage_context": rng.sample(CONTEXTS, rng.randint(1, 3)),
+            "foldability": rng.random() < 0.5,
+            "case_size": rng.choice(["Small", "Medium", "Large"]),
+        }
+        # Leave some gaps so missing values are exercised
+        if rng.random() < 0.1:
+            del attrs["battery_life"]
+        attributes.append(attrs)
+    return CatalogSnapshot(
+        product_ids=[f"SKU-{i:06d}" for i in range(products)],
+        names=[f"Product {i}" for i in range(products)],
+        categories=["Headphones"] * products,
+        attributes=attributes
+    )
+
+
+def main(catalog=100_000, candidate_counts=(200, 1_000, 10_000), repeats=20):
+    snapshot = generate_snapshot(catalog)
+    ranker = ChooseRanker()
+    context = {"usage_context": "travel", "mentioned_attributes": ["battery"]}
+    
+    # Build the snapshot indexes once, as the API does on first use
+    start = time.perf_counter()
+    snapshot.numeric_index
+    snapshot.inverted_index
+    print(f"Catalog: {catalog:,} products (index build {time.perf_counter() - start:.2f}s)")
+    print()
+    print(f"{'candidates':>10s} {'load':>10s} {'score+top10':>12s} {'total':>10s}")
+    
+    rng = random.Random(1)
+    for count in candidate_counts:
+        product_ids = rng.sample(snapshot.product_ids, count)
+        load, score, total = [], [], []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            positions = [snapshot.position[p] for p in product_ids]
+            matrix = ranker.load_columns(snapshot, positions, context["usage_context"])
+            t1 = time.perf_counter()
+            ranker.score(matrix, ranker.weights_for_context(context)).sum(axis=1).argsort()[-10:]
+            t2 = time.perf_counter()
+            ranker.rank(snapshot, product_ids, context, top_k=10)
+            t3 = time.perf_counter()
+            load.append(t1 - t0)
+            score.append(t2 - t1)
+            total.append(t3 - t2)
+        median = lambda xs: sorted(xs)[len(xs) // 2] * 1000
+        print(f"{count:10,d} {median(load):8.2f}ms {median(score):10.2f}ms {median(total):8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark the vectorized comparison builder against per-attribute dict loops."""
+import sys
+import os
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.visualization.comparison_builder import ComparisonBuilder
+
+
+def generate_products(products, attributes, seed=11):
+    """Products with a mix of numeric, text, boolean and array attributes."""
+    rng = random.Random(seed)
+    names = [f"attr_{j:02d}" for j in range(attributes)]
+    kinds = [("number", "text", "boolean", "array")[j % 4] for j in range(attributes)]
+    products_attributes = {}
+    for i in range(products):
+        attrs = {}
+        for name, kind in zip(names, kinds):
+            if rng.random() < 0.05:
+                continue
+            if kind == "number":
+                attrs[name] = round(rng.uniform(0, 500), 1)
+            elif kind == "text":
+                attrs[name] = rng.choice(["Aluminium", "Plastic", "Leather", "Steel"])
+            elif kind == "boolean":
+                attrs[name] = rng.random() < 0.5
+            else:
+                attrs[name] = rng.sample(["travel", "gym", "work", "home"], 2)
+        products_attributes[f"SKU-{i:04d}"] = attrs
+    return list(products_attributes), names, products_attributes
+
+
+def loop_comparison(product_ids, attributes, products_attributes):
+    """Per-attribute dict loops computing the builder's output in pure Python."""
+    values, differing, details = {}, [], {}
+    for attr in attributes:
+        column = {}
+        for product_id in product_ids:
+            product_attrs = products_attributes.get(product_id, {})
+            if attr in product_attrs:
+                column[product_id] = product_attrs[attr]
+        if not column:
+            continue
+        values[attr] = column
+        numeric = all(type(v) in (int, float) for v in column.values())
+        if numeric:
+            distinct = len(set(column.values()))
+        else:
+            distinct = len({repr(v) if isinstance(v, (list, dict)) else v for v in column.values()})
+        differs = distinct > 1 or len(column) < len(product_ids)
+        if differs:
+            differing.append(attr)
+        detail = {
+            "type": "numeric" if numeric else "categorical",
+            "differs": differs,
+            "missing_products": [p for p in product_ids if p not in column]
+        }
+        if numeric:
+            low, high = min(column.values()), max(column.values())
+            spread = high - low
+            mean = sum(column.values()) / len(column)
+            detail.update({
+                "min": round(float(low), 4),
+                "max": round(float(high), 4),
+                "min_product": min(column, key=column.get),
+                "max_product": max(column, key=column.get),
+                "spread": round(float(spread), 4),
+                "relative_spread": round(spread / abs(mean), 4) if mean else 0.0,
+                "deltas": {p: round(v - low, 4) for p, v in column.items()},
+                "bars": {p: round((v - low) / spread, 4) if spread else 1.0 for p, v in column.items()}
+            })
+        details[attr] = detail
+    return {"values": values, "differing_attributes": differing, "attributes": details}
+
+
+def main(products=500, attributes=50, repeats=20):
+    product_ids, names, products_attributes = generate_products(products, attributes)
+    builder = ComparisonBuilder()
+    
+    timings = {"dict loops": [], "vectorized": []}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        expected = loop_comparison(product_ids, names, products_attributes)
+        timings["dict loops"].append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        built = builder.build(product_ids, names, products_attributes)
+        timings["vectorized"].append(time.perf_counter() - start)
+    
+    agree = expected == built
+    print(f"{products} products x {attributes} attributes ({repeats} runs)")
+    for label, values in timings.items():
+        print(f"{label:<12s} median {sorted(values)[len(values) // 2] * 1000:7.2f}ms")
+    print(f"results agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark GET /products with and without ETag revalidation and gzip."""
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, get_db
+from src.data.catalog_snapshot import invalidate_catalog_snapshot
+from src.main import app
+from benchmark_pipeline import populate
+
+
+def measure(client, url: str, headers: dict, repeats: int, queries: list) -> tuple:
+    """(median seconds, bytes on the wire, status, database queries) per request."""
+    client.get(url, headers=headers)
+    times = []
+    del queries[:]
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        times.append(time.perf_counter() - start)
+    size = int(response.headers.get("content-length", 0))
+    return sorted(times)[len(times) // 2], size, response.status_code, len(queries) / repeats
+
+
+def main(catalog: int, repeats: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        new_session = sessionmaker(bind=engine)
+        with new_session() as db:
+            populate(db, catalog)
+        invalidate_catalog_snapshot()
+        queries = []
+        event.listen(engine, "before_cursor_execute", lambda *args: queries.append(1))
+        
+        def override_get_db():
+            with new_session() as db:
+                yield db
+        
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        url = "/api/v1/products"
+        etag = client.get(url, headers={"Accept-Encoding": "identity"}).headers["etag"]
+        gzip_etag = client.get(url, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+        
+        print(f"Catalog: {catalog:,} products")
+        print(f"{'request':<28s} {'status':>6s} {'latency':>10s} {'on the wire':>12s} {'queries':>8s}")
+        cases = [
+            ("full body", {"Accept-Encoding": "identity"}),
+            ("gzip", {"Accept-Encoding": "gzip"}),
+            ("If-None-Match (identity)", {"Accept-Encoding": "identity", "If-None-Match": etag}),
+            ("If-None-Match (gzip)", {"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+        ]
+        for label, headers in cases:
+            latency, size, status, per_request = measure(client, url, headers, repeats, queries)
+            print(f"{label:<28s} {status:6d} {latency * 1000:8.2f}ms {size / 1024:9.1f} KiB {per_request:8.0f}")
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--catalog", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    main(args.catalog, args.repeats)
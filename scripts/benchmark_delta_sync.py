@@ -0,0 +1,92 @@
+"""Benchmark keeping a catalog replica current: full GET /products versus GET /products/changes."""
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, get_db
+from src.data.catalog_snapshot import invalidate_catalog_snapshot
+from src.data.change_log import backfill_change_log, observe_changes, record_changes, UPSERT
+from src.models.product import Product, ProductAttribute
+from src.main import app
+from benchmark_pipeline import populate
+
+
+def timed_get(client, url: str) -> tuple:
+    """(seconds, body bytes, JSON) of an uncompressed GET."""
+    start = time.perf_counter()
+    response = client.get(url, headers={"Accept-Encoding": "identity"})
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return elapsed, len(response.content), response.json()
+
+
+def edit_price(db, product_id: str, price: int):
+    """Change one attribute as a catalog writer would: data, change log and caches."""
+    pk = db.query(Product.id).filter(Product.product_id == product_id).scalar()
+    db.query(ProductAttribute).filter(
+        ProductAttribute.product_id == pk,
+        ProductAttribute.attribute_name == "price"
+    ).update({"attribute_value": str(price)})
+    record_changes(db, [product_id], UPSERT)
+    db.commit()
+    observe_changes(db)
+
+
+def main(catalog: int, edits: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        new_session = sessionmaker(bind=engine)
+        with new_session() as db:
+            populate(db, catalog)
+            backfill_change_log(db)
+        invalidate_catalog_snapshot()
+        
+        def override_get_db():
+            with new_session() as db:
+                yield db
+        
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        
+        # Initial replica: the full listing, or the change log from generation 0 in pages
+        full_time, full_size, _ = timed_get(client, "/api/v1/products")
+        generation, bootstrap_size, bootstrap_time, has_more = 0, 0, 0.0, True
+        while has_more:
+            elapsed, size, body = timed_get(client, f"/api/v1/products/changes?since={generation}&limit=10000")
+            generation, has_more = body["generation"], body["has_more"]
+            bootstrap_size += size
+            bootstrap_time += elapsed
+        
+        with new_session() as db:
+            edit_ids = [f"SKU-{i * (catalog // edits):05d}" for i in range(edits)]
+            for i, product_id in enumerate(edit_ids):
+                edit_price(db, product_id, 1000 + i)
+        
+        refresh_time, refresh_size, _ = timed_get(client, "/api/v1/products")
+        delta_time, delta_size, body = timed_get(client, f"/api/v1/products/changes?since={generation}")
+        assert sorted(change["product_id"] for change in body["changes"]) == sorted(edit_ids)
+        app.dependency_overrides.clear()
+        
+        print(f"Catalog: {catalog:,} products; then {edits} product{'s' if edits > 1 else ''} edited")
+        print(f"{'request':<40s} {'latency':>10s} {'payload':>14s}")
+        print(f"{'initial: GET /products':<40s} {full_time * 1000:8.0f}ms {full_size / 1024:10.1f} KiB")
+        print(f"{'initial: GET /products/changes (pages)':<40s} {bootstrap_time * 1000:8.0f}ms {bootstrap_size / 1024:10.1f} KiB")
+        print(f"{'after edit: GET /products':<40s} {refresh_time * 1000:8.0f}ms {refresh_size / 1024:10.1f} KiB")
+        print(f"{'after edit: GET /products/changes':<40s} {delta_time * 1000:8.1f}ms {delta_size:10d} B")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--catalog", type=int, default=50000)
+    parser.add_argument("--edits", type=int, default=1, help="Products edited between syncs")
+    args = parser.parse_args()
+    main(args.catalog, args.edits)
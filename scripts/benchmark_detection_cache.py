@@ -0,0 +1,96 @@
+"""Benchmark memoized intent detection on a Zipf-distributed query workload."""
+import sys
+import os
+import argparse
+import itertools
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.intents.intent_detector import IntentDetector
+from src.intents.detection_cache import DetectionCache
+
+# Prompt chips: the most frequent queries
+CHIPS = [
+    "Compare AirPods Max vs AirPods Pro for travel",
+    "Which headphones should I choose for the gym?",
+    "Why is this so expensive compared to the others?",
+    "How comfortable are these for long flights?",
+    "What does the battery life mean for my commute?",
+    "Which one would you recommend for the office?"
+]
+
+SUBJECTS = ["headphones", "earbuds", "these", "this pair", "the Sony ones", "AirPods Pro", "AirPods Max"]
+QUESTIONS = [
+    "Is {} worth the price for {}?",
+    "How long does the battery of {} last on {}?",
+    "Should I pick {} for {}?",
+    "Explain the noise cancellation of {} during {}",
+    "Do {} fit well for {}?",
+    "What is the difference between {} for {}?"
+]
+SITUATIONS = ["running", "a long flight", "the office", "studying", "gaming", "a commute", "calls", "the gym"]
+
+
+def build_vocabulary(size: int) -> list:
+    """Distinct queries in popularity order: the chips, then the long tail."""
+    tail = [
+        question.format(subject, situation)
+        for question, subject, situation in itertools.product(QUESTIONS, SUBJECTS, SITUATIONS)
+    ]
+    vocabulary = CHIPS + tail
+    for i in itertools.count():
+        if len(vocabulary) >= size:
+            break
+        vocabulary.append(f"{tail[i % len(tail)]} (order {i})")
+    return vocabulary[:size]
+
+
+def zipf_workload(vocabulary: list, requests: int, exponent: float, seed: int) -> list:
+    """Sample queries with P(rank k) proportional to 1/k^exponent, varying case and spacing."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** exponent) for rank in range(1, len(vocabulary) + 1)]
+    queries = rng.choices(vocabulary, weights=weights, k=requests)
+    # Clients differ in casing and stray whitespace; the cache normalizes both
+    variants = [str, str.lower, lambda query: f" {query}  "]
+    return [rng.choice(variants)(query) for query in queries]
+
+
+def run(detector: IntentDetector, queries: list, product_ids: list) -> tuple:
+    """Detect every query in order; return (queries per second, responses)."""
+    start = time.perf_counter()
+    responses = [detector.detect_intent(query, product_ids) for query in queries]
+    return len(queries) / (time.perf_counter() - start), responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct queries")
+    parser.add_argument("--exponent", type=float, default=1.0, help="Zipf exponent")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024, 4096])
+    args = parser.parse_args()
+    
+    vocabulary = build_vocabulary(args.vocabulary)
+    queries = zipf_workload(vocabulary, args.requests, args.exponent, seed=11)
+    # Explicit product IDs, as the widgets send them (keys are case-insensitive then)
+    product_ids = ["airpods-max", "airpods-pro"]
+    detector = IntentDetector(use_cache=False)
+    print(f"{len(queries):,} requests over {len(vocabulary):,} distinct queries, Zipf exponent {args.exponent}, "
+          f"engine: {detector.engine}, spaCy: {'loaded' if detector.nlp is not None else 'not loaded'}")
+    print(f"{'cache':<10s} {'queries/s':>10s} {'hit rate':>9s} {'speedup':>8s}")
+    
+    baseline, expected = run(detector, queries, product_ids)
+    print(f"{'none':<10s} {baseline:10,.0f} {'-':>9s} {'1.0x':>8s}")
+    for size in args.sizes:
+        detector.cache = DetectionCache(size)
+        throughput, responses = run(detector, queries, product_ids)
+        stats = detector.cache.stats()
+        agree = [r.model_dump() for r in responses] == [r.model_dump() for r in expected]
+        print(f"{size:<10,d} {throughput:10,.0f} {stats['hit_rate']:9.1%} {throughput / baseline:7.1f}x  results agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
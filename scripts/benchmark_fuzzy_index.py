@@ -0,0 +1,80 @@
+"""Benchmark fuzzy product lookup on a synthetic catalog of product variants."""
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.fuzzy_index import FuzzyProductIndex
+
+BRANDS = ["Apple", "Nike", "New Balance", "Louis Vuitton", "Gucci", "Sony", "Bose", "Adidas", "Prada", "Sennheiser"]
+MODELS = [
+    "AirPods Max", "AirPods Pro", "Air Jordan 1 High", "Air Force 1", "9060", "990v6", "Murakami East West",
+    "Ophidia Cosmetic Bag", "WH-1000XM5", "QuietComfort Ultra", "Ultraboost", "Samba", "Galleria", "Momentum 4"
+]
+COLORWAYS = [
+    "White", "Black", "Silver", "Space Gray", "Mocha", "UNC", "Orange", "Earth Tone", "Dark Maroon",
+    "Monogram Multicolor", "Brown Monogram", "Azur", "Pink", "Sky Blue", "Forest Green", "Sail"
+]
+QUERIES = [
+    "compare airpod maxx vs airpods pro",
+    "is the jordon 1 comfortable",
+    "new balanse 9060 for walking",
+    "gucci ofidia cosmetic bag",
+    "sony wh1000xm5 battery",
+    "which is better for travel",
+    "louis vuiton murakami price",
+    "quietcomfort ultar weight",
+]
+
+
+def generate_entries(count, seed=7):
+    """Generate (product_id, text) entries for synthetic variants."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        brand = rng.choice(BRANDS)
+        model = rng.choice(MODELS)
+        colorway = rng.choice(COLORWAYS)
+        product_id = f"SKU-{i:06d}"
+        entries.append((product_id, f"{brand} {model} {colorway}"))
+        entries.append((product_id, model))
+    return entries
+
+
+def main(count=100_000, repeats=200):
+    entries = generate_entries(count)
+    
+    start = time.perf_counter()
+    index = FuzzyProductIndex.build(entries)
+    build_seconds = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fuzzy_index.npz")
+        index.save(path)
+        size_mb = os.path.getsize(path) / 1e6
+        start = time.perf_counter()
+        index = FuzzyProductIndex.load(path)
+        load_seconds = time.perf_counter() - start
+    
+    print(f"Catalog: {count:,} variants, {len(index.vocab):,} tokens, {len(index.grams):,} trigrams")
+    print(f"Build: {build_seconds:.2f}s   Load: {load_seconds * 1000:.1f}ms   File: {size_mb:.1f}MB")
+    print()
+    print(f"{'query':40s} {'median':>10s} {'p99':>10s}  top match")
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = index.lookup(query)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        median = timings[len(timings) // 2] * 1e6
+        p99 = timings[int(len(timings) * 0.99) - 1] * 1e6
+        print(f"{query:40s} {median:8.0f}us {p99:8.0f}us  {result[:1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark derivative generation throughput on a folder of sample images."""
+import sys
+import os
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.visualization.image_derivatives import PIL_AVAILABLE, DerivativeCache, build_derivatives
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def generate_samples(folder, count, size=(2000, 2000), seed=13):
+    """Write synthetic product photos (noise over a gradient) as JPEGs."""
+    from PIL import Image
+    rng = random.Random(seed)
+    for i in range(count):
+        base = Image.linear_gradient("L").resize(size).convert("RGB")
+        noise = Image.effect_noise(size, rng.uniform(20, 60)).convert("RGB")
+        Image.blend(base, noise, 0.4).save(os.path.join(folder, f"sample_{i:03d}.jpg"), quality=90)
+
+
+def main(images_dir=None, count=48, worker_counts=(1, 2, 4)):
+    if not PIL_AVAILABLE:
+        print("Pillow is not installed (pip install Pillow)")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        if images_dir is None:
+            images_dir = os.path.join(tmp, "images")
+            os.makedirs(images_dir)
+            generate_samples(images_dir, count)
+        files = sorted(f for f in os.listdir(images_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+        assets = [
+            {
+                "product_id": f"SKU-{i:04d}",
+                "asset_type": "main_image",
+                "asset_url": name,
+                "asset_metadata": {"bounding_boxes": {"earcup_frame": [0.2, 0.1, 0.8, 0.6]}}
+            }
+            for i, name in enumerate(files)
+        ]
+        source_mb = sum(os.path.getsize(os.path.join(images_dir, f)) for f in files) / 1e6
+        print(f"{len(files)} images ({source_mb:.1f}MB), 3 derivatives each")
+        print(f"{'workers':>7s} {'cold':>14s} {'warm (cached)':>16s}")
+        
+        for workers in worker_counts:
+            cache_dir = os.path.join(tmp, f"cache_{workers}")
+            cache = DerivativeCache(cache_dir)
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                build_derivatives(assets, workers=workers, cache=cache, asset_root=images_dir)
+                timings.append(time.perf_counter() - start)
+            cold, warm = (len(files) / t for t in timings)
+            print(f"{workers:7d} {cold:10.1f} img/s {warm:12.1f} img/s")
+            shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", help="Folder of sample images (default: generate synthetic ones)")
+    args = parser.parse_args()
+    main(args.images)
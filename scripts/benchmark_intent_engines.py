@@ -0,0 +1,79 @@
+"""Benchmark accuracy, latency and memory of the pattern, spaCy and linear intent engines."""
+import sys
+import os
+import argparse
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import settings
+from src.intents.intent_classifier import LinearIntentClassifier
+from src.intents.intent_detector import IntentDetector
+from train_intent_classifier import load_labelled_queries, split
+
+
+def rss_bytes():
+    """Resident set size of this process (Linux), or 0 where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def build(factory):
+    """Construct a detector and measure the memory it added."""
+    before = rss_bytes()
+    detector = factory()
+    return detector, rss_bytes() - before
+
+
+def evaluate(detector, examples, repeats):
+    """Held-out accuracy, mean per-query latency and batch throughput."""
+    predictions = [detector.detect_intent(query, []).intent_type.value for query, _ in examples]
+    correct = sum(p == intent for p, (_, intent) in zip(predictions, examples))
+    
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for query, _ in examples:
+            detector.detect_intent(query, [])
+    single = (time.perf_counter() - start) / (repeats * len(examples))
+    
+    queries = [(query, []) for query, _ in examples] * repeats
+    start = time.perf_counter()
+    detector.detect_intents(queries)
+    batch = len(queries) / (time.perf_counter() - start)
+    return correct / len(examples), single, batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--holdout-every", type=int, default=5)
+    args = parser.parse_args()
+    
+    train, test = split(load_labelled_queries(), args.holdout_every)
+    print(f"{len(train)} training and {len(test)} held-out queries")
+    
+    model = LinearIntentClassifier.train([q for q, _ in train], [i for _, i in train])
+    engines = [
+        ("pattern", lambda: IntentDetector(engine="pattern", use_spacy=False), 0),
+        ("spacy", lambda: IntentDetector(engine="pattern"), None),
+        ("linear", lambda: IntentDetector(engine="linear", classifier=model), model.nbytes)
+    ]
+    print(f"{'engine':<8s} {'accuracy':>9s} {'latency':>10s} {'batch':>12s} {'model memory':>13s}")
+    for label, factory, model_bytes in engines:
+        detector, added = build(factory)
+        if label == "spacy" and detector.nlp is None:
+            print(f"{label:<8s} not available (spaCy model '{settings.spacy_model}' is not installed)")
+            continue
+        accuracy, single, batch = evaluate(detector, test, args.repeats)
+        memory = model_bytes if model_bytes is not None else added
+        print(
+            f"{label:<8s} {accuracy:9.1%} {single * 1e6:8.1f}us {batch:8,.0f} q/s {memory / 1024 / 1024:10.2f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
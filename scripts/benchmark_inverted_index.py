@@ -0,0 +1,95 @@
+"""Benchmark inverted-index set algebra against a full catalog scan."""
+import sys
+import os
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.catalog_snapshot import CatalogSnapshot
+
+MATERIALS = [f"material-{i}" for i in range(20)]
+COLORWAYS = [f"colorway-{i}" for i in range(50)]
+GENDERS = ["men", "women", "unisex"]
+CONTEXTS = ["travel", "gym", "work", "home", "office", "commute", "daily", "fashion"]
+QUERIES = [
+    {"usage_context": ["travel"]},
+    {"material": ["material-3"], "gender": ["women"]},
+    {"colorway": ["colorway-1", "colorway-2", "colorway-3"], "gender": ["unisex"]},
+    {"usage_context": ["travel", "commute"], "material": ["material-1", "material-7"], "gender": ["men", "unisex"]},
+]
+
+
+def generate_snapshot(products, seed=5):
+    """Build a synthetic snapshot with categorical and array attributes."""
+    rng = random.Random(seed)
+    attributes = [
+        {
+            "material": rng.choice(MATERIALS),
+            "colorway": rng.choice(COLORWAYS),
+            "gender": rng.choice(GENDERS),
+            "usage_context": rng.sample(CONTEXTS, rng.randint(1, 3)),
+        }
+        for _ in range(products)
+    ]
+    return CatalogSnapshot(
+        product_ids=[f"SKU-{i:06d}" for i in range(products)],
+        names=[f"Product {i}" for i in range(products)],
+        categories=["Footwear"] * products,
+        attributes=attributes
+    )
+
+
+def full_scan(snapshot, filters):
+    """Filter by walking every product's parsed attributes."""
+    matches = []
+    for position, attrs in enumerate(snapshot.attributes):
+        ok = True
+        for attribute, values in filters.items():
+            value = attrs.get(attribute)
+            items = value if isinstance(value, list) else [value]
+            if not any(item in values for item in items):
+                ok = False
+                break
+        if ok:
+            matches.append(position)
+    return matches
+
+
+def timed(fn, repeats):
+    """Return the median wall time of fn in microseconds and its last result."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1e6, result
+
+
+def main(products=100_000):
+    snapshot = generate_snapshot(products)
+    start = time.perf_counter()
+    index = snapshot.inverted_index
+    print(f"Catalog: {products:,} products, {len(index.postings):,} (attribute, value) bitmaps")
+    print(f"Index build: {time.perf_counter() - start:.2f}s")
+    print()
+    print(f"{'filter':70s} {'matches':>8s} {'scan':>10s} {'bitmap':>10s} {'+decode':>10s}")
+    
+    for filters in QUERIES:
+        scan_us, expected = timed(lambda: full_scan(snapshot, filters), 3)
+        bitmap_us, bitmap = timed(lambda: index.match(filters), 200)
+        decode_us, positions = timed(lambda: index.positions(index.match(filters)), 100)
+        assert positions.tolist() == expected
+        label = " AND ".join(f"{a} in ({'|'.join(v)})" for a, v in filters.items())
+        print(f"{label:70s} {bitmap.bit_count():8,d} {scan_us / 1000:8.1f}ms {bitmap_us:8.1f}us {decode_us:8.1f}us")
+    
+    # Membership test as used by UserContextCheck: a handful of products
+    selected = snapshot.bitmap_for(snapshot.product_ids[:5])
+    check_us, _ = timed(lambda: bool(index.bitmap("usage_context", "travel") & selected), 1000)
+    print(f"\nUserContextCheck membership test (5 products): {check_us:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
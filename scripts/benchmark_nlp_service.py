@@ -0,0 +1,72 @@
+"""Benchmark intent detection throughput in-process and in 1, 4 and 8 NLP worker processes."""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+QUERIES = [
+    "Compare AirPods Max vs AirPods Pro for travel",
+    "Which headphones should I choose for the gym?",
+    "Why is this so expensive compared to the others?",
+    "How comfortable are these for long flights, do they clamp?",
+    "What does the battery life mean for my commute?",
+    "I need something light for the office, which one would you recommend?",
+    "Explain the difference in noise cancellation between these two",
+    "Are these a good fit for small ears, what size are the cushions?"
+]
+
+
+def run_in_process(detector, queries):
+    """Detect in the calling process, as an async handler calling the detector would."""
+    return [detector.detect_intent(query, []) for query in queries]
+
+
+async def run_service(service, queries):
+    """Submit every query at once, as concurrent requests would."""
+    return await asyncio.gather(*(service.detect_intent(query, []) for query in queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--model", default=None, help="spaCy model (default: SPACY_MODEL setting)")
+    args = parser.parse_args()
+    if args.model:
+        # Worker processes read the setting from the environment
+        os.environ["SPACY_MODEL"] = args.model
+    
+    from src.config import settings
+    from src.intents.intent_detector import IntentDetector
+    from src.intents.nlp_service import NLPService
+    
+    rng = random.Random(7)
+    queries = [f"{rng.choice(QUERIES)} ({i})" for i in range(args.queries)]
+    detector = IntentDetector()
+    print(f"{len(queries):,} queries, spaCy model: {settings.spacy_model if detector.nlp is not None else 'not loaded (pattern matching only)'}")
+    print(f"{'mode':<14s} {'queries/s':>10s}")
+    
+    start = time.perf_counter()
+    expected = run_in_process(detector, queries)
+    print(f"{'in-process':<14s} {len(queries) / (time.perf_counter() - start):10,.0f}")
+    
+    for processes in args.processes:
+        service = NLPService(processes, settings.nlp_batch_size, settings.nlp_batch_wait_ms)
+        service.warm_up()
+        start = time.perf_counter()
+        results = asyncio.run(run_service(service, queries))
+        elapsed = time.perf_counter() - start
+        service.shutdown()
+        agree = [r.model_dump() for r in results] == [r.model_dump() for r in expected]
+        label = f"{processes} process{'es' if processes > 1 else ''}"
+        print(f"{label:<14s} {len(queries) / elapsed:10,.0f}  results agree: {agree}")
+    print(f"(CPUs available: {os.cpu_count()})")
+
+
+if __name__ == "__main__":
+    main()
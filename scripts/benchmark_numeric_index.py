@@ -0,0 +1,103 @@
+"""Benchmark the numeric attribute index against a full catalog scan."""
+import sys
+import os
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.catalog_snapshot import CatalogSnapshot
+from src.data.numeric_index import parse_predicate
+
+ATTRIBUTES = [
+    "price", "weight", "battery_life", "noise_cancellation", "clamp_force",
+    "size_us", "size_eu", "base_price_usd", "case_volume", "driver_size"
+]
+QUERIES = [
+    (["price<=300", "battery_life>=20"], "battery_life"),
+    (["price<300", "weight<250", "noise_cancellation>=90"], "price"),
+    (["battery_life>=38"], None),
+]
+
+
+def generate_snapshot(products, seed=11):
+    """Build a synthetic snapshot with every product holding every attribute."""
+    rng = random.Random(seed)
+    attributes = [
+        {name: round(rng.uniform(0, 600 if "price" in name else 40 if name == "battery_life" else 400), 2) for name in ATTRIBUTES}
+        for _ in range(products)
+    ]
+    return CatalogSnapshot(
+        product_ids=[f"SKU-{i:07d}" for i in range(products)],
+        names=[f"Product {i}" for i in range(products)],
+        categories=["Headphones" if i % 3 else "Earbuds" for i in range(products)],
+        attributes=attributes
+    )
+
+
+def full_scan(snapshot, predicates, sort_by, limit=20):
+    """Filter and rank by walking every product's parsed attributes."""
+    matches = []
+    for position, attrs in enumerate(snapshot.attributes):
+        ok = True
+        for p in predicates:
+            value = attrs.get(p.attribute)
+            if not isinstance(value, (int, float)):
+                ok = False
+                break
+            if p.low is not None and (value < p.low or (value == p.low and not p.include_low)):
+                ok = False
+                break
+            if p.high is not None and (value > p.high or (value == p.high and not p.include_high)):
+                ok = False
+                break
+        if ok:
+            matches.append(position)
+    if sort_by:
+        matches.sort(key=lambda position: snapshot.attributes[position].get(sort_by, float("-inf")), reverse=True)
+    return len(matches), matches[:limit]
+
+
+def indexed(index, predicates, sort_by, limit=20):
+    """Filter and rank through the sorted numeric index."""
+    mask = index.filter(predicates)
+    if sort_by:
+        return int(mask.sum()), index.top_k(sort_by, limit, candidates=mask).tolist()
+    return int(mask.sum()), mask.nonzero()[0][:limit].tolist()
+
+
+def timed(fn, repeats):
+    """Return the median wall time of fn in milliseconds and its last result."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, result
+
+
+def main(products=100_000):
+    snapshot = generate_snapshot(products)
+    rows = sum(len(attrs) for attrs in snapshot.attributes)
+    
+    start = time.perf_counter()
+    index = snapshot.numeric_index
+    build_seconds = time.perf_counter() - start
+    print(f"Catalog: {products:,} products, {rows:,} numeric attribute rows")
+    print(f"Index build: {build_seconds:.2f}s")
+    print()
+    print(f"{'query':62s} {'matches':>8s} {'scan':>10s} {'index':>10s} {'speedup':>8s}")
+    
+    for expressions, sort_by in QUERIES:
+        predicates = [parse_predicate(e) for e in expressions]
+        scan_ms, scan_result = timed(lambda: full_scan(snapshot, predicates, sort_by), 3)
+        index_ms, index_result = timed(lambda: indexed(index, predicates, sort_by), 50)
+        assert scan_result[0] == index_result[0]
+        label = " & ".join(expressions) + (f" top by {sort_by}" if sort_by else "")
+        print(f"{label:62s} {index_result[0]:8,d} {scan_ms:8.1f}ms {index_ms:8.2f}ms {scan_ms / index_ms:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
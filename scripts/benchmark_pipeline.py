@@ -0,0 +1,147 @@
+"""Benchmark end-to-end latency of the intent flows, sequential versus concurrent stages."""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.database import Base
+from src.models.product import Product, ProductAttribute, VisualAsset
+from src.data.catalog_snapshot import get_catalog_snapshot, invalidate_catalog_snapshot
+from src.data.readiness import rebuild_readiness
+from src.explanation.chatgpt_explainer import ChatGPTExplainer
+from src.explanation.full_flow import FullExplanationFlow
+from src.intents.choose_handler import ChooseHandler
+from src.intents.intent_handler import IntentHandler
+from src.pipeline import Pipeline
+
+USAGE_CONTEXTS = ["travel", "commute", "gym", "office"]
+
+
+class SimulatedClient:
+    """Stands in for the OpenAI client with a fixed response latency."""
+    
+    def __init__(self, latency):
+        self.latency = latency
+    
+    def generate_explanation(self, prompt, **kwargs):
+        time.sleep(self.latency)
+        return f"Explanation of a {len(prompt)} character prompt."
+    
+    def validate_response(self, response, source_data):
+        return True
+
+
+def populate(db, products, seed=39):
+    """Insert headphones with the attributes the CHOOSE and COMPARE plans use."""
+    rng = random.Random(seed)
+    db.bulk_insert_mappings(Product, [
+        {"id": i + 1, "product_id": f"SKU-{i:05d}", "name": f"Headphone {i}", "category": "Headphones"}
+        for i in range(products)
+    ])
+    attributes, assets = [], []
+    for pk in range(1, products + 1):
+        values = {
+            "price": ("number", str(rng.randint(50, 600))),
+            "weight": ("number", str(rng.randint(150, 400))),
+            "battery_life": ("number", str(rng.randint(10, 60))),
+            "noise_cancellation": ("boolean", rng.choice(["true", "false"])),
+            "usage_context": ("string", rng.choice(USAGE_CONTEXTS)),
+            "foldability": ("boolean", rng.choice(["true", "false"])),
+            "case_size": ("number", str(rng.randint(10, 30)))
+        }
+        for name, (attribute_type, value) in values.items():
+            attributes.append({
+                "product_id": pk, "attribute_name": name, "attribute_type": attribute_type, "attribute_value": value
+            })
+        assets.append({"product_id": pk, "asset_type": "main_image", "asset_url": f"https://example.com/{pk}.jpg"})
+    db.bulk_insert_mappings(ProductAttribute, attributes)
+    db.bulk_insert_mappings(VisualAsset, assets)
+    rebuild_readiness(db)
+    db.commit()
+
+
+def flows(db, product_ids, llm_latency):
+    """(label, stages, inputs) of the three flows."""
+    intent_handler = IntentHandler()
+    choose_handler = ChooseHandler()
+    explainer = ChatGPTExplainer()
+    explainer.client = SimulatedClient(llm_latency)
+    full_flow = FullExplanationFlow(explainer)
+    
+    query = "what is the difference between these, compare them"
+    inputs = intent_handler.intent_inputs(db, query, product_ids, ["price:min", "battery_life:max"])
+    yield "process", intent_handler.intent_stages(True) + [intent_handler.effects_stage()], inputs
+    
+    query = "which should I choose for travel"
+    inputs = choose_handler.intent_handler.intent_inputs(db, query, product_ids, None)
+    yield "choose", choose_handler.choose_stages(True) + [choose_handler.intent_handler.effects_stage()], inputs
+    
+    # A comfort question also finds lighter alternatives while the explanation is generated
+    query = "can you clarify how comfortable these are, what does the weight mean"
+    inputs = full_flow.intent_handler.intent_inputs(db, query, product_ids, None)
+    yield "explanation", full_flow.stages(True), inputs
+
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+
+async def run_concurrent(pipeline, inputs, repeats):
+    """Run the pipeline repeatedly on one event loop."""
+    return [await pipeline.run(inputs) for _ in range(repeats)]
+
+
+def add_query_latency(engine, latency):
+    """Delay every statement, modelling the round trip to a database server."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def delay(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(latency)
+
+
+def main(catalog=20_000, products=200, llm_latency=0.3, db_latency=0.002, repeats=7):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, catalog)
+        invalidate_catalog_snapshot()
+        get_catalog_snapshot(db)
+        add_query_latency(engine, db_latency)
+        
+        product_ids = random.Random(1).sample([f"SKU-{i:05d}" for i in range(catalog)], products)
+        print(
+            f"Catalog: {catalog:,} products, {products} per request, simulated latency: "
+            f"LLM {llm_latency * 1000:.0f}ms, database {db_latency * 1000:.1f}ms per query"
+        )
+        print(f"{'flow':<12s} {'sequential':>12s} {'concurrent':>12s} {'saved':>8s}  critical path")
+        for label, stages, inputs in flows(db, product_ids, llm_latency):
+            pipeline = Pipeline(stages)
+            pipeline.run_sequential(inputs)  # warm caches
+            sequential = median([pipeline.run_sequential(inputs).elapsed for _ in range(repeats)])
+            runs = asyncio.run(run_concurrent(pipeline, inputs, repeats))
+            concurrent = median([run.elapsed for run in runs])
+            slowest = sorted(runs[-1].timings.items(), key=lambda item: -item[1].duration)[:3]
+            path = ", ".join(f"{name} {timing.duration * 1000:.1f}ms" for name, timing in slowest)
+            print(
+                f"{label:<12s} {sequential * 1000:10.1f}ms {concurrent * 1000:10.1f}ms "
+                f"{(sequential - concurrent) / sequential:7.0%}  {path}"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--catalog", type=int, default=20_000)
+    parser.add_argument("--products", type=int, default=200, help="Product IDs per request")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Simulated explanation latency in seconds")
+    parser.add_argument("--db-latency", type=float, default=0.002, help="Simulated per-query database latency in seconds")
+    args = parser.parse_args()
+    main(args.catalog, args.products, args.llm_latency, args.db_latency)
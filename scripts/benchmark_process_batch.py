@@ -0,0 +1,111 @@
+"""Benchmark a dashboard page of widgets: one /intent/process call each versus one batch call."""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base
+from src.data.catalog_snapshot import get_catalog_snapshot, invalidate_catalog_snapshot
+from src.intents.intent_handler import IntentHandler
+from src.schemas.intent import IntentRequest
+from benchmark_pipeline import populate, add_query_latency, median
+
+QUERIES = [
+    "what is the difference between these, compare them",
+    "which should I choose for travel",
+    "can you clarify how comfortable these are, what does the weight mean",
+    "compare the price and battery of these"
+]
+
+
+def widgets(catalog, count, products, seed=42):
+    """Widget requests over a shared pool of featured products, as on one dashboard page."""
+    rng = random.Random(seed)
+    featured = rng.sample([f"SKU-{i:05d}" for i in range(catalog)], products * 3)
+    return [
+        IntentRequest(user_query=rng.choice(QUERIES), product_ids=rng.sample(featured, products))
+        for _ in range(count)
+    ]
+
+
+async def one_by_one(handler, db, requests):
+    """Each widget calls /intent/process on its own, one after another."""
+    return [
+        await handler.run_intent_pipeline(db, r.user_query, r.product_ids, r.pareto_attributes, with_effects=True)
+        for r in requests
+    ]
+
+
+async def concurrent(handler, db, requests):
+    """Each widget calls /intent/process on its own, all at once."""
+    return await asyncio.gather(*(
+        handler.run_intent_pipeline(db, r.user_query, r.product_ids, r.pareto_attributes, with_effects=True)
+        for r in requests
+    ))
+
+
+async def batch(handler, db, requests):
+    """One /intent/process/batch call."""
+    return await handler.run_intent_batch(db, requests, with_effects=True)
+
+
+def body(runs):
+    return json.dumps([
+        [run.results["response"][0].model_dump(mode="json"), run.results["response"][1].model_dump(mode="json"),
+         run.results["effects"]]
+        for run in runs
+    ], sort_keys=True, default=str)
+
+
+def main(catalog=20_000, widget_count=20, products=10, db_latency=0.002, repeats=7):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, catalog)
+        invalidate_catalog_snapshot()
+        get_catalog_snapshot(db)
+        add_query_latency(engine, db_latency)
+        
+        handler = IntentHandler()
+        requests = widgets(catalog, widget_count, products)
+        print(
+            f"Catalog: {catalog:,} products, {widget_count} widgets of {products} products, "
+            f"simulated database latency {db_latency * 1000:.1f}ms per query"
+        )
+        
+        results = {}
+        cases = (
+            ("one widget", lambda: one_by_one(handler, db, requests[:1])),
+            ("one by one", lambda: one_by_one(handler, db, requests)),
+            ("concurrent", lambda: concurrent(handler, db, requests)),
+            ("batch", lambda: batch(handler, db, requests))
+        )
+        for label, run in cases:
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                results[label] = asyncio.run(run())
+                timings.append(time.perf_counter() - start)
+            print(f"{label:<12s} {median(timings) * 1000:8.1f}ms")
+        print(f"results agree: {body(results['one by one']) == body(results['concurrent']) == body(results['batch'])}")
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--catalog", type=int, default=20_000)
+    parser.add_argument("--widgets", type=int, default=20)
+    parser.add_argument("--products", type=int, default=10, help="Product IDs per widget")
+    parser.add_argument("--db-latency", type=float, default=0.002, help="Simulated per-query database latency in seconds")
+    args = parser.parse_args()
+    main(args.catalog, args.widgets, args.products, args.db_latency)
@@ -0,0 +1,100 @@
+"""Benchmark readiness-bitmask and SQL-aggregate checks against per-request attribute and asset loading."""
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base
+from src.models.product import Product, ProductAttribute, VisualAsset
+from src.data.product_service import ProductService
+from src.data.readiness import rebuild_readiness
+from src.checks.attribute_completeness import AttributeCompletenessCheck
+from src.checks.visualization_ready import VisualizationReadyCheck
+
+ATTRIBUTES = [f"attr_{i:02d}" for i in range(40)] + ["price", "weight", "battery_life", "noise_cancellation"]
+REQUIRED_ATTRIBUTES = ["price", "weight", "battery_life", "noise_cancellation", "usage_context"]
+
+
+def populate(db, products, seed=21):
+    """Insert products with random attribute and asset subsets, then build readiness."""
+    rng = random.Random(seed)
+    db.bulk_insert_mappings(Product, [
+        {"id": i + 1, "product_id": f"SKU-{i:05d}", "name": f"Product {i}", "category": "Headphones"}
+        for i in range(products)
+    ])
+    attributes, assets = [], []
+    for pk in range(1, products + 1):
+        for name in rng.sample(ATTRIBUTES, rng.randint(10, 30)):
+            attributes.append({
+                "product_id": pk, "attribute_name": name, "attribute_type": "number", "attribute_value": "1"
+            })
+        for asset_type in ("main_image", "detail_image", "spec_callout"):
+            if rng.random() < 0.97:
+                assets.append({"product_id": pk, "asset_type": asset_type, "asset_url": f"https://example.com/{pk}.jpg"})
+    db.bulk_insert_mappings(ProductAttribute, attributes)
+    db.bulk_insert_mappings(VisualAsset, assets)
+    rebuild_readiness(db)
+    db.commit()
+
+
+def legacy_checks(db, product_ids):
+    """The previous checks: load every attribute row and each product's assets."""
+    products_attributes = ProductService.get_products_attributes(db, product_ids)
+    missing_attributes = [
+        attr for attr in REQUIRED_ATTRIBUTES
+        if not any(attr in attrs for attrs in products_attributes.values())
+    ]
+    missing_assets = {}
+    for product_id in product_ids:
+        asset_types = {asset.asset_type for asset in ProductService.get_visual_assets(db, product_id)}
+        if "main_image" not in asset_types:
+            missing_assets[product_id] = ["main_image"]
+    return missing_attributes, missing_assets
+
+
+def bitmask_checks(db, product_ids):
+    """The readiness-bitmask checks."""
+    attribute_result = AttributeCompletenessCheck().check(db, product_ids, REQUIRED_ATTRIBUTES)
+    visualization_result = VisualizationReadyCheck().check(db, product_ids, ["main_image"])
+    return attribute_result["missing_attributes"], visualization_result["missing_assets"]
+
+
+def aggregate_checks(db, product_ids):
+    """The attribute check through the GROUP BY aggregate (products without stored masks)."""
+    coverage = ProductService.attribute_coverage(db, product_ids, REQUIRED_ATTRIBUTES)
+    missing_attributes = [attr for attr in REQUIRED_ATTRIBUTES if attr not in coverage]
+    visualization_result = VisualizationReadyCheck().check(db, product_ids, ["main_image"])
+    return missing_attributes, visualization_result["missing_assets"]
+
+
+def main(catalog=5_000, per_request=1_000, repeats=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, catalog)
+        
+        product_ids = random.Random(1).sample([f"SKU-{i:05d}" for i in range(catalog)], per_request)
+        print(f"Catalog: {catalog:,} products, {per_request:,} products per request")
+        results = {}
+        runs = (("load rows", legacy_checks), ("bitmasks", bitmask_checks), ("aggregate", aggregate_checks))
+        for label, run in runs:
+            timings = []
+            for _ in range(repeats):
+                db.expire_all()
+                start = time.perf_counter()
+                results[label] = run(db, product_ids)
+                timings.append(time.perf_counter() - start)
+            print(f"{label:<10s} median {sorted(timings)[len(timings) // 2] * 1000:8.1f}ms")
+        print(f"results agree: {results['load rows'] == results['bitmasks'] == results['aggregate']}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
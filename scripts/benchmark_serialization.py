@@ -0,0 +1,142 @@
+"""Benchmark response serialization: FastAPI's encoder versus orjson with pre-serialized product fragments."""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from typing import List
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base
+from src.data.catalog_snapshot import get_catalog_snapshot, invalidate_catalog_snapshot
+from src.data.product_service import ProductService
+from src.pipeline import Pipeline
+from src.schemas.product import ProductFullResponse
+from src.api.responses import FastJSONResponse
+from src.api.fragments import get_product_fragments
+from src.api.routes import _product_fragments, _product_response, _visualization_body
+from benchmark_pipeline import populate, flows
+
+
+def response_field(response_model):
+    """The field FastAPI validates and encodes a route's return value with."""
+    return APIRoute("/", lambda: None, response_model=response_model).response_field
+
+
+def framework_render(field, content) -> bytes:
+    """Encode as a route declared with ``response_model`` does."""
+    encoded = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(encoded).body
+
+
+def measure(render, repeats: int) -> tuple:
+    """(median seconds, peak traced bytes) per call."""
+    render()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        render()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    render()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return sorted(times)[len(times) // 2], peak
+
+
+def report(label: str, framework, fast, repeats: int):
+    framework_time, framework_peak = measure(framework, repeats)
+    fast_time, fast_peak = measure(fast, repeats)
+    size = len(fast())
+    print(
+        f"{label:<22s} {size / 1024:7.1f} KiB  {framework_time * 1e6:9.0f}us {framework_peak / 1024:8.0f} KiB"
+        f"  {fast_time * 1e6:9.0f}us {fast_peak / 1024:8.0f} KiB  {framework_time / fast_time:6.1f}x"
+    )
+
+
+def main(catalog: int, products: int, repeats: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        new_session = sessionmaker(bind=engine)
+        db = new_session()
+        populate(db, catalog)
+        invalidate_catalog_snapshot()
+        get_catalog_snapshot(db)
+        product_ids = random.Random(1).sample([f"SKU-{i:05d}" for i in range(catalog)], products)
+        dict_field = response_field(dict)
+        
+        print(f"Catalog: {catalog:,} products, {products} per intent request")
+        print(f"{'response':<22s} {'size':>11s}  {'FastAPI':>9s} {'peak':>12s}  {'orjson':>9s} {'peak':>12s}  {'speedup':>6s}")
+        for label, stages, inputs in flows(db, product_ids, llm_latency=0):
+            run = Pipeline(stages).run_sequential(inputs)
+            intent_response, visualization_response = run.results["response"]
+            extra = {"explanation": run.results["explanation"]} if "explanation" in run.results else {}
+            
+            def framework():
+                # The body as the routes built it before: model_dump, then FastAPI's encoder
+                return framework_render(dict_field, {
+                    "intent": intent_response,
+                    "visualization": {**visualization_response.model_dump(), "visualization_data": run.results["effects"]},
+                    **extra
+                })
+            
+            def fast():
+                return FastJSONResponse({
+                    "intent": intent_response,
+                    "visualization": _visualization_body(visualization_response, run.results["effects"]),
+                    **extra
+                }).body
+            
+            report(f"/{label}", framework, fast, repeats)
+        
+        # Product endpoints: serialization of already loaded products
+        catalog_ids = ProductService.list_product_ids(db)
+        loaded = ProductService.get_products_with_details(db, catalog_ids)
+        models = [_product_response(product) for product in loaded]
+        _product_fragments(db, catalog_ids)  # warm the fragment cache
+        list_field = response_field(List[ProductFullResponse])
+        report(
+            "/products (encode)",
+            lambda: framework_render(list_field, models),
+            lambda: FastJSONResponse(_product_fragments(db, catalog_ids)).body,
+            repeats
+        )
+        
+        # End to end, including the database reads the handler makes (a new session per request)
+        def framework_handler():
+            with new_session() as session:
+                products = ProductService.get_all_products(session)
+                return framework_render(list_field, [_product_response(product) for product in products])
+        
+        def cold_handler():
+            get_product_fragments()._entries.clear()
+            return warm_handler()
+        
+        def warm_handler():
+            with new_session() as session:
+                return FastJSONResponse(_product_fragments(session, ProductService.list_product_ids(session))).body
+        
+        report("/products (cold cache)", framework_handler, cold_handler, max(3, repeats // 10))
+        report("/products (warm cache)", framework_handler, warm_handler, max(3, repeats // 10))
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--catalog", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=50, help="Product IDs per intent request")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    main(args.catalog, args.products, args.repeats)
@@ -0,0 +1,91 @@
+"""Benchmark nearest lighter-product lookups against a full category scan."""
+import sys
+import os
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from src.data.catalog_snapshot import CatalogSnapshot
+from src.visualization.similarity_index import get_similarity_index
+
+CATEGORIES = ["Headphones", "Earbuds", "Footwear", "Handbag", "Electronics"]
+
+
+def generate_snapshot(products, seed=5):
+    """Build a synthetic snapshot with a handful of numeric attributes per product."""
+    rng = random.Random(seed)
+    categories, attributes = [], []
+    for _ in range(products):
+        attrs = {
+            "price": round(rng.uniform(50, 600), 2),
+            "weight": round(rng.uniform(5, 400), 1),
+            "battery_life": round(rng.uniform(4, 40), 1),
+            "noise_cancellation": rng.randint(0, 100),
+            "clamp_force": round(rng.uniform(2, 8), 1),
+        }
+        if rng.random() < 0.1:
+            del attrs["battery_life"]
+        categories.append(rng.choice(CATEGORIES))
+        attributes.append(attrs)
+    return CatalogSnapshot(
+        product_ids=[f"SKU-{i:06d}" for i in range(products)],
+        names=[f"Product {i}" for i in range(products)],
+        categories=categories,
+        attributes=attributes
+    )
+
+
+def brute_force(index, position, attribute, k):
+    """Scan every product of the category for the k nearest lighter ones."""
+    row = index.row_of_position[position]
+    dim = index.attributes.index(attribute)
+    eligible = np.flatnonzero(index.raw[:, dim] < index.raw[row, dim])
+    offsets = index.points[eligible] - index.points[row]
+    distances = np.einsum("ij,ij->i", offsets, offsets)
+    nearest = eligible[np.argsort(distances, kind="stable")[:k]]
+    return [int(index.positions[r]) for r in nearest]
+
+
+def main(products=100_000, queries=500, k=5):
+    snapshot = generate_snapshot(products)
+    snapshot.numeric_index
+    
+    start = time.perf_counter()
+    indexes = {category: get_similarity_index(snapshot, category) for category in CATEGORIES}
+    build = time.perf_counter() - start
+    print(f"{products:,} products in {len(CATEGORIES)} categories, index build {build:.2f}s")
+    
+    rng = random.Random(2)
+    sample = rng.sample(range(products), queries)
+    tree, scan, cached = [], [], []
+    mismatches = 0
+    for position in sample:
+        index = indexes[snapshot.categories[position]]
+        
+        t0 = time.perf_counter()
+        found = index.nearest_better(position, "weight", "min", k)
+        t1 = time.perf_counter()
+        expected = brute_force(index, position, "weight", k)
+        t2 = time.perf_counter()
+        index.nearest_better(position, "weight", "min", k)
+        t3 = time.perf_counter()
+        
+        tree.append(t1 - t0)
+        scan.append(t2 - t1)
+        cached.append(t3 - t2)
+        mismatches += [p for p, _ in found] != expected
+    
+    median = lambda xs: sorted(xs)[len(xs) // 2] * 1_000_000
+    p99 = lambda xs: sorted(xs)[int(len(xs) * 0.99)] * 1_000_000
+    print(f"{'method':<14s} {'median':>10s} {'p99':>10s}")
+    print(f"{'kd-tree':<14s} {median(tree):8.0f}µs {p99(tree):8.0f}µs")
+    print(f"{'category scan':<14s} {median(scan):8.0f}µs {p99(scan):8.0f}µs")
+    print(f"{'cached':<14s} {median(cached):8.0f}µs {p99(cached):8.0f}µs")
+    print(f"mismatches vs scan: {mismatches}/{queries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark Pareto skyline computation on large product sets."""
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from src.visualization.skyline import compute_skyline
+
+
+def independent(rng, products, dimensions):
+    """Uniformly distributed attribute values."""
+    return rng.random((products, dimensions))
+
+
+def anti_correlated(rng, products, dimensions):
+    """Values clustered around a trade-off plane (large skylines)."""
+    base = rng.normal(0.5, 0.05, (products, 1))
+    noise = rng.random((products, dimensions))
+    noise = noise / noise.sum(axis=1, keepdims=True) * dimensions * base
+    return noise
+
+
+def main(products=100_000, dimensions=(3, 4, 5, 6)):
+    rng = np.random.default_rng(42)
+    print(f"{products:,} products")
+    print(f"{'distribution':16s} {'dims':>4s} {'skyline':>8s} {'time':>10s}")
+    for name, generator in (("independent", independent), ("anti-correlated", anti_correlated)):
+        for d in dimensions:
+            matrix = generator(rng, products, d)
+            directions = ["min" if j % 2 == 0 else "max" for j in range(d)]
+            start = time.perf_counter()
+            skyline = compute_skyline(matrix, directions)
+            elapsed = time.perf_counter() - start
+            print(f"{name:16s} {d:4d} {len(skyline):8,d} {elapsed * 1000:8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark payload size and latency of product reads with sparse fieldsets (?fields=, ?attributes=)."""
+import sys
+import os
+import argparse
+import tempfile
+import time
+from collections import Counter
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, get_db
+from src.schemas.product import ProductCreate
+from src.data.catalog_snapshot import invalidate_catalog_snapshot
+from src.data.product_service import ProductService
+from src.api.fragments import get_product_fragments
+from src.main import app
+from benchmark_attribute_projection import load_workbook_products
+
+
+def measure(client, url: str, repeats: int, cold: bool = False) -> tuple:
+    """(median seconds, payload bytes) of an uncompressed GET."""
+    times = []
+    for _ in range(repeats):
+        if cold:
+            get_product_fragments()._entries.clear()
+        start = time.perf_counter()
+        response = client.get(url, headers={"Accept-Encoding": "identity"})
+        times.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return sorted(times)[len(times) // 2], len(response.content)
+
+
+def main(extra_attributes: int, copies: int, repeats: int):
+    workbook = load_workbook_products(extra_attributes)
+    products = [
+        {**product, "product_id": f"{product['product_id']}-{copy}" if copy else product["product_id"]}
+        for copy in range(copies) for product in workbook
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        new_session = sessionmaker(bind=engine)
+        with new_session() as db:
+            for product in products:
+                ProductService.create_product(db, ProductCreate(**product))
+        invalidate_catalog_snapshot()
+        
+        def override_get_db():
+            with new_session() as db:
+                yield db
+        
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        
+        common = [name for name, _ in Counter(name for product in products for name in product["attributes"]).most_common(2)]
+        product_id = products[len(products) // 2]["product_id"]
+        width = sum(len(product["attributes"]) for product in products) / len(products)
+        print(f"Akari workbook x{copies}: {len(products)} products, {width:.1f} attributes per product; two attributes: {', '.join(common)}")
+        print(f"{'request':<52s} {'latency':>10s} {'payload':>12s}")
+        cases = [
+            ("/products (fragment cache cold)", "/api/v1/products", True),
+            ("/products (fragment cache warm)", "/api/v1/products", False),
+            ("/products?fields=name", "/api/v1/products?fields=name", False),
+            ("/products?fields=name&attributes=<two>", f"/api/v1/products?fields=name&attributes={','.join(common)}", False),
+            ("/products/{id} (fragment cache cold)", f"/api/v1/products/{product_id}", True),
+            ("/products/{id}?fields=name&attributes=<two>", f"/api/v1/products/{product_id}?fields=name&attributes={','.join(common)}", False)
+        ]
+        for label, url, cold in cases:
+            latency, size = measure(client, url, repeats, cold)
+            print(f"{label:<52s} {latency * 1000:8.2f}ms {size / 1024:8.1f} KiB")
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--extra-attributes", type=int, default=0,
+        help="Filler attributes added to every product to model wider sheets"
+    )
+    parser.add_argument("--copies", type=int, default=1, help="Copies of the workbook's products, to model a larger catalog")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    main(args.extra_attributes, args.copies, args.repeats)
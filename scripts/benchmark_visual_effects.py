@@ -0,0 +1,100 @@
+"""Benchmark effect payload generation for the CHOOSE effect list."""
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.intents.intent_mappings import INTENT_MAPPINGS
+from src.schemas.visualization import VisualEffect, VisualizationResponse
+from src.visualization.comparison_builder import ComparisonBuilder
+from src.visualization.visualization_engine import VisualizationEngine
+
+
+def legacy_apply_visual_effects(visualization_response):
+    """The previous engine: copy the data and rebuild the full effect map per effect."""
+    visualization_data = visualization_response.visualization_data.copy()
+    visualization_data["effects"] = []
+    product_ids = visualization_response.product_ids
+    attributes = visualization_response.selected_attributes
+    for effect in visualization_response.visual_effects:
+        effect_map = {
+            VisualEffect.SPLIT_SCREEN: {"type": "split_screen", "products": product_ids, "layout": "side_by_side"},
+            VisualEffect.HIGHLIGHT_DIFFERENCES: {"type": "highlight", "target": "differences", "attributes": attributes},
+            VisualEffect.HIGHLIGHT_MATERIALS: {
+                "type": "highlight", "target": "materials",
+                "attributes": [attr for attr in attributes if "material" in attr.lower()]
+            },
+            VisualEffect.ZOOM_EARCUP_FRAME: {"type": "zoom", "target": "earcup_frame", "magnification": 1.5},
+            VisualEffect.SHOW_SPEC_CALLOUTS: {"type": "callout", "target": "specs", "attributes": attributes},
+            VisualEffect.WEIGHT_LABEL: {"type": "label", "target": "weight", "position": "top_right"},
+            VisualEffect.COMFORT_INDICATOR: {
+                "type": "indicator", "target": "comfort",
+                "attributes": [attr for attr in attributes if attr in ["weight", "clamp_force", "padding_material"]]
+            },
+            VisualEffect.COMPARISON_VS_LIGHTER: {
+                "type": "comparison", "target": "weight_comparison", "reference": "lighter_products"
+            },
+            VisualEffect.HIGHLIGHT_TRAVEL_SPECS: {
+                "type": "highlight", "target": "travel_specs",
+                "attributes": [attr for attr in attributes if attr in ["weight", "foldability", "battery_life", "case_size"]]
+            },
+            VisualEffect.DIM_IRRELEVANT_SPECS: {"type": "dim", "target": "irrelevant", "keep_highlighted": attributes},
+        }
+        visualization_data["effects"].append(effect_map.get(effect, {"type": "unknown", "effect": str(effect)}))
+    return visualization_data
+
+
+def build_response(products=5):
+    """A CHOOSE visualization response for a few products."""
+    attributes = INTENT_MAPPINGS["choose"]["attributes"]
+    product_ids = [f"SKU-{i:04d}" for i in range(products)]
+    products_attributes = {
+        product_id: {
+            "price": 100.0 + 50 * i,
+            "weight": 200.0 + 10 * i,
+            "battery_life": 20.0 + i,
+            "noise_cancellation": bool(i % 2),
+            "usage_context": ["travel", "work"],
+            "foldability": True,
+            "case_size": "Medium"
+        }
+        for i, product_id in enumerate(product_ids)
+    }
+    comparison = ComparisonBuilder().build(product_ids, attributes, products_attributes)
+    return VisualizationResponse(
+        product_ids=product_ids,
+        selected_attributes=attributes,
+        visual_effects=INTENT_MAPPINGS["choose"]["visual_effects"],
+        visualization_data={
+            "products": products_attributes,
+            "comparison": comparison["values"],
+            "differences": {
+                "differing_attributes": comparison["differing_attributes"],
+                "attributes": comparison["attributes"]
+            }
+        }
+    )
+
+
+def main(iterations=50_000):
+    response = build_response()
+    engine = VisualizationEngine()
+    effects = len(response.visual_effects)
+    print(f"CHOOSE effects: {[effect.value for effect in response.visual_effects]}")
+    
+    for label, apply in (
+        ("rebuild effect map", legacy_apply_visual_effects),
+        ("class-level dispatch", engine.apply_visual_effects)
+    ):
+        apply(response)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            apply(response)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<20s} {iterations * effects / elapsed:12,.0f} effects/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Script to build the fuzzy product lookup index from the database."""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import SessionLocal
+from src.data.fuzzy_index import rebuild_fuzzy_index
+from src.config import settings
+
+
+def build_fuzzy_index():
+    """Build the fuzzy index over product names and models and save it."""
+    db = SessionLocal()
+    
+    try:
+        print("Building fuzzy product lookup index...")
+        index = rebuild_fuzzy_index(db)
+        print(f"  - Indexed {len(index.product_ids)} products")
+        print(f"  - Vocabulary: {len(index.vocab)} tokens, {len(index.grams)} trigrams")
+        print(f"  - Saved to {settings.fuzzy_index_path}")
+    except Exception as e:
+        print(f"Error building fuzzy index: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    build_fuzzy_index()
@@ -0,0 +1,53 @@
+"""Script to pregenerate image derivatives for visual assets stored on local disk."""
+import sys
+import os
+import argparse
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import SessionLocal
+from src.models.product import Product, VisualAsset
+from src.visualization.image_derivatives import build_derivatives
+from src.config import settings
+
+
+def build_image_derivatives(workers: int):
+    """Generate thumbnails, zoom crops and WebP variants and write the manifest."""
+    db = SessionLocal()
+    
+    try:
+        rows = db.query(
+            Product.product_id,
+            VisualAsset.asset_type,
+            VisualAsset.asset_url,
+            VisualAsset.asset_metadata
+        ).join(VisualAsset, VisualAsset.product_id == Product.id).all()
+        assets = [
+            {
+                "product_id": product_id,
+                "asset_type": asset_type,
+                "asset_url": asset_url,
+                "asset_metadata": asset_metadata
+            }
+            for product_id, asset_type, asset_url, asset_metadata in rows
+        ]
+        
+        print(f"Building image derivatives for {len(assets)} assets with {workers} workers...")
+        manifest = build_derivatives(assets, workers=workers)
+        local = sum(len(entries) for entries in manifest.values())
+        print(f"  - {local} local assets processed ({len(assets) - local} remote, missing or unreadable skipped)")
+        print(f"  - Cache and manifest in {settings.derivative_cache_dir}")
+    except Exception as e:
+        print(f"Error building image derivatives: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="  ! %(message)s")
+    build_image_derivatives(args.workers)
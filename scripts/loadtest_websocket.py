@@ -0,0 +1,115 @@
+"""Hold many idle /ws connections against a local server and measure its memory per connection."""
+import sys
+import os
+import argparse
+import asyncio
+import resource
+import statistics
+import subprocess
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+import websockets
+
+
+def rss_bytes(pid: int) -> int:
+    """Resident set size of a process (Linux /proc)."""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError(f"No VmRSS for process {pid}")
+
+
+def start_server(port: int, ws: str) -> subprocess.Popen:
+    """Run the app under uvicorn and wait until it answers."""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning",
+         "--backlog", "4096", "--ws", ws],
+        cwd=root
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+async def open_connections(url: str, count: int, batch: int) -> list:
+    """Open connections, ``batch`` handshakes at a time."""
+    connections = []
+    for start in range(0, count, batch):
+        connections += await asyncio.gather(*(
+            websockets.connect(url, ping_interval=None, max_size=None)
+            for _ in range(min(batch, count - start))
+        ))
+    return connections
+
+
+async def round_trips(connections: list, samples: int) -> list:
+    """Latency of a cheap message (reset) on a sample of the connections, in ms."""
+    latencies = []
+    for connection in connections[::max(1, len(connections) // samples)][:samples]:
+        start = time.perf_counter()
+        await connection.send('{"type": "reset"}')
+        await connection.recv()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def run(url: str, pid: int, count: int, batch: int, settle: float):
+    # Warm up: the first connection imports and allocates lazily
+    warm = await websockets.connect(url, ping_interval=None)
+    await warm.send('{"type": "reset"}')
+    await warm.recv()
+    await warm.close()
+    await asyncio.sleep(settle)
+    before = rss_bytes(pid)
+    
+    start = time.perf_counter()
+    connections = await open_connections(url, count, batch)
+    connect_time = time.perf_counter() - start
+    await asyncio.sleep(settle)
+    after = rss_bytes(pid)
+    latencies = await round_trips(connections, samples=100)
+    
+    print(f"connections:        {len(connections):,} (opened in {connect_time:.1f}s)")
+    print(f"server RSS:         {before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB")
+    print(f"per idle connection: {(after - before) / len(connections) / 1024:.1f} KiB")
+    print(f"round trip while all are open: median {statistics.median(latencies):.2f} ms, max {max(latencies):.2f} ms")
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=250, help="Concurrent handshakes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to wait before measuring")
+    parser.add_argument("--ws", default="auto", help="uvicorn WebSocket implementation (e.g. websockets-sansio, wsproto)")
+    args = parser.parse_args()
+    
+    # Each connection needs a descriptor here and one in the server
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = args.connections + 256
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+    
+    server = start_server(args.port, args.ws)
+    try:
+        asyncio.run(run(f"ws://127.0.0.1:{args.port}/api/v1/ws", server.pid, args.connections, args.batch, args.settle))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
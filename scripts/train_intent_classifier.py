@@ -0,0 +1,91 @@
+"""Train the linear intent classifier from labelled queries and the workbook's intent rows."""
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import settings
+from src.intents.intent_classifier import LinearIntentClassifier
+
+XLSX_PATH = os.path.join(os.path.dirname(__file__), '..', 'Product Attributes- Phase 3 Akari.xlsx')
+QUERIES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'intent_queries.jsonl')
+
+# Intent of each AI response type on the workbook's Pre-Decision Intent sheet
+WORKBOOK_RESPONSE_INTENTS = {
+    "trade-off explanation": "clarify",
+    "practical advice": "clarify",
+    "style advice": "choose",
+    "recommendation": "choose",
+    "value reasoning": "explain"
+}
+
+
+def load_workbook_queries(xlsx_path=XLSX_PATH):
+    """(query, intent) pairs from the workbook's intent rows, labelled by response type."""
+    if not os.path.exists(xlsx_path):
+        return []
+    with contextlib.redirect_stdout(io.StringIO()):
+        from update_from_xlsx import parse_xlsx
+        _, intent_mappings = parse_xlsx(xlsx_path)
+    return [
+        (mapping["user_intent"].strip("“”\""), WORKBOOK_RESPONSE_INTENTS[mapping["ai_response_type"].lower()])
+        for mapping in intent_mappings
+        if mapping["ai_response_type"].lower() in WORKBOOK_RESPONSE_INTENTS
+    ]
+
+
+def load_labelled_queries(paths=(QUERIES_PATH,), include_workbook=True):
+    """(query, intent) pairs from JSONL files ({"query": ..., "intent": ...} per line) and the workbook."""
+    examples = load_workbook_queries() if include_workbook else []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            examples.extend((row["query"], row["intent"]) for row in map(json.loads, f) if row.get("query"))
+    return examples
+
+
+def split(examples, holdout_every=5):
+    """Deterministic split: every n-th example of each intent is held out."""
+    seen = {}
+    train, test = [], []
+    for query, intent in examples:
+        seen[intent] = seen.get(intent, 0) + 1
+        (test if holdout_every and seen[intent] % holdout_every == 0 else train).append((query, intent))
+    return train, test
+
+
+def accuracy(model, examples):
+    if not examples:
+        return 0.0
+    probabilities = model.predict_proba_batch([query for query, _ in examples])
+    predicted = [model.labels[i] for i in probabilities.argmax(axis=1)]
+    return sum(p == intent for p, (_, intent) in zip(predicted, examples)) / len(examples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data", nargs="*", default=[QUERIES_PATH], help="Labelled JSONL files")
+    parser.add_argument("--output", default=settings.intent_model_path)
+    parser.add_argument("--dim", type=int, default=1 << 14, help="Hash buckets (a power of two)")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--holdout-every", type=int, default=5, help="Hold out every n-th example to report accuracy")
+    args = parser.parse_args()
+    
+    examples = load_labelled_queries(args.data)
+    train, test = split(examples, args.holdout_every)
+    model = LinearIntentClassifier.train([q for q, _ in train], [i for _, i in train], args.dim, args.epochs)
+    print(f"{len(examples)} labelled queries: {len(train)} train, {len(test)} held out")
+    print(f"  - train accuracy {accuracy(model, train):.1%}, held-out accuracy {accuracy(model, test):.1%}")
+    
+    # The shipped model is trained on everything
+    model = LinearIntentClassifier.train([q for q, _ in examples], [i for _, i in examples], args.dim, args.epochs)
+    model.save(args.output)
+    print(f"  - Saved {model.nbytes / 1024:.0f} KiB model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
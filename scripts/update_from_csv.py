@@ -7,9 +7,12 @@ import csv
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.database import SessionLocal, engine, Base
-from src.models.product import Product, ProductAttribute, VisualAsset
+from src.models.product import Product, ProductAttribute, VisualAsset, ProductReadiness
 from src.schemas.product import ProductCreate
 from src.data.product_service import ProductService
+from src.data.change_log import record_changes, DELETE
+from src.data.fuzzy_index import rebuild_fuzzy_index
+from src.config import settings
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -23,6 +26,10 @@ def clear_database(db):
         db.query(VisualAsset).delete()
         # Delete all product attributes
         db.query(ProductAttribute).delete()
+        # Delete readiness masks (the interned vocabulary is append-only and kept)
+        db.query(ProductReadiness).delete()
+        # Log the deletions for delta sync clients (re-created products supersede them)
+        record_changes(db, [product_id for (product_id,) in db.query(Product.product_id).all()], DELETE)
         # Delete all products
         db.query(Product).delete()
         db.commit()
@@ -220,6 +227,10 @@ def seed_database_from_csv(csv_path):
             print(f"  [OK] Created: {product.name} ({product.product_id})")
         
         print(f"\n[SUCCESS] Database updated successfully!")
+        
+        # Rebuild the fuzzy lookup index so the new products can be matched
+        rebuild_fuzzy_index(db)
+        print(f"  - Rebuilt fuzzy lookup index at {settings.fuzzy_index_path}")
         print(f"\nIntent Mappings Summary:")
         for mapping in intent_mappings:
             print(f"  - Intent: '{mapping['user_intent']}'")
@@ -20,9 +20,12 @@ except ImportError:
     import pandas as pd
 
 from src.database import SessionLocal, engine, Base
-from src.models.product import Product, ProductAttribute, VisualAsset
+from src.models.product import Product, ProductAttribute, VisualAsset, ProductReadiness
 from src.schemas.product import ProductCreate
 from src.data.product_service import ProductService
+from src.data.change_log import record_changes, DELETE
+from src.data.fuzzy_index import rebuild_fuzzy_index
+from src.config import settings
 import json
 
 # Create tables
@@ -37,6 +40,10 @@ def clear_database(db):
         db.query(VisualAsset).delete()
         # Delete all product attributes
         db.query(ProductAttribute).delete()
+        # Delete readiness masks (the interned vocabulary is append-only and kept)
+        db.query(ProductReadiness).delete()
+        # Log the deletions for delta sync clients (re-created products supersede them)
+        record_changes(db, [product_id for (product_id,) in db.query(Product.product_id).all()], DELETE)
         # Delete all products
         db.query(Product).delete()
         db.commit()
@@ -452,6 +459,10 @@ def seed_database_from_xlsx(xlsx_path):
         print(f"  - Created {created_count} products")
         print(f"  - Found {len(intent_mappings)} intent mappings")
         
+        # Rebuild the fuzzy lookup index so the API loads it prebuilt
+        rebuild_fuzzy_index(db)
+        print(f"  - Rebuilt fuzzy lookup index at {settings.fuzzy_index_path}")
+        
         if intent_mappings:
             print(f"\nIntent Mappings Summary:")
             for mapping in intent_mappings[:10]:  # Show first 10
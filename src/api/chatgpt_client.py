@@ -1,7 +1,13 @@
 """OpenAI API client wrapper."""
 from openai import OpenAI
 from src.config import settings
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator, List
+
+SYSTEM_PROMPT = "You are a helpful assistant that explains product attributes clearly and accurately. You only use the data provided to you and never invent or guess product information."
+
+
+class ExplanationError(str):
+    """Error message returned (or yielded) in place of an explanation when the API call fails."""
 
 
 class ChatGPTClient:
@@ -27,21 +33,59 @@ class ChatGPTClient:
             max_tokens: Maximum tokens in response
         
         Returns:
-            Generated explanation text
+            Generated explanation text; on an API error, the error message
+            as an ExplanationError
         """
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that explains product attributes clearly and accurately. You only use the data provided to you and never invent or guess product information."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._messages(prompt),
                 temperature=temperature,
                 max_tokens=max_tokens
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            return f"Error generating explanation: {str(e)}"
+            return ExplanationError(f"Error generating explanation: {str(e)}")
+    
+    def stream_explanation(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 500
+    ) -> Iterator[str]:
+        """
+        Generate explanation using GPT-4, yielding text as it is generated.
+        
+        Args:
+            prompt: The prompt to send to GPT-4
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in response
+        
+        Yields:
+            Text fragments; on an API error, the error message as an
+            ExplanationError instead
+        """
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            yield ExplanationError(f"Error generating explanation: {str(e)}")
+    
+    @staticmethod
+    def _messages(prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for an explanation prompt."""
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
     
     def validate_response(self, response: str, source_data: Dict[str, Any]) -> bool:
         """
@@ -0,0 +1,74 @@
+"""Pre-serialized product payloads."""
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+from src.config import settings
+from src.data.catalog_snapshot import catalog_generation
+from src.api.responses import fragment
+import threading
+
+
+class ProductFragmentCache:
+    """
+    LRU of serialized full product payloads (ProductFullResponse).
+    
+    A product's payload only changes with the catalog, so it is encoded once
+    per catalog generation and spliced into later responses as bytes.
+    Entries of older generations are dropped on the first lookup after a
+    catalog write.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._generation = catalog_generation()
+        self._lock = threading.Lock()
+    
+    def get_many(self, product_ids: List[str]) -> Dict[str, Any]:
+        """Cached fragments of the given products (missing ones are left out)."""
+        with self._lock:
+            self._check_generation()
+            found = {}
+            for product_id in product_ids:
+                entry = self._entries.get(product_id)
+                if entry is not None:
+                    self._entries.move_to_end(product_id)
+                    found[product_id] = entry
+            return found
+    
+    def put(self, product_id: str, payload: Any, generation: int) -> Any:
+        """
+        Serialize and store a payload read at catalog ``generation``.
+        
+        Returns:
+            The fragment
+        """
+        entry = fragment(payload)
+        with self._lock:
+            self._check_generation()
+            # Not cached if the catalog changed while it was read
+            if generation == self._generation and self.maxsize > 0:
+                self._entries[product_id] = entry
+                self._entries.move_to_end(product_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return entry
+    
+    def _check_generation(self):
+        generation = catalog_generation()
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+
+_cache: Optional[ProductFragmentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_product_fragments() -> ProductFragmentCache:
+    """Return the process-wide product fragment cache (PRODUCT_FRAGMENT_CACHE_SIZE entries)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ProductFragmentCache(settings.product_fragment_cache_size)
+    return _cache
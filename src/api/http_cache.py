@@ -0,0 +1,155 @@
+"""Conditional GET, cache headers and compression for catalog responses."""
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+from fastapi import Request, Response
+from src.config import settings
+from src.api.responses import dumps
+import gzip
+import threading
+
+
+def catalog_etag(generation: int) -> str:
+    """
+    Strong ETag of a catalog resource last changed at ``generation``.
+    
+    Generations are change log sequence numbers, which are never reused, so
+    every server process issues the same ETag for the same representation.
+    """
+    return f'"{generation}"'
+
+
+def _gzip_etag(etag: str) -> str:
+    """ETag of the gzip-encoded representation (strong ETags differ per encoding)."""
+    return f'{etag[:-1]}-gzip"'
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether the Accept-Encoding header allows gzip."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            key, _, value = params.partition("=")
+            if key.strip().lower() != "q":
+                return True
+            try:
+                return float(value) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def if_none_match(request: Request, etag: str, gzip_allowed: bool) -> Optional[str]:
+    """
+    Match the client's If-None-Match header against the current representations.
+    
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+    
+    Returns:
+        The matching ETag, or None
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return etag
+    current = (etag, _gzip_etag(etag)) if gzip_allowed else (etag,)
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return next((tag for tag in current if tag in tags), None)
+
+
+def cache_headers(etag: str) -> dict:
+    """Validator and freshness headers of a catalog response."""
+    max_age = settings.catalog_cache_max_age
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+
+
+class CompressedResponseCache:
+    """
+    LRU of gzip-compressed response bodies keyed by URL.
+    
+    An entry is only valid for the ETag it was stored with, so a catalog
+    write invalidates it without any bookkeeping.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[str, str], etag: str) -> Optional[bytes]:
+        """Cached body for ``key`` stored under ``etag``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: Tuple[str, str], etag: str, body: bytes) -> None:
+        """Store a body, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_compressed: Optional[CompressedResponseCache] = None
+_compressed_lock = threading.Lock()
+
+
+def get_compressed_responses() -> CompressedResponseCache:
+    """Return the process-wide compressed body cache (CATALOG_RESPONSE_CACHE_SIZE entries)."""
+    global _compressed
+    if _compressed is None:
+        with _compressed_lock:
+            if _compressed is None:
+                _compressed = CompressedResponseCache(settings.catalog_response_cache_size)
+    return _compressed
+
+
+def catalog_response(request: Request, etag: str, render: Callable[[], Any]) -> Response:
+    """
+    Respond with a cacheable catalog resource.
+    
+    Answers a matching If-None-Match with 304 before ``render`` is called, so
+    revalidation costs the caller's change log check and nothing more. Otherwise encodes what ``render``
+    returns, gzip-compressed when the client accepts it and the body is at
+    least CATALOG_GZIP_MIN_SIZE bytes.
+    
+    Args:
+        request: Incoming request
+        etag: ETag of the current representation (see ``catalog_etag``)
+        render: Returns the response content (may be or contain fragments)
+    """
+    gzip_allowed = settings.catalog_gzip_min_size >= 0 and accepts_gzip(request)
+    headers = cache_headers(etag)
+    matched = if_none_match(request, etag, gzip_allowed)
+    if matched is not None:
+        return Response(status_code=304, headers=dict(headers, ETag=matched))
+    
+    key = (request.url.path, request.url.query)
+    cache = get_compressed_responses()
+    if gzip_allowed:
+        body = cache.get(key, etag)
+        if body is not None:
+            return _gzip_response(body, headers)
+    
+    body = dumps(render())
+    if gzip_allowed and len(body) >= settings.catalog_gzip_min_size:
+        body = gzip.compress(body, compresslevel=settings.catalog_gzip_level)
+        cache.put(key, etag, body)
+        return _gzip_response(body, headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _gzip_response(body: bytes, headers: dict) -> Response:
+    headers = dict(headers, ETag=_gzip_etag(headers["ETag"]))
+    headers["Content-Encoding"] = "gzip"
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,82 @@
+"""Response classes for the API."""
+from typing import Any
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+# Pre-serialized JSON that orjson splices into its output (orjson 3.9 or later)
+_Fragment = getattr(orjson, "Fragment", None)
+
+
+def _encode_default(value: Any) -> Any:
+    """Encode values orjson does not handle itself."""
+    if isinstance(value, BaseModel):
+        # Serialized by pydantic-core, as FastAPI would (by alias)
+        if _Fragment is not None:
+            return _Fragment(value.model_dump_json(by_alias=True))
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact JSON.
+    
+    Handles what FastAPI's encoder does for response bodies: pydantic models
+    (by alias), enums, numpy values and non-string keys. Fragments made by
+    ``fragment`` are spliced in as they are.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_encode_default, option=_ORJSON_OPTIONS)
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def fragment(content: Any) -> Any:
+    """
+    Pre-serialize content that is sent many times unchanged.
+    
+    Returns an orjson Fragment that ``dumps`` copies into its output without
+    encoding it again, or the content itself without orjson (3.9 or later).
+    """
+    if _Fragment is not None:
+        return _Fragment(dumps(content))
+    return content
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with ``dumps``.
+    
+    Endpoints return it directly with a body of plain containers, models and
+    fragments, which skips FastAPI's validation and encoding walk over the
+    response; their ``response_model`` then only documents the body.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response for endpoints that read the request body while responding.
+    
+    StreamingResponse listens for client disconnects by consuming ``receive``
+    (under ASGI spec versions before 2.4), which would swallow request body
+    chunks the body iterator has yet to read. This response only streams;
+    the body iterator is the sole reader of the request.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
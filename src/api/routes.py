@@ -1,79 +1,193 @@
 """FastAPI route handlers."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from src.database import get_db
-from src.schemas.intent import IntentRequest, IntentResponse
+from typing import List, Dict, Any, Optional
+from src.database import get_db, SessionLocal
+from src.config import settings
+from src.schemas.intent import (
+    IntentRequest, IntentResponse, IntentBatchRequest, IntentProcessBatchRequest,
+    IntentProcessResponse, IntentProcessBatchResponse, ChooseResponse
+)
 from src.schemas.visualization import VisualizationResponse
-from src.schemas.explanation import ExplanationRequest, ExplanationResponse
-from src.schemas.product import ProductCreate, ProductFullResponse
+from src.schemas.explanation import ExplanationRequest, ExplanationResponse, FullExplanationResponse
+from src.schemas.product import ProductCreate, ProductFullResponse, ProductSearchResponse, ProductChangesResponse
 from src.intents.intent_handler import IntentHandler
 from src.intents.choose_handler import ChooseHandler
+from src.intents.batch_detector import BatchIntentDetector, queries_from_list, queries_from_ndjson
+from src.intents.detection_cache import get_detection_cache
+from src.intents.session_store import ConversationSession, get_session_store, open_session
 from src.explanation.chatgpt_explainer import ChatGPTExplainer
-from src.visualization.visualization_engine import VisualizationEngine
+from src.explanation.full_flow import FullExplanationFlow
 from src.data.product_service import ProductService
+from src.pipeline import PipelineRun, run_blocking
+from src.data.numeric_index import parse_predicate
+from src.api.responses import DuplexStreamingResponse, FastJSONResponse, dumps
+from src.api.fragments import get_product_fragments
+from src.api.http_cache import catalog_etag, catalog_response
+from src.data.catalog_snapshot import catalog_generation, product_generation
+from src.data.change_log import UPSERT, changes_since, current_generation, observe_changes
+from src.data.fuzzy_index import refresh_fuzzy_index_coalesced
+from src.models.product import Product
+import json
+
 
 router = APIRouter()
 
 
+def get_catalog_db(db: Session = Depends(get_db)) -> Session:
+    """
+    Database session for routes that read the catalog.
+    
+    Applies catalog writes logged since the last request (by any process) to
+    this process's catalog snapshot, product fragment and session caches.
+    """
+    observe_changes(db)
+    return db
+
+
 @router.post("/intent/detect", response_model=IntentResponse)
 async def detect_intent(
     request: IntentRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_catalog_db)
 ):
     """Detect user intent from query."""
     handler = IntentHandler()
-    intent_response, _ = handler.process_intent(db, request.user_query, request.product_ids)
+    run = await handler.run_intent_pipeline(db, request.user_query, request.product_ids)
+    response.headers["Server-Timing"] = run.server_timing()
+    intent_response, _ = run.results["response"]
     return intent_response
 
 
-@router.post("/intent/process", response_model=dict)
+@router.post("/intent/detect/batch")
+async def detect_intent_batch(request: Request):
+    """
+    Detect the intents of many queries, streaming results as NDJSON.
+    
+    The body is either JSON ({"queries": [...]}, see IntentBatchRequest) or,
+    with Content-Type application/x-ndjson, one query per line (a JSON string
+    or an object with 'user_query' and optional 'product_ids'), read as it
+    arrives. Each query produces one output line, in input order; invalid
+    NDJSON lines produce {"line": n, "error": ...}.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        queries = queries_from_ndjson(request.stream())
+    else:
+        try:
+            batch = IntentBatchRequest.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+        queries = queries_from_list(batch.queries)
+    
+    detector = BatchIntentDetector()
+    return DuplexStreamingResponse(detector.stream(queries), media_type="application/x-ndjson")
+
+
+@router.get("/intent/cache", response_model=dict)
+async def intent_cache_stats():
+    """Size and hit rate of this worker's intent detection cache."""
+    cache = get_detection_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+async def end_session(session_id: str):
+    """End a conversation session and free its state."""
+    store = get_session_store()
+    if store is None or not store.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    return Response(status_code=204)
+
+
+@router.post("/intent/process", response_model=IntentProcessResponse, response_class=FastJSONResponse)
 async def process_intent(
     request: IntentRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_catalog_db)
 ):
     """Process intent and return visualization."""
     handler = IntentHandler()
-    intent_response, visualization_response = handler.process_intent(
-        db, request.user_query, request.product_ids
+    run = await handler.run_intent_pipeline(
+        db, request.user_query, request.product_ids, request.pareto_attributes, with_effects=True,
+        session=open_session(request.session_id)
     )
+    return FastJSONResponse(_process_result(run), headers={"Server-Timing": run.server_timing()})
+
+
+@router.post("/intent/process/batch", response_model=IntentProcessBatchResponse, response_class=FastJSONResponse)
+async def process_intent_batch(
+    request: IntentProcessBatchRequest,
+    db: Session = Depends(get_catalog_db)
+):
+    """
+    Process many intents at once (e.g. dashboard widgets); results are in request order.
     
-    # Apply visual effects
-    viz_engine = VisualizationEngine()
-    enhanced_data = viz_engine.apply_visual_effects(visualization_response)
+    Conversation sessions are not used: the requests are independent.
+    """
+    handler = IntentHandler()
+    runs = await handler.run_intent_batch(db, request.requests, with_effects=True)
+    return FastJSONResponse({"results": [_process_result(run) for run in runs]})
+
+
+def _process_result(run: PipelineRun) -> dict:
+    """Response body of an intent process pipeline run (see IntentProcessResponse)."""
+    intent_response, visualization_response = run.results["response"]
     
+    # Visual effects were applied by the pipeline
     return {
         "intent": intent_response,
-        "visualization": {
-            **visualization_response.model_dump(),
-            "visualization_data": enhanced_data
-        }
+        "visualization": _visualization_body(visualization_response, run.results["effects"])
     }
 
 
-@router.post("/intent/choose", response_model=dict)
+def _visualization_body(visualization_response: VisualizationResponse, visualization_data: dict) -> dict:
+    """
+    A VisualizationResponse as a response body, with the effects' enhanced data.
+    
+    Built from the fields rather than with ``model_dump``, which would copy
+    the whole visualization data only to have it encoded once.
+    """
+    return {
+        "product_ids": visualization_response.product_ids,
+        "selected_attributes": visualization_response.selected_attributes,
+        "visual_effects": visualization_response.visual_effects,
+        "visualization_data": visualization_data,
+        "message": visualization_response.message
+    }
+
+
+@router.post("/intent/choose", response_model=ChooseResponse, response_class=FastJSONResponse)
 async def handle_choose_intent(
     request: IntentRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_catalog_db)
 ):
     """Handle CHOOSE intent with pre-decision checks."""
     handler = ChooseHandler()
-    intent_response, visualization_response, checks_result = handler.handle_choose_intent(
-        db, request.user_query, request.product_ids
+    run = await handler.run_choose_pipeline(
+        db, request.user_query, request.product_ids, request.pareto_attributes,
+        batch_checks=request.batch_checks, with_effects=True, session=open_session(request.session_id)
     )
+    intent_response, visualization_response, checks_result = run.results["choose"]
     
-    # Apply visual effects
-    viz_engine = VisualizationEngine()
-    enhanced_data = viz_engine.apply_visual_effects(visualization_response)
-    
-    return {
+    # Visual effects were applied by the pipeline, alongside the checks
+    result = {
         "intent": intent_response,
-        "visualization": {
-            **visualization_response.model_dump(),
-            "visualization_data": enhanced_data
-        },
+        "visualization": _visualization_body(visualization_response, run.results["effects"]),
         "pre_decision_checks": checks_result
     }
+    
+    # Rank candidates when requested
+    if request.top_k and visualization_response.product_ids:
+        context = {**(intent_response.extracted_context or {}), **(request.context or {})}
+        result["ranking"] = await run_blocking(
+            handler.rank_candidates, db, visualization_response.product_ids, context, request.top_k
+        )
+    
+    return FastJSONResponse(result, headers={"Server-Timing": run.server_timing()})
 
 
 @router.post("/explanation/generate", response_model=ExplanationResponse)
@@ -85,145 +199,120 @@ async def generate_explanation(
     return explainer.generate_explanation(request)
 
 
-@router.post("/explanation/full", response_model=dict)
+@router.post("/explanation/full", response_model=FullExplanationResponse, response_class=FastJSONResponse)
 async def full_flow_with_explanation(
     request: IntentRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_catalog_db)
 ):
     """Complete flow: intent → visualization → explanation."""
-    # Process intent
-    handler = IntentHandler()
-    intent_response, visualization_response = handler.process_intent(
-        db, request.user_query, request.product_ids
+    # Effects and the explanation run concurrently once the visualization is ready
+    flow = FullExplanationFlow()
+    run = await flow.run(
+        db, request.user_query, request.product_ids, request.pareto_attributes,
+        session=open_session(request.session_id)
     )
+    intent_response, visualization_response = run.results["response"]
     
-    # Apply visual effects
-    viz_engine = VisualizationEngine()
-    enhanced_data = viz_engine.apply_visual_effects(visualization_response)
+    return FastJSONResponse(
+        {
+            "intent": intent_response,
+            "visualization": _visualization_body(visualization_response, run.results["effects"]),
+            "explanation": run.results["explanation"]
+        },
+        headers={"Server-Timing": run.server_timing()}
+    )
+
+
+@router.websocket("/ws")
+async def interactive_connection(websocket: WebSocket):
+    """
+    Interactive connection, one per user.
     
-    # Generate explanation
-    if visualization_response.product_ids and visualization_response.selected_attributes:
-        # Format attributes for explanation
-        product_service = ProductService()
-        products_attrs = product_service.get_products_attributes(
-            db, visualization_response.product_ids
-        )
-        
-        # Filter to selected attributes only
-        formatted_attrs = {}
-        for product_id, attrs in products_attrs.items():
-            formatted_attrs[product_id] = {
-                attr: attrs.get(attr) for attr in visualization_response.selected_attributes
-                if attr in attrs
-            }
-        
-        explanation_request = ExplanationRequest(
-            user_intent=intent_response.intent_type.value,
-            selected_attributes=formatted_attrs,
-            visual_effects_applied=[effect.value for effect in visualization_response.visual_effects],
-            products=visualization_response.product_ids,
-            user_query=request.user_query
-        )
-        
-        explainer = ChatGPTExplainer()
-        explanation_response = explainer.generate_explanation(explanation_request)
-    else:
-        explanation_response = ExplanationResponse(
-            explanation="Unable to generate explanation: no products or attributes selected.",
-            source_data_verified=False
-        )
+    The client sends JSON messages:
     
-    return {
-        "intent": intent_response,
-        "visualization": {
-            **visualization_response.model_dump(),
-            "visualization_data": enhanced_data
-        },
-        "explanation": explanation_response
-    }
+    - {"type": "query", "id": ..., <IntentRequest fields>}: runs the full
+      flow. The reply is {"type": "visualization", ...} (the body of
+      /intent/process) as soon as it is ready, then {"type": "token",
+      "text": ...} fragments of the explanation as they are generated, then
+      {"type": "explanation", ...} (an ExplanationResponse). Every reply
+      carries the query's optional "id".
+    - {"type": "reset"}: forget the connection's conversation state.
+    
+    The connection holds its own conversation state (products, loaded
+    attributes, plan, explanation turns), so follow-up queries reuse it;
+    queries with a session_id use that session instead. Invalid messages get
+    {"type": "error", "detail": ...} and the connection stays open.
+    """
+    await websocket.accept()
+    # Created on first use, so idle connections stay small
+    session: Optional[ConversationSession] = None
+    flow: Optional[FullExplanationFlow] = None
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            message_type = message.pop("type", "query")
+            message_id = message.pop("id", None)
+            if message_type == "reset":
+                session = None
+                await websocket.send_json({"type": "reset", "id": message_id})
+                continue
+            if message_type != "query":
+                await websocket.send_json({"type": "error", "id": message_id, "detail": f"Unknown message type: {message_type}"})
+                continue
+            try:
+                request = IntentRequest.model_validate(message)
+            except ValidationError as e:
+                await websocket.send_json({"type": "error", "id": message_id, "detail": jsonable_encoder(e.errors(include_url=False))})
+                continue
+            
+            query_session = open_session(request.session_id)
+            if query_session is None:
+                if session is None:
+                    session = ConversationSession(f"ws-{id(websocket)}")
+                query_session = session
+            flow = flow or FullExplanationFlow()
+            with SessionLocal() as db:
+                await run_blocking(observe_changes, db)
+                async for kind, payload in flow.stream(
+                    db, request.user_query, request.product_ids, request.pareto_attributes, query_session
+                ):
+                    if kind == "visualization":
+                        body = {"type": kind, "id": message_id, **_process_result(payload)}
+                    elif kind == "token":
+                        body = {"type": kind, "id": message_id, "text": payload}
+                    else:
+                        body = {"type": kind, "id": message_id, **payload.model_dump()}
+                    await websocket.send_text(dumps(body).decode())
+            if query_session is session:
+                session.trim(settings.session_max_bytes)
+    except WebSocketDisconnect:
+        pass
 
 
 @router.post("/products", response_model=ProductFullResponse)
 async def create_product(
     product: ProductCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Create a new product."""
     service = ProductService()
     created_product = service.create_product(db, product)
+    # Make the product fuzzy-matchable without delaying the response
+    background_tasks.add_task(refresh_fuzzy_index_coalesced, SessionLocal)
     
     # Return full product data
-    return ProductFullResponse(
-        id=created_product.id,
-        product_id=created_product.product_id,
-        name=created_product.name,
-        category=created_product.category,
-        attributes=[
-            {
-                "attribute_name": attr.attribute_name,
-                "attribute_type": attr.attribute_type,
-                "attribute_value": attr.attribute_value,
-                "unit": attr.unit,
-                "display_name": attr.display_name
-            }
-            for attr in created_product.attributes
-        ],
-        visual_assets=[
-            {
-                "asset_type": asset.asset_type,
-                "asset_url": asset.asset_url,
-                "metadata": asset.asset_metadata
-            }
-            for asset in created_product.visual_assets
-        ]
-    )
+    return _product_response(created_product)
 
 
-@router.get("/products", response_model=List[ProductFullResponse])
-async def get_all_products(db: Session = Depends(get_db)):
-    """Get all products."""
-    service = ProductService()
-    products = service.get_all_products(db)
-    
-    result = []
-    for product in products:
-        result.append(ProductFullResponse(
-            id=product.id,
-            product_id=product.product_id,
-            name=product.name,
-            category=product.category,
-            attributes=[
-                {
-                    "attribute_name": attr.attribute_name,
-                    "attribute_type": attr.attribute_type,
-                    "attribute_value": attr.attribute_value,
-                    "unit": attr.unit,
-                    "display_name": attr.display_name
-                }
-                for attr in product.attributes
-            ],
-            visual_assets=[
-                {
-                    "asset_type": asset.asset_type,
-                    "asset_url": asset.asset_url,
-                    "metadata": asset.asset_metadata
-                }
-                for asset in product.visual_assets
-            ]
-        ))
-    
-    return result
-
-
-@router.get("/products/{product_id}", response_model=ProductFullResponse)
-async def get_product(product_id: str, db: Session = Depends(get_db)):
-    """Get product by ID."""
-    service = ProductService()
-    product = service.get_product_by_id(db, product_id)
-    
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
+def _product_response(product: Product) -> ProductFullResponse:
+    """Full product data of a product with its attributes and assets."""
     return ProductFullResponse(
         id=product.id,
         product_id=product.product_id,
@@ -249,3 +338,181 @@ async def get_product(product_id: str, db: Session = Depends(get_db)):
         ]
     )
 
+
+def _product_fragment_map(db: Session, product_ids: List[str]) -> Dict[str, Any]:
+    """
+    Serialized full product data by product ID; unknown IDs are left out.
+    
+    Payloads are cached per catalog generation, so only products not seen
+    since the last catalog write are loaded and encoded.
+    """
+    cache = get_product_fragments()
+    generation = catalog_generation()
+    fragments = cache.get_many(product_ids)
+    missing = [product_id for product_id in product_ids if product_id not in fragments]
+    for product in ProductService.get_products_with_details(db, missing):
+        fragments[product.product_id] = cache.put(product.product_id, _product_response(product), generation)
+    return fragments
+
+
+def _product_fragments(db: Session, product_ids: List[str]) -> List[Any]:
+    """Serialized full product data of products, in order; unknown IDs are skipped."""
+    fragments = _product_fragment_map(db, product_ids)
+    return [fragments[product_id] for product_id in product_ids if product_id in fragments]
+
+
+PRODUCT_FIELDS = list(ProductFullResponse.model_fields)
+
+FIELDS_QUERY = Query(
+    None,
+    description=f"Comma-separated fields to include, from {', '.join(PRODUCT_FIELDS)} (product_id is always included)"
+)
+ATTRIBUTES_QUERY = Query(None, description="Comma-separated attribute names to include, e.g. price,weight")
+
+
+def _product_projection(fields: Optional[str], attributes: Optional[str]) -> Optional[tuple]:
+    """
+    Parse sparse fieldset parameters.
+    
+    Returns:
+        (fields, attribute names or None), or None when the full payload is wanted
+    
+    Raises:
+        HTTPException: 400 on unknown fields
+    """
+    if fields is None and attributes is None:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields is not None else list(PRODUCT_FIELDS)
+    unknown = [field for field in selected if field not in PRODUCT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}; expected any of {', '.join(PRODUCT_FIELDS)}"
+        )
+    attribute_names = None
+    if attributes is not None:
+        attribute_names = list(dict.fromkeys(name.strip() for name in attributes.split(",") if name.strip()))
+        if "attributes" not in selected:
+            selected.append("attributes")
+    if attribute_names is None and set(selected) == set(PRODUCT_FIELDS):
+        return None
+    return selected, attribute_names
+
+
+@router.get("/products", response_model=List[ProductFullResponse], response_class=FastJSONResponse)
+async def get_all_products(
+    request: Request,
+    filter: List[str] = Query(
+        default=[],
+        description="Attribute filters as attribute:value, '|' separates alternatives (e.g. colorway:White|Black)"
+    ),
+    fields: Optional[str] = FIELDS_QUERY,
+    attributes: Optional[str] = ATTRIBUTES_QUERY,
+    db: Session = Depends(get_catalog_db)
+):
+    """Get all products, optionally only some fields and attributes of them."""
+    projection = _product_projection(fields, attributes)
+    filters = {}
+    for expression in filter:
+        attribute, separator, values = expression.partition(":")
+        if not separator or not attribute.strip() or not values.strip():
+            raise HTTPException(status_code=400, detail=f"Invalid filter '{expression}', expected attribute:value")
+        filters.setdefault(attribute.strip(), []).extend(v.strip() for v in values.split("|") if v.strip())
+    
+    def render():
+        service = ProductService()
+        if projection is not None:
+            product_ids = service.filter_product_ids(db, filters) if filters else None
+            return service.get_product_projections(db, product_ids, *projection)
+        product_ids = service.filter_product_ids(db, filters) if filters else service.list_product_ids(db)
+        return _product_fragments(db, product_ids)
+    
+    return catalog_response(request, catalog_etag(catalog_generation()), render)
+
+
+@router.get("/products/search", response_model=ProductSearchResponse)
+async def search_products(
+    where: List[str] = Query(default=[], description="Numeric predicates, e.g. price<=300 or battery_life>=20"),
+    category: Optional[str] = Query(None, description="Restrict to a product category"),
+    sort_by: Optional[str] = Query(None, description="Numeric attribute to rank results by"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_catalog_db)
+):
+    """Search products by numeric attribute ranges with optional top-k ordering."""
+    try:
+        predicates = [parse_predicate(expression) for expression in where]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # A cold call loads the catalog snapshot; keep that off the event loop
+    return await run_blocking(
+        ProductService.search_products,
+        db,
+        predicates,
+        category,
+        sort_by,
+        order == "desc",
+        limit
+    )
+
+
+@router.get("/products/changes", response_model=ProductChangesResponse, response_class=FastJSONResponse)
+async def get_product_changes(
+    since: int = Query(0, ge=0, description="Catalog generation of the caller's replica (0 for a full download)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of changes"),
+    db: Session = Depends(get_catalog_db)
+):
+    """
+    Products created, updated or deleted since a catalog generation.
+    
+    Each product appears once, with its latest change. Replicas pass the
+    returned generation as `since` on their next call, and call again right
+    away while `has_more` is true.
+    """
+    entries = changes_since(db, since, limit + 1)
+    reset = not entries and since > current_generation(db)
+    if reset:
+        entries = changes_since(db, 0, limit + 1)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    
+    fragments = _product_fragment_map(db, [entry.product_id for entry in entries if entry.change == UPSERT])
+    changes = []
+    for entry in entries:
+        change = {"product_id": entry.product_id, "change": entry.change, "generation": entry.seq, "product": None}
+        if entry.change == UPSERT:
+            if entry.product_id not in fragments:
+                # Deleted after it was logged; its tombstone comes with a later generation
+                continue
+            change["product"] = fragments[entry.product_id]
+        changes.append(change)
+    
+    generation = entries[-1].seq if entries else (0 if reset else since)
+    return FastJSONResponse({"generation": generation, "has_more": has_more, "reset": reset, "changes": changes})
+
+
+@router.get("/products/{product_id}", response_model=ProductFullResponse, response_class=FastJSONResponse)
+async def get_product(
+    product_id: str,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
+    attributes: Optional[str] = ATTRIBUTES_QUERY,
+    db: Session = Depends(get_catalog_db)
+):
+    """Get product by ID, optionally only some fields and attributes of it."""
+    projection = _product_projection(fields, attributes)
+    # A missing product has no generation to match: never answer 304 for it
+    if ProductService.get_product_by_id(db, product_id) is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    def render():
+        if projection is not None:
+            payloads = ProductService.get_product_projections(db, [product_id], *projection)
+        else:
+            payloads = _product_fragments(db, [product_id])
+        if not payloads:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return payloads[0]
+    
+    return catalog_response(request, catalog_etag(product_generation(product_id)), render)
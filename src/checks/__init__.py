@@ -3,11 +3,13 @@ from src.checks.attribute_completeness import AttributeCompletenessCheck
 from src.checks.user_context import UserContextCheck
 from src.checks.visualization_ready import VisualizationReadyCheck
 from src.checks.decision_confidence import DecisionConfidenceCheck
+from src.checks.batch_checks import BatchPreDecisionChecks
 
 __all__ = [
     "AttributeCompletenessCheck",
     "UserContextCheck",
     "VisualizationReadyCheck",
-    "DecisionConfidenceCheck"
+    "DecisionConfidenceCheck",
+    "BatchPreDecisionChecks"
 ]
 
@@ -1,14 +1,14 @@
 """Attribute completeness check."""
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
+from src.data.readiness import ATTRIBUTE, load_readiness, vocabulary_bits, mask_of, names_in
 from src.data.product_service import ProductService
 
 
 class AttributeCompletenessCheck:
     """Checks if all required attributes are available for products."""
     
-    def __init__(self):
-        self.product_service = ProductService()
+    COVERAGE_THRESHOLD = 0.8  # 80% coverage threshold
     
     def check(
         self,
@@ -19,6 +19,10 @@ class AttributeCompletenessCheck:
         """
         Check attribute completeness.
         
+        Uses the precomputed per-product attribute bitmasks. Products without
+        stored masks are covered by an aggregate query in the database rather
+        than by loading their attribute rows.
+        
         Returns:
             Dict with 'passed' (bool), 'missing_attributes' (List[str]), 'coverage' (float)
         """
@@ -30,27 +34,27 @@ class AttributeCompletenessCheck:
                 "message": "No products or attributes specified"
             }
         
-        # Get attributes for all products
-        products_attributes = self.product_service.get_products_attributes(db, product_ids)
+        # An attribute is available if any product has it: OR the products'
+        # attribute bitmasks and count the required bits that are set
+        required_attributes = list(dict.fromkeys(required_attributes))
+        bits = vocabulary_bits(db, ATTRIBUTE, required_attributes)
+        readiness = load_readiness(db, product_ids, compute_missing=False)
+        available_mask = 0
+        for _, attribute_mask in readiness.values():
+            available_mask |= attribute_mask
+        available_mask &= mask_of(required_attributes, bits)
+        available = set(names_in(available_mask, required_attributes, bits))
         
-        # Check which attributes are missing
-        missing_attributes = []
-        available_count = 0
+        unindexed = [product_id for product_id in product_ids if product_id not in readiness]
+        if unindexed and len(available) < len(required_attributes):
+            pending = [attr for attr in required_attributes if attr not in available]
+            available.update(ProductService.attribute_coverage(db, unindexed, pending))
         
-        for attr in required_attributes:
-            attr_available = False
-            for product_id, attrs in products_attributes.items():
-                if attr in attrs:
-                    attr_available = True
-                    break
-            
-            if attr_available:
-                available_count += 1
-            else:
-                missing_attributes.append(attr)
+        available_count = len(available)
+        missing_attributes = [attr for attr in required_attributes if attr not in available]
         
         coverage = available_count / len(required_attributes) if required_attributes else 0.0
-        passed = coverage >= 0.8  # 80% coverage threshold
+        passed = coverage >= self.COVERAGE_THRESHOLD
         
         return {
             "passed": passed,
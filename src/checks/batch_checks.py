@@ -0,0 +1,257 @@
+"""Vectorized pre-decision checks over many candidate products."""
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional
+from src.checks.attribute_completeness import AttributeCompletenessCheck
+from src.checks.decision_confidence import DecisionConfidenceCheck
+from src.data.catalog_snapshot import get_catalog_snapshot
+from src.data.readiness import ASSET_TYPE, ATTRIBUTE, load_readiness, vocabulary_bits
+import numpy as np
+
+
+def unpack_bits(masks: List[int], names: List[str], bits: Dict[str, int]) -> np.ndarray:
+    """
+    Decode bitmasks into a boolean matrix.
+    
+    Args:
+        masks: One integer bitmask per row
+        names: Column names
+        bits: Bit of each name (names without a bit give all-False columns)
+    
+    Returns:
+        Array of shape (len(masks), len(names))
+    """
+    matrix = np.zeros((len(masks), len(names)), dtype=bool)
+    columns = [j for j, name in enumerate(names) if name in bits]
+    if not masks or not columns:
+        return matrix
+    
+    column_bits = np.array([bits[names[j]] for j in columns], dtype=np.int64)
+    width = int(column_bits.max()) // 8 + 1
+    limit = (1 << (width * 8)) - 1
+    packed = np.frombuffer(
+        b"".join((mask & limit).to_bytes(width, "little") for mask in masks),
+        dtype=np.uint8
+    ).reshape(len(masks), width)
+    matrix[:, columns] = np.unpackbits(packed, axis=1, bitorder="little")[:, column_bits].view(bool)
+    return matrix
+
+
+class BatchPreDecisionChecks:
+    """
+    Runs the four pre-decision checks for hundreds or thousands of products.
+    
+    Each product is checked on its own: attribute coverage, user context and
+    visual asset readiness become boolean matrices (products x attributes,
+    context terms or asset types) decoded from the readiness bitmasks and the
+    catalog's inverted index, and every score is an array operation over them.
+    The aggregate result over all products has the same shape as the
+    per-request checks in ChooseHandler.
+    """
+    
+    def __init__(self):
+        self.confidence_check = DecisionConfidenceCheck()
+    
+    def check(
+        self,
+        db: Session,
+        product_ids: List[str],
+        required_attributes: List[str],
+        user_context: Optional[Dict[str, Any]] = None,
+        required_asset_types: Optional[List[str]] = None,
+        query_clarity: float = 0.5
+    ) -> Dict[str, Any]:
+        """
+        Check many products at once.
+        
+        Args:
+            db: Database session
+            product_ids: Candidate product IDs
+            required_attributes: Attributes the decision needs
+            user_context: Intent context with optional 'usage_context' and 'mentioned_attributes'
+            required_asset_types: Required visual asset types (default ['main_image'])
+            query_clarity: Clarity score of user query (0-1)
+        
+        Returns:
+            Dict with 'passed', 'checks' (aggregate over all products), 'message'
+            and 'products' ({product_id: per-product result})
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        required_attributes = list(dict.fromkeys(required_attributes))
+        required_asset_types = list(dict.fromkeys(required_asset_types or ["main_image"]))
+        user_context = user_context or {}
+        
+        readiness = load_readiness(db, product_ids)
+        masks = [readiness.get(product_id, (0, 0)) for product_id in product_ids]
+        attributes = unpack_bits(
+            [attribute_mask for _, attribute_mask in masks],
+            required_attributes,
+            vocabulary_bits(db, ATTRIBUTE, required_attributes)
+        )
+        assets = unpack_bits(
+            [asset_mask for asset_mask, _ in masks],
+            required_asset_types,
+            vocabulary_bits(db, ASSET_TYPE, required_asset_types)
+        )
+        context_terms, context = self._context_matrix(db, product_ids, user_context)
+        
+        # Per-product scores
+        coverage = attributes.mean(axis=1) if required_attributes else np.zeros(len(product_ids))
+        attribute_passed = coverage >= AttributeCompletenessCheck.COVERAGE_THRESHOLD
+        context_passed = context.any(axis=1) if context_terms else np.ones(len(product_ids), dtype=bool)
+        visualization_ready = assets.all(axis=1)
+        confidence = self.confidence_check.calculate_batch(coverage, context_passed, visualization_ready, query_clarity)
+        confidence_passed = confidence >= DecisionConfidenceCheck.PASS_THRESHOLD
+        passed = attribute_passed & context_passed & visualization_ready & confidence_passed
+        
+        result = self._aggregate(
+            product_ids, required_attributes, required_asset_types,
+            attributes, assets, context_terms, context, query_clarity
+        )
+        result["products"] = self._per_product(
+            product_ids, required_attributes, required_asset_types, context_terms,
+            attributes, assets, context, coverage, context_passed, visualization_ready, confidence, passed
+        )
+        result["summary"] = {
+            "products": len(product_ids),
+            "passed": int(passed.sum()),
+            "attribute_completeness_passed": int(attribute_passed.sum()),
+            "user_context_passed": int(context_passed.sum()),
+            "visualization_ready": int(visualization_ready.sum()),
+            "mean_confidence": float(confidence.mean()) if len(product_ids) else 0.0
+        }
+        return result
+    
+    def _context_matrix(
+        self,
+        db: Session,
+        product_ids: List[str],
+        user_context: Dict[str, Any]
+    ) -> tuple[List[str], np.ndarray]:
+        """Context terms and the products x terms match matrix from the inverted index."""
+        usage_context = user_context.get("usage_context")
+        mentioned_attributes = list(dict.fromkeys(user_context.get("mentioned_attributes") or []))
+        
+        terms = []
+        bitmaps = []
+        snapshot = get_catalog_snapshot(db)
+        index = snapshot.inverted_index
+        if usage_context:
+            terms.append("usage_context")
+            bitmaps.append(index.bitmap("usage_context", usage_context))
+        for attr in mentioned_attributes:
+            if attr not in terms:
+                terms.append(attr)
+                bitmaps.append(index.has_attribute(attr))
+        
+        matrix = np.zeros((len(product_ids), len(terms)), dtype=bool)
+        known = np.array([product_id in snapshot.position for product_id in product_ids], dtype=bool)
+        if terms and known.any():
+            positions = np.array(
+                [snapshot.position[product_id] for product_id in product_ids if product_id in snapshot.position],
+                dtype=np.int64
+            )
+            matrix[known] = np.column_stack([index.mask(bitmap)[positions] for bitmap in bitmaps])
+        return terms, matrix
+    
+    def _aggregate(
+        self,
+        product_ids: List[str],
+        required_attributes: List[str],
+        required_asset_types: List[str],
+        attributes: np.ndarray,
+        assets: np.ndarray,
+        context_terms: List[str],
+        context: np.ndarray,
+        query_clarity: float
+    ) -> Dict[str, Any]:
+        """Checks over the whole product set, shaped like ChooseHandler's pre-decision result."""
+        available = attributes.any(axis=0)
+        available_count = int(available.sum())
+        missing_attributes = [attr for attr, present in zip(required_attributes, available) if not present]
+        coverage = available_count / len(required_attributes) if required_attributes else 0.0
+        attribute_passed = bool(product_ids) and coverage >= AttributeCompletenessCheck.COVERAGE_THRESHOLD
+        attribute_result = {
+            "passed": attribute_passed,
+            "missing_attributes": missing_attributes,
+            "coverage": coverage,
+            "available_count": available_count,
+            "total_count": len(required_attributes),
+            "message": f"Attribute coverage: {coverage:.1%}" if attribute_passed else f"Missing attributes: {', '.join(missing_attributes)}"
+        }
+        
+        matched_attributes = [term for term, matched in zip(context_terms, context.any(axis=0)) if matched]
+        context_result = {
+            "passed": bool(matched_attributes) or not context_terms,
+            "matched_attributes": matched_attributes,
+            "message": f"Matched attributes: {', '.join(matched_attributes)}" if matched_attributes else "No matching attributes found"
+        }
+        
+        missing_assets = self._names_where(product_ids, required_asset_types, ~assets)
+        visualization_passed = bool(product_ids) and not missing_assets
+        visualization_result = {
+            "passed": visualization_passed,
+            "missing_assets": missing_assets,
+            "message": "All products have required visual assets" if visualization_passed else f"Missing assets: {missing_assets}"
+        }
+        
+        confidence_result = self.confidence_check.calculate(
+            attribute_result,
+            context_result,
+            visualization_result,
+            query_clarity
+        )
+        return {
+            "passed": attribute_passed and context_result["passed"] and visualization_passed and confidence_result["passed"],
+            "checks": {
+                "attribute_completeness": attribute_result,
+                "user_context": context_result,
+                "visualization_ready": visualization_result,
+                "decision_confidence": confidence_result
+            },
+            "message": confidence_result["message"]
+        }
+    
+    def _per_product(
+        self,
+        product_ids: List[str],
+        required_attributes: List[str],
+        required_asset_types: List[str],
+        context_terms: List[str],
+        attributes: np.ndarray,
+        assets: np.ndarray,
+        context: np.ndarray,
+        coverage: np.ndarray,
+        context_passed: np.ndarray,
+        visualization_ready: np.ndarray,
+        confidence: np.ndarray,
+        passed: np.ndarray
+    ) -> Dict[str, Dict[str, Any]]:
+        """Per-product results; name lists are built only from the set matrix entries."""
+        missing_attributes = self._names_where(product_ids, required_attributes, ~attributes)
+        missing_assets = self._names_where(product_ids, required_asset_types, ~assets)
+        matched = self._names_where(product_ids, context_terms, context)
+        return {
+            product_id: {
+                "passed": product_passed,
+                "coverage": product_coverage,
+                "missing_attributes": missing_attributes.get(product_id, []),
+                "matched_context": matched.get(product_id, []),
+                "user_context_passed": product_context,
+                "visualization_ready": product_ready,
+                "missing_assets": missing_assets.get(product_id, []),
+                "confidence": product_confidence
+            }
+            for product_id, product_passed, product_coverage, product_context, product_ready, product_confidence in zip(
+                product_ids, passed.tolist(), coverage.tolist(), context_passed.tolist(),
+                visualization_ready.tolist(), confidence.tolist()
+            )
+        }
+    
+    @staticmethod
+    def _names_where(product_ids: List[str], names: List[str], selected: np.ndarray) -> Dict[str, List[str]]:
+        """{product_id: names whose column is set} for the rows with any column set."""
+        rows, columns = np.nonzero(selected)
+        result: Dict[str, List[str]] = {}
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            result.setdefault(product_ids[row], []).append(names[column])
+        return result
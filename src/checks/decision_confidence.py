@@ -1,10 +1,22 @@
 """Decision confidence scoring."""
 from typing import Dict, Any, List
+import numpy as np
 
 
 class DecisionConfidenceCheck:
     """Calculates confidence score for decision readiness."""
     
+    # Weight factors
+    ATTRIBUTE_WEIGHT = 0.4
+    CONTEXT_WEIGHT = 0.2
+    VISUALIZATION_WEIGHT = 0.2
+    CLARITY_WEIGHT = 0.2
+    
+    # Score of a failed context or visualization check
+    FAILED_CHECK_SCORE = 0.5
+    
+    PASS_THRESHOLD = 0.7  # 70% confidence threshold
+    
     def calculate(
         self,
         attribute_completeness: Dict[str, Any],
@@ -24,26 +36,20 @@ class DecisionConfidenceCheck:
         Returns:
             Dict with 'confidence' (float), 'passed' (bool), 'factors' (Dict)
         """
-        # Weight factors
-        attribute_weight = 0.4
-        context_weight = 0.2
-        visualization_weight = 0.2
-        clarity_weight = 0.2
-        
         # Get scores
         attribute_score = attribute_completeness.get("coverage", 0.0)
-        context_score = 1.0 if user_context.get("passed", False) else 0.5
-        visualization_score = 1.0 if visualization_ready.get("passed", False) else 0.5
+        context_score = 1.0 if user_context.get("passed", False) else self.FAILED_CHECK_SCORE
+        visualization_score = 1.0 if visualization_ready.get("passed", False) else self.FAILED_CHECK_SCORE
         
         # Calculate weighted confidence
         confidence = (
-            attribute_score * attribute_weight +
-            context_score * context_weight +
-            visualization_score * visualization_weight +
-            query_clarity * clarity_weight
+            attribute_score * self.ATTRIBUTE_WEIGHT +
+            context_score * self.CONTEXT_WEIGHT +
+            visualization_score * self.VISUALIZATION_WEIGHT +
+            query_clarity * self.CLARITY_WEIGHT
         )
         
-        passed = confidence >= 0.7  # 70% confidence threshold
+        passed = confidence >= self.PASS_THRESHOLD
         
         factors = {
             "attribute_completeness": attribute_score,
@@ -58,4 +64,30 @@ class DecisionConfidenceCheck:
             "factors": factors,
             "message": f"Decision confidence: {confidence:.1%}" + (" - Ready to proceed" if passed else " - Needs clarification")
         }
-
+    
+    def calculate_batch(
+        self,
+        coverage: np.ndarray,
+        context_passed: np.ndarray,
+        visualization_ready: np.ndarray,
+        query_clarity: float = 0.5
+    ) -> np.ndarray:
+        """
+        Confidence scores of many products at once.
+        
+        Args:
+            coverage: Attribute coverage per product
+            context_passed: Boolean user context result per product
+            visualization_ready: Boolean visualization readiness per product
+            query_clarity: Clarity score of user query (0-1)
+        
+        Returns:
+            Confidence per product, weighted as in ``calculate``
+        """
+        failed = self.FAILED_CHECK_SCORE
+        return (
+            coverage * self.ATTRIBUTE_WEIGHT +
+            np.where(context_passed, 1.0, failed) * self.CONTEXT_WEIGHT +
+            np.where(visualization_ready, 1.0, failed) * self.VISUALIZATION_WEIGHT +
+            query_clarity * self.CLARITY_WEIGHT
+        )
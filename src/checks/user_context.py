@@ -2,6 +2,7 @@
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from src.data.product_service import ProductService
+from src.data.catalog_snapshot import get_catalog_snapshot
 
 
 class UserContextCheck:
@@ -40,26 +41,21 @@ class UserContextCheck:
                 "message": "No specific context to validate"
             }
         
-        # Get product attributes
-        products_attributes = self.product_service.get_products_attributes(db, product_ids)
+        # Resolve products against the inverted attribute index
+        snapshot = get_catalog_snapshot(db)
+        index = snapshot.inverted_index
+        selected = snapshot.bitmap_for(product_ids)
         
         matched_attributes = []
         
-        # Check if usage_context attribute exists
-        if usage_context:
-            for product_id, attrs in products_attributes.items():
-                if "usage_context" in attrs:
-                    usage_contexts = attrs.get("usage_context", [])
-                    if isinstance(usage_contexts, list) and usage_context in usage_contexts:
-                        matched_attributes.append("usage_context")
-                        break
+        # Check if any product lists the usage context
+        if usage_context and index.bitmap("usage_context", usage_context) & selected:
+            matched_attributes.append("usage_context")
         
         # Check if mentioned attributes exist
         for attr in mentioned_attributes:
-            for product_id, attrs in products_attributes.items():
-                if attr in attrs:
-                    matched_attributes.append(attr)
-                    break
+            if index.has_attribute(attr) & selected:
+                matched_attributes.append(attr)
         
         passed = len(matched_attributes) > 0 or (not usage_context and not mentioned_attributes)
         
@@ -1,15 +1,12 @@
 """Visualization readiness check."""
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
-from src.data.product_service import ProductService
+from src.data.readiness import ASSET_TYPE, load_readiness, vocabulary_bits, mask_of, names_in
 
 
 class VisualizationReadyCheck:
     """Ensures all required visual assets exist."""
     
-    def __init__(self):
-        self.product_service = ProductService()
-    
     def check(
         self,
         db: Session,
@@ -19,6 +16,9 @@ class VisualizationReadyCheck:
         """
         Check if products have required visual assets.
         
+        Reads each product's precomputed asset-type bitmask; the products are
+        ready when the AND of their masks covers the required mask.
+        
         Args:
             db: Database session
             product_ids: List of product IDs to check
@@ -35,17 +35,24 @@ class VisualizationReadyCheck:
             }
         
         required_asset_types = required_asset_types or ["main_image"]
-        missing_assets = {}
-        all_ready = True
+        bits = vocabulary_bits(db, ASSET_TYPE, required_asset_types)
+        required_mask = mask_of(required_asset_types, bits)
+        readiness = load_readiness(db, product_ids)
         
+        common = required_mask
         for product_id in product_ids:
-            assets = self.product_service.get_visual_assets(db, product_id)
-            asset_types = {asset.asset_type for asset in assets}
-            
-            missing = [asset_type for asset_type in required_asset_types if asset_type not in asset_types]
-            if missing:
-                missing_assets[product_id] = missing
-                all_ready = False
+            common &= readiness.get(product_id, (0, 0))[0]
+        all_ready = common == required_mask and len(bits) == len(set(required_asset_types))
+        
+        # Only name what is missing when some product falls short
+        missing_assets = {}
+        if not all_ready:
+            for product_id in product_ids:
+                asset_mask = readiness.get(product_id, (0, 0))[0]
+                present = set(names_in(asset_mask, required_asset_types, bits))
+                missing = [asset_type for asset_type in required_asset_types if asset_type not in present]
+                if missing:
+                    missing_assets[product_id] = missing
         
         message = "All products have required visual assets" if all_ready else f"Missing assets: {missing_assets}"
         
@@ -54,4 +61,3 @@ class VisualizationReadyCheck:
             "missing_assets": missing_assets,
             "message": message
         }
-
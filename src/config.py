@@ -17,6 +17,52 @@ class Settings(BaseSettings):
     debug: bool = True
     log_level: str = "INFO"
     
+    # Fuzzy product lookup index (built by scripts/build_fuzzy_index.py)
+    fuzzy_index_path: str = "./fuzzy_index.npz"
+    
+    # Image derivatives (built by scripts/build_image_derivatives.py)
+    asset_root: str = "./assets"
+    derivative_cache_dir: str = "./derivatives"
+    derivative_url_prefix: str = "/derivatives"
+    
+    # Threads for blocking stages of the intent pipelines
+    pipeline_workers: int = 8
+    
+    # Intent detection: spaCy model, and worker processes parsing queries in
+    # batches (0 detects in the request's process)
+    spacy_model: str = "en_core_web_sm"
+    nlp_processes: int = 0
+    nlp_batch_size: int = 32
+    nlp_batch_wait_ms: float = 2.0
+    
+    # Intent scoring engine: "pattern" (keyword scoring, over spaCy lemmas
+    # when a model is installed) or "linear" (hashed n-gram classifier
+    # trained by scripts/train_intent_classifier.py)
+    intent_engine: str = "pattern"
+    intent_model_path: str = "./intent_model.npz"
+    
+    # Memoized intent detections (LRU entries per process, 0 disables)
+    intent_cache_size: int = 4096
+    
+    # Conversation sessions (IntentRequest.session_id); 0 sessions disables
+    session_ttl_seconds: int = 1800
+    session_max_count: int = 10000
+    session_max_bytes: int = 256 * 1024
+    session_max_total_bytes: int = 64 * 1024 * 1024
+    session_history_turns: int = 5
+    
+    # Serialized product payloads kept for the product endpoints (0 disables)
+    product_fragment_cache_size: int = 10000
+    
+    # HTTP caching of the product endpoints: Cache-Control max-age (0 makes
+    # clients and CDNs revalidate every time, answered with 304 while the
+    # catalog is unchanged), gzip for bodies of at least CATALOG_GZIP_MIN_SIZE
+    # bytes (negative disables), and compressed bodies kept per URL
+    catalog_cache_max_age: int = 0
+    catalog_gzip_min_size: int = 1024
+    catalog_gzip_level: int = 6
+    catalog_response_cache_size: int = 64
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,162 @@
+"""In-memory typed snapshot of the product catalog used to build search indexes."""
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+from functools import cached_property
+from src.models.product import Product, ProductAttribute
+from src.data.numeric_index import NumericAttributeIndex
+from src.data.inverted_index import InvertedAttributeIndex
+import json
+import threading
+
+
+def parse_attribute_value(attribute_type: str, attribute_value: str) -> Any:
+    """Parse a stored attribute value based on its type."""
+    if attribute_type == "number":
+        try:
+            return float(attribute_value)
+        except ValueError:
+            return attribute_value
+    elif attribute_type == "boolean":
+        return attribute_value.lower() == "true"
+    elif attribute_type == "array":
+        try:
+            return json.loads(attribute_value)
+        except json.JSONDecodeError:
+            return [attribute_value]
+    return attribute_value
+
+
+class CatalogSnapshot:
+    """
+    Typed, read-only view of every product and attribute.
+    
+    Products are addressed by their position in the snapshot; indexes built
+    from the snapshot return positions that map back through ``product_ids``.
+    """
+    
+    def __init__(
+        self,
+        product_ids: List[str],
+        names: List[str],
+        categories: List[Optional[str]],
+        attributes: List[Dict[str, Any]]
+    ):
+        self.product_ids = product_ids
+        self.names = names
+        self.categories = categories
+        self.attributes = attributes
+        self.position = {product_id: i for i, product_id in enumerate(product_ids)}
+        self._derived: Dict[Any, Any] = {}
+    
+    @classmethod
+    def from_db(cls, db: Session) -> "CatalogSnapshot":
+        """Load the snapshot with one query for products and one for attributes."""
+        rows = db.query(Product.id, Product.product_id, Product.name, Product.category).order_by(Product.id).all()
+        row_position = {row.id: i for i, row in enumerate(rows)}
+        attributes: List[Dict[str, Any]] = [{} for _ in rows]
+        
+        attribute_rows = db.query(
+            ProductAttribute.product_id,
+            ProductAttribute.attribute_name,
+            ProductAttribute.attribute_type,
+            ProductAttribute.attribute_value
+        ).all()
+        for product_pk, name, attribute_type, value in attribute_rows:
+            position = row_position.get(product_pk)
+            if position is not None:
+                attributes[position][name] = parse_attribute_value(attribute_type, value)
+        
+        return cls(
+            product_ids=[row.product_id for row in rows],
+            names=[row.name for row in rows],
+            categories=[row.category for row in rows],
+            attributes=attributes
+        )
+    
+    def __len__(self) -> int:
+        return len(self.product_ids)
+    
+    @cached_property
+    def numeric_index(self) -> NumericAttributeIndex:
+        """Sorted per-attribute index over numeric values."""
+        return NumericAttributeIndex.from_snapshot(self)
+    
+    @cached_property
+    def inverted_index(self) -> InvertedAttributeIndex:
+        """(attribute, value) -> product bitmap index over categorical values."""
+        return InvertedAttributeIndex.from_snapshot(self)
+    
+    def cached(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """Memoize a derived structure for the lifetime of this snapshot."""
+        if key not in self._derived:
+            self._derived[key] = factory()
+        return self._derived[key]
+    
+    def bitmap_for(self, product_ids: List[str]) -> int:
+        """Bitmap of the given product IDs; unknown IDs are ignored."""
+        return self.inverted_index.from_positions(
+            self.position[product_id] for product_id in product_ids if product_id in self.position
+        )
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+# Bumped by every invalidation; a load that overlaps one is not cached
+_snapshot_version = 0
+# Latest catalog change log entry (catalog_changes.seq) applied to this
+# process's caches; the change log is shared by every process writing the
+# catalog, so generations agree across server workers and import scripts
+_generation = 0
+# Change log seq of each product's latest change (absent: never logged)
+_product_generations: Dict[str, int] = {}
+# Guards the snapshot, its version and the generations
+_state_lock = threading.Lock()
+# Pipeline stages ask for the snapshot from several threads; load it only once
+_load_lock = threading.Lock()
+
+
+def get_catalog_snapshot(db: Session) -> CatalogSnapshot:
+    """
+    Return the cached catalog snapshot, loading it on first use.
+    
+    A snapshot whose load overlapped an invalidation may predate the write,
+    so it is returned to the caller but not cached.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is None:
+        with _load_lock:
+            with _state_lock:
+                snapshot, version = _snapshot, _snapshot_version
+            if snapshot is None:
+                snapshot = CatalogSnapshot.from_db(db)
+                with _state_lock:
+                    if _snapshot_version == version:
+                        _snapshot = snapshot
+    return snapshot
+
+
+def catalog_generation() -> int:
+    """Change log seq of the latest catalog change this process has applied (see change_log.observe_changes)."""
+    return _generation
+
+
+def product_generation(product_id: str) -> int:
+    """Change log seq of a product's latest change (0 if it was never logged)."""
+    return _product_generations.get(product_id, 0)
+
+
+def invalidate_catalog_snapshot(changes: Iterable[Tuple[int, str]] = ()) -> None:
+    """
+    Drop the cached snapshot (and its indexes) after a catalog write.
+    
+    Args:
+        changes: (seq, product_id) change log entries of the write; they
+            advance the catalog and product generations
+    """
+    global _snapshot, _snapshot_version, _generation
+    with _state_lock:
+        _snapshot = None
+        _snapshot_version += 1
+        for seq, product_id in changes:
+            _product_generations[product_id] = max(seq, _product_generations.get(product_id, 0))
+            _generation = max(seq, _generation)
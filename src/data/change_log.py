@@ -0,0 +1,102 @@
+"""Catalog change log read by delta sync clients (GET /products/changes)."""
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Iterable, NamedTuple
+from src.models.product import Product, CatalogChange
+from src.data.catalog_snapshot import catalog_generation, invalidate_catalog_snapshot
+import threading
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Product IDs per statement (SQLite caps bound parameters)
+_CHUNK = 500
+
+# Whether this process has read the change log yet
+_observed = False
+_observed_lock = threading.Lock()
+
+
+class ChangeEntry(NamedTuple):
+    """One change log entry; ``seq`` is the catalog generation it created (``catalog_generation()``)."""
+    seq: int
+    product_id: str
+    change: str
+
+
+def record_changes(db: Session, product_ids: Iterable[str], change: str) -> None:
+    """
+    Log changes to products within the caller's transaction.
+    
+    The log is compacted as it is written: a product's earlier entries are
+    superseded by the new one and deleted, so the log holds one entry per
+    product ID ever written and a replica only downloads a product's latest
+    state, however often it changed. Deleted products keep a tombstone.
+    
+    Args:
+        db: Database session
+        product_ids: Public IDs of the changed products
+        change: UPSERT or DELETE
+    """
+    product_ids = list(dict.fromkeys(product_ids))
+    for start in range(0, len(product_ids), _CHUNK):
+        chunk = product_ids[start:start + _CHUNK]
+        db.query(CatalogChange).filter(CatalogChange.product_id.in_(chunk)).delete(synchronize_session=False)
+    db.bulk_insert_mappings(CatalogChange, [{"product_id": product_id, "change": change} for product_id in product_ids])
+
+
+def current_generation(db: Session) -> int:
+    """Sequence number of the latest logged change (0 if the log is empty)."""
+    return db.query(func.max(CatalogChange.seq)).scalar() or 0
+
+
+def changes_since(db: Session, since: int, limit: int) -> List[ChangeEntry]:
+    """The first ``limit`` entries logged after generation ``since``, oldest first."""
+    rows = db.query(
+        CatalogChange.seq,
+        CatalogChange.product_id,
+        CatalogChange.change
+    ).filter(CatalogChange.seq > since).order_by(CatalogChange.seq).limit(limit).all()
+    return [ChangeEntry(*row) for row in rows]
+
+
+def observe_changes(db: Session) -> None:
+    """
+    Apply the catalog changes logged since this process last looked to its caches.
+    
+    Every catalog writer (any server worker, the import scripts) logs its
+    changes, so this is how a process learns about writes it did not make
+    and advances its catalog generation. The first call reads the whole log;
+    later calls read the entries after the current generation, a primary
+    key range query that usually returns nothing.
+    """
+    global _observed
+    with _observed_lock:
+        query = db.query(CatalogChange.seq, CatalogChange.product_id)
+        if _observed:
+            query = query.filter(CatalogChange.seq > catalog_generation())
+        rows = query.all()
+        _observed = True
+        if rows:
+            invalidate_catalog_snapshot(rows)
+
+
+def backfill_change_log(db: Session) -> int:
+    """
+    Log every product as an upsert when the log is empty, and commit.
+    
+    Covers databases created before the change log existed. Also applies
+    the log to this process's catalog generations.
+    
+    Returns:
+        Number of products logged
+    """
+    logged = 0
+    if db.query(CatalogChange.seq).first() is None:
+        product_ids = [product_id for (product_id,) in db.query(Product.product_id).order_by(Product.id).all()]
+        if product_ids:
+            record_changes(db, product_ids, UPSERT)
+            db.commit()
+            logged = len(product_ids)
+    observe_changes(db)
+    return logged
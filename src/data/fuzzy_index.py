@@ -0,0 +1,418 @@
+"""Typo-tolerant product lookup backed by a character-trigram index."""
+from sqlalchemy.orm import Session
+from typing import Callable, List, Dict, Tuple, Iterable, Optional
+from src.models.product import Product, ProductAttribute
+from src.config import settings
+import numpy as np
+import os
+import re
+import threading
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Similarity credited to a vocabulary token per edit needed to reach it
+_EDIT_SIMILARITY = {0: 1.0, 1: 0.8, 2: 0.6}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into alphanumeric tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(token: str) -> List[str]:
+    """Return the padded character trigrams of a token."""
+    padded = f"${token}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def max_edits(token: str) -> int:
+    """Edit distance allowed for a query token of this length."""
+    if len(token) <= 3:
+        return 0
+    if len(token) <= 6:
+        return 1
+    return 2
+
+
+def bounded_edit_distance(a: str, b: str, bound: int) -> int:
+    """
+    Levenshtein distance between two strings, giving up past a bound.
+    
+    Returns:
+        The distance, or bound + 1 if it exceeds the bound
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > bound:
+            return bound + 1
+        previous = current
+    return previous[-1] if previous[-1] <= bound else bound + 1
+
+
+class FuzzyProductIndex:
+    """
+    Fuzzy index over product names and models.
+    
+    Query tokens are matched against the vocabulary of indexed tokens through
+    trigram postings and a bounded edit-distance re-rank. Products sharing the
+    same token set (e.g. size variants of one name) are collapsed into a single
+    document, documents are scored by the IDF-weighted similarity of the tokens
+    they contain, and the best documents expand back to their product IDs.
+    All postings are stored in CSR form so the index loads from a single
+    ``.npz`` file without any rebuilding.
+    """
+    
+    def __init__(
+        self,
+        product_ids: np.ndarray,
+        vocab: np.ndarray,
+        vocab_idf: np.ndarray,
+        grams: np.ndarray,
+        gram_offsets: np.ndarray,
+        gram_tokens: np.ndarray,
+        token_offsets: np.ndarray,
+        token_documents: np.ndarray,
+        document_weights: np.ndarray,
+        document_offsets: np.ndarray,
+        document_products: np.ndarray
+    ):
+        self.product_ids = product_ids
+        self.vocab = vocab
+        self.vocab_idf = vocab_idf
+        self.grams = grams
+        self.gram_offsets = gram_offsets
+        self.gram_tokens = gram_tokens
+        self.token_offsets = token_offsets
+        self.token_documents = token_documents
+        self.document_weights = document_weights
+        self.document_offsets = document_offsets
+        self.document_products = document_products
+        
+        # Plain dict lookups are faster than searchsorted for single keys
+        self._token_lookup = {token: i for i, token in enumerate(vocab.tolist())}
+        self._gram_lookup = {gram: i for i, gram in enumerate(grams.tolist())}
+        self._vocab_list = vocab.tolist()
+        self._vocab_lengths = np.fromiter((len(t) for t in self._vocab_list), dtype=np.int32, count=len(self._vocab_list))
+    
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, str]]) -> "FuzzyProductIndex":
+        """
+        Build an index from (product_id, text) pairs.
+        
+        A product may appear in several entries (e.g. its name and its model);
+        the tokens of all its entries are merged.
+        """
+        product_tokens: Dict[str, set] = {}
+        for product_id, text in entries:
+            if not text:
+                continue
+            product_tokens.setdefault(product_id, set()).update(tokenize(text))
+        
+        product_ids = list(product_tokens.keys())
+        vocab = sorted({token for tokens in product_tokens.values() for token in tokens})
+        token_index = {token: i for i, token in enumerate(vocab)}
+        
+        # Collapse products with identical token sets into one document
+        documents: Dict[frozenset, List[int]] = {}
+        for product_idx, product_id in enumerate(product_ids):
+            documents.setdefault(frozenset(product_tokens[product_id]), []).append(product_idx)
+        document_tokens = list(documents.keys())
+        document_offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+        document_offsets[1:] = np.cumsum([len(p) for p in documents.values()])
+        document_products = np.fromiter(
+            (i for products in documents.values() for i in products), dtype=np.int32, count=len(product_ids)
+        )
+        
+        # Token -> document postings
+        postings: List[List[int]] = [[] for _ in vocab]
+        for document_idx, tokens in enumerate(document_tokens):
+            for token in tokens:
+                postings[token_index[token]].append(document_idx)
+        
+        document_frequency = np.array([len(p) for p in postings], dtype=np.float64)
+        vocab_idf = np.log1p(max(len(document_tokens), 1) / np.maximum(document_frequency, 1.0)).astype(np.float32)
+        
+        token_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        token_offsets[1:] = np.cumsum([len(p) for p in postings])
+        token_documents = np.fromiter((i for p in postings for i in p), dtype=np.int32, count=int(token_offsets[-1]))
+        
+        # Per-document total IDF, used to normalize match coverage
+        document_weights = np.zeros(len(document_tokens), dtype=np.float32)
+        for token_idx, document_ids in enumerate(postings):
+            document_weights[document_ids] += vocab_idf[token_idx]
+        
+        # Trigram -> token postings
+        gram_postings: Dict[str, List[int]] = {}
+        for token_idx, token in enumerate(vocab):
+            for gram in set(trigrams(token)):
+                gram_postings.setdefault(gram, []).append(token_idx)
+        grams = sorted(gram_postings.keys())
+        gram_offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        gram_offsets[1:] = np.cumsum([len(gram_postings[g]) for g in grams])
+        gram_tokens = np.fromiter(
+            (i for g in grams for i in gram_postings[g]), dtype=np.int32, count=int(gram_offsets[-1])
+        )
+        
+        return cls(
+            product_ids=np.array(product_ids, dtype=str),
+            vocab=np.array(vocab, dtype=str),
+            vocab_idf=vocab_idf,
+            grams=np.array(grams, dtype=str),
+            gram_offsets=gram_offsets,
+            gram_tokens=gram_tokens,
+            token_offsets=token_offsets,
+            token_documents=token_documents,
+            document_weights=document_weights,
+            document_offsets=document_offsets,
+            document_products=document_products
+        )
+    
+    @classmethod
+    def build_from_db(cls, db: Session) -> "FuzzyProductIndex":
+        """Build an index over every product's name and model attribute."""
+        entries = [(product_id, name) for product_id, name in db.query(Product.product_id, Product.name).all()]
+        models = (
+            db.query(Product.product_id, ProductAttribute.attribute_value)
+            .join(ProductAttribute, ProductAttribute.product_id == Product.id)
+            .filter(ProductAttribute.attribute_name == "model")
+            .all()
+        )
+        entries.extend((product_id, model) for product_id, model in models)
+        return cls.build(entries)
+    
+    def save(self, file) -> None:
+        """Write the index to an uncompressed ``.npz`` file (a path or a binary file object)."""
+        np.savez(
+            file,
+            product_ids=self.product_ids,
+            vocab=self.vocab,
+            vocab_idf=self.vocab_idf,
+            grams=self.grams,
+            gram_offsets=self.gram_offsets,
+            gram_tokens=self.gram_tokens,
+            token_offsets=self.token_offsets,
+            token_documents=self.token_documents,
+            document_weights=self.document_weights,
+            document_offsets=self.document_offsets,
+            document_products=self.document_products
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> "FuzzyProductIndex":
+        """Load a prebuilt index written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in data.files})
+    
+    def match_token(self, token: str) -> List[Tuple[int, int]]:
+        """
+        Find vocabulary tokens within the allowed edit distance of a query token.
+        
+        Returns:
+            List of (vocab_index, edit_distance) pairs
+        """
+        exact = self._token_lookup.get(token)
+        bound = max_edits(token)
+        if bound == 0:
+            return [(exact, 0)] if exact is not None else []
+        
+        gram_ids = [self._gram_lookup[g] for g in set(trigrams(token)) if g in self._gram_lookup]
+        if not gram_ids:
+            return [(exact, 0)] if exact is not None else []
+        
+        candidates = np.concatenate([
+            self.gram_tokens[self.gram_offsets[g]:self.gram_offsets[g + 1]] for g in gram_ids
+        ])
+        overlap = np.bincount(candidates, minlength=len(self._vocab_list))
+        
+        # Each edit destroys at most three trigrams (count filter) and changes
+        # the length by at most one (length filter)
+        min_overlap = max(1, len(token) - 3 * bound)
+        mask = (overlap >= min_overlap) & (np.abs(self._vocab_lengths - len(token)) <= bound)
+        
+        matches = []
+        for vocab_idx in np.flatnonzero(mask).tolist():
+            if vocab_idx == exact:
+                matches.append((vocab_idx, 0))
+                continue
+            distance = bounded_edit_distance(token, self._vocab_list[vocab_idx], bound)
+            if distance <= bound:
+                matches.append((vocab_idx, distance))
+        return matches
+    
+    def lookup(
+        self,
+        query: str,
+        limit: int = 5,
+        min_coverage: float = 0.3,
+        relative_cutoff: float = 0.6
+    ) -> List[str]:
+        """
+        Resolve product mentions in a free-text query.
+        
+        Args:
+            query: User's natural language query
+            limit: Maximum number of product IDs to return
+            min_coverage: Minimum share of a document's token weight that must match
+            relative_cutoff: Drop documents scoring below this fraction of the best match
+        
+        Returns:
+            Matching product IDs, best first
+        """
+        if len(self.product_ids) == 0:
+            return []
+        
+        # Best similarity per matched vocabulary token
+        similarity: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            for vocab_idx, distance in self.match_token(token):
+                score = _EDIT_SIMILARITY[distance]
+                if score > similarity.get(vocab_idx, 0.0):
+                    similarity[vocab_idx] = score
+        if not similarity:
+            return []
+        
+        vocab_ids = np.fromiter(similarity.keys(), dtype=np.int64, count=len(similarity))
+        token_weights = self.vocab_idf[vocab_ids] * np.fromiter(similarity.values(), dtype=np.float32, count=len(similarity))
+        starts = self.token_offsets[vocab_ids]
+        lengths = self.token_offsets[vocab_ids + 1] - starts
+        documents = np.concatenate([self.token_documents[s:s + n] for s, n in zip(starts.tolist(), lengths.tolist())])
+        if len(documents) == 0:
+            return []
+        
+        all_scores = np.bincount(documents, weights=np.repeat(token_weights, lengths), minlength=len(self.document_weights))
+        candidates = np.flatnonzero(all_scores > 0)
+        scores = all_scores[candidates]
+        coverage = scores / np.maximum(self.document_weights[candidates], 1e-6)
+        ranking = scores * (0.5 + 0.5 * coverage)
+        
+        keep = (coverage >= min_coverage) & (ranking >= relative_cutoff * ranking.max())
+        candidates, ranking = candidates[keep], ranking[keep]
+        
+        # Expand the best documents to product IDs until the limit is reached
+        product_ids: List[str] = []
+        for document_idx in candidates[np.argsort(-ranking, kind="stable")].tolist():
+            start, end = self.document_offsets[document_idx], self.document_offsets[document_idx + 1]
+            product_ids.extend(self.product_ids[self.document_products[start:min(end, start + limit - len(product_ids))]].tolist())
+            if len(product_ids) >= limit:
+                break
+        return product_ids
+
+
+_loaded_index: Optional[FuzzyProductIndex] = None
+# (inode, mtime_ns, size) of the index file last loaded; None if there was none
+_loaded_signature: Optional[Tuple[int, int, int]] = None
+# Incremented whenever a different index is loaded (lets callers key caches on it)
+_index_generation = 0
+_index_lock = threading.Lock()
+# Rebuilds read the catalog when they start; serialize them so an older one cannot replace a newer one
+_rebuild_lock = threading.RLock()
+# Set while a coalesced refresh is waiting for the running rebuild to finish
+_refresh_pending = False
+_refresh_state_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def get_fuzzy_index() -> Optional[FuzzyProductIndex]:
+    """
+    Return the prebuilt fuzzy index, reloading it when the file changes.
+    
+    Rebuilds by any process (the build and import scripts, another server
+    worker) replace the file, so each call compares its inode, modification
+    time and size with those of the loaded index: one stat call.
+    
+    Returns None if no index file has been built yet.
+    """
+    global _loaded_index, _loaded_signature, _index_generation
+    signature = _file_signature(settings.fuzzy_index_path)
+    if signature != _loaded_signature:
+        with _index_lock:
+            if signature != _loaded_signature:
+                index = None
+                if signature is not None:
+                    try:
+                        index = FuzzyProductIndex.load(settings.fuzzy_index_path)
+                    except (OSError, ValueError, KeyError):
+                        index = _loaded_index
+                _loaded_index, _loaded_signature = index, signature
+                _index_generation += 1
+    return _loaded_index
+
+
+def fuzzy_index_generation() -> int:
+    """Changes whenever a different index file is loaded."""
+    get_fuzzy_index()
+    return _index_generation
+
+
+def rebuild_fuzzy_index(db: Session, path: Optional[str] = None) -> FuzzyProductIndex:
+    """
+    Build the index from the database and write it to the configured path.
+    
+    The file is replaced atomically, so processes loading it concurrently
+    read either the old index or the new one.
+    """
+    global _loaded_index, _loaded_signature, _index_generation
+    path = path or settings.fuzzy_index_path
+    with _rebuild_lock:
+        index = FuzzyProductIndex.build_from_db(db)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as handle:
+            index.save(handle)
+        os.replace(temporary, path)
+        if path == settings.fuzzy_index_path:
+            signature = _file_signature(path)
+            with _index_lock:
+                _loaded_index, _loaded_signature = index, signature
+                _index_generation += 1
+    return index
+
+
+def refresh_fuzzy_index(db: Session) -> Optional[FuzzyProductIndex]:
+    """
+    Rebuild the index after a catalog write, if an index has been built.
+    
+    Called by the product write paths so new products become fuzzy-matchable;
+    without an index file lookups do not use one, so there is nothing to do.
+    """
+    if not os.path.exists(settings.fuzzy_index_path):
+        return None
+    return rebuild_fuzzy_index(db)
+
+
+def refresh_fuzzy_index_coalesced(new_session: Callable[[], Session]) -> None:
+    """
+    Refresh the index after a catalog write, sharing rebuilds between writes.
+    
+    At most one refresh waits behind the running rebuild; writes arriving
+    while it waits return at once, since that refresh has not read the
+    catalog yet and will include them. A burst of writes therefore costs
+    two rebuilds rather than one per write.
+    """
+    global _refresh_pending
+    with _refresh_state_lock:
+        if _refresh_pending:
+            return
+        _refresh_pending = True
+    with _rebuild_lock:
+        with _refresh_state_lock:
+            _refresh_pending = False
+        with new_session() as db:
+            refresh_fuzzy_index(db)
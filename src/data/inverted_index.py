@@ -0,0 +1,118 @@
+"""Inverted index from categorical attribute values to product bitmaps."""
+from typing import List, Dict, Tuple, Any, Iterable
+import numpy as np
+
+
+def normalize_value(value: Any) -> str:
+    """Normalize a categorical value for index lookups."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).strip().lower()
+
+
+def bitmap_from_positions(size: int, positions: Iterable[int]) -> int:
+    """Pack snapshot positions into an integer bitmap (bit i = position i)."""
+    bits = np.zeros(size, dtype=bool)
+    bits[np.fromiter(positions, dtype=np.int64)] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+class InvertedAttributeIndex:
+    """
+    Maps (attribute_name, value) pairs to product bitmaps.
+    
+    Bitmaps are arbitrary-precision Python integers over snapshot positions,
+    so AND/OR/NOT set algebra is a single machine-level operation on packed
+    words and counting uses ``int.bit_count``. String, boolean and array
+    attributes are indexed by value; every attribute also gets a presence
+    bitmap regardless of type.
+    """
+    
+    def __init__(self, size: int, postings: Dict[Tuple[str, str], int], presence: Dict[str, int]):
+        self.size = size
+        self.postings = postings
+        self.presence = presence
+        self._byte_length = (size + 7) // 8
+    
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "InvertedAttributeIndex":
+        """Index every categorical value and attribute presence of a catalog snapshot."""
+        value_positions: Dict[Tuple[str, str], List[int]] = {}
+        presence_positions: Dict[str, List[int]] = {}
+        for position, attributes in enumerate(snapshot.attributes):
+            for name, value in attributes.items():
+                presence_positions.setdefault(name, []).append(position)
+                if isinstance(value, list):
+                    items = value
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    continue
+                else:
+                    items = [value]
+                for item in items:
+                    value_positions.setdefault((name, normalize_value(item)), []).append(position)
+        
+        size = len(snapshot)
+        return cls(
+            size,
+            {key: bitmap_from_positions(size, positions) for key, positions in value_positions.items()},
+            {name: bitmap_from_positions(size, positions) for name, positions in presence_positions.items()}
+        )
+    
+    def bitmap(self, attribute: str, value: Any) -> int:
+        """Products whose attribute equals (or, for arrays, contains) the value."""
+        return self.postings.get((attribute, normalize_value(value)), 0)
+    
+    def any_of(self, attribute: str, values: Iterable[Any]) -> int:
+        """OR of the bitmaps for several values of one attribute."""
+        result = 0
+        for value in values:
+            result |= self.bitmap(attribute, value)
+        return result
+    
+    def match(self, filters: Dict[str, List[Any]]) -> int:
+        """
+        Evaluate a conjunction of disjunctions.
+        
+        Args:
+            filters: {attribute: [values]}; values of one attribute are OR'ed,
+                different attributes are AND'ed
+        
+        Returns:
+            Bitmap of matching products
+        """
+        result = self.all_products()
+        # Intersect the most selective attribute first to shrink the operands
+        for bitmap in sorted((self.any_of(a, v) for a, v in filters.items()), key=int.bit_count):
+            result &= bitmap
+            if not result:
+                break
+        return result
+    
+    def has_attribute(self, attribute: str) -> int:
+        """Products that have the attribute at all."""
+        return self.presence.get(attribute, 0)
+    
+    def all_products(self) -> int:
+        """Bitmap with every product set."""
+        return (1 << self.size) - 1
+    
+    def from_positions(self, positions: Iterable[int]) -> int:
+        """Bitmap for the given snapshot positions."""
+        return bitmap_from_positions(self.size, positions)
+    
+    def mask(self, bitmap: int) -> np.ndarray:
+        """Decode a bitmap into a boolean array over snapshot positions."""
+        if not bitmap:
+            return np.zeros(self.size, dtype=bool)
+        packed = np.frombuffer(bitmap.to_bytes(self._byte_length, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder="little")[:self.size].view(bool)
+    
+    def positions(self, bitmap: int) -> np.ndarray:
+        """Decode a bitmap into sorted snapshot positions."""
+        if not bitmap:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.mask(bitmap))
+    
+    def values(self, attribute: str) -> List[str]:
+        """Distinct indexed values of an attribute."""
+        return sorted(value for name, value in self.postings if name == attribute)
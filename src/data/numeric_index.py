@@ -0,0 +1,165 @@
+"""Sorted numeric attribute index for range filters and top-k queries."""
+from typing import List, Dict, Tuple, Optional, NamedTuple
+import numpy as np
+import re
+
+
+_PREDICATE_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=|==|=|<|>)\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+class RangePredicate(NamedTuple):
+    """A numeric range condition on one attribute."""
+    attribute: str
+    low: Optional[float] = None
+    high: Optional[float] = None
+    include_low: bool = True
+    include_high: bool = True
+
+
+def parse_predicate(expression: str) -> RangePredicate:
+    """
+    Parse a predicate such as ``price<=300`` or ``battery_life>=20``.
+    
+    Raises:
+        ValueError: If the expression is not a supported comparison
+    """
+    match = _PREDICATE_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Invalid predicate '{expression}', expected e.g. 'price<=300'")
+    attribute, operator, raw_value = match.groups()
+    value = float(raw_value)
+    if operator in ("=", "=="):
+        return RangePredicate(attribute, low=value, high=value)
+    if operator == "<":
+        return RangePredicate(attribute, high=value, include_high=False)
+    if operator == "<=":
+        return RangePredicate(attribute, high=value)
+    if operator == ">":
+        return RangePredicate(attribute, low=value, include_low=False)
+    return RangePredicate(attribute, low=value)
+
+
+class NumericAttributeIndex:
+    """
+    Per-attribute sorted arrays of numeric values.
+    
+    For every attribute the index keeps the values in ascending order next to
+    the snapshot positions of the products holding them, so a range filter is
+    two binary searches and a slice, and top-k is a slice from either end.
+    """
+    
+    def __init__(self, size: int, columns: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        self.size = size
+        self.columns = columns
+    
+    @classmethod
+    def build(
+        cls,
+        size: int,
+        positions: np.ndarray,
+        attribute_names: List[str],
+        values: np.ndarray
+    ) -> "NumericAttributeIndex":
+        """
+        Build the index from parallel arrays of attribute rows.
+        
+        Args:
+            size: Number of products in the snapshot
+            positions: Product position of each row
+            attribute_names: Attribute name of each row
+            values: Numeric value of each row
+        """
+        rows_by_attribute: Dict[str, List[int]] = {}
+        for row, name in enumerate(attribute_names):
+            rows_by_attribute.setdefault(name, []).append(row)
+        
+        columns = {}
+        for name, rows in rows_by_attribute.items():
+            rows = np.asarray(rows, dtype=np.int64)
+            order = np.argsort(values[rows], kind="stable")
+            columns[name] = (
+                values[rows][order].astype(np.float64),
+                positions[rows][order].astype(np.int32)
+            )
+        return cls(size, columns)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "NumericAttributeIndex":
+        """Index every numeric (non-boolean) attribute value of a catalog snapshot."""
+        positions, names, values = [], [], []
+        for position, attributes in enumerate(snapshot.attributes):
+            for name, value in attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    positions.append(position)
+                    names.append(name)
+                    values.append(value)
+        return cls.build(
+            len(snapshot),
+            np.asarray(positions, dtype=np.int32),
+            names,
+            np.asarray(values, dtype=np.float64)
+        )
+    
+    def attributes(self) -> List[str]:
+        """Names of the indexed attributes."""
+        return sorted(self.columns.keys())
+    
+    def range(self, predicate: RangePredicate) -> np.ndarray:
+        """Return positions of products whose value satisfies the predicate."""
+        column = self.columns.get(predicate.attribute)
+        if column is None:
+            return np.empty(0, dtype=np.int32)
+        values, positions = column
+        start = 0
+        end = len(values)
+        if predicate.low is not None:
+            start = np.searchsorted(values, predicate.low, side="left" if predicate.include_low else "right")
+        if predicate.high is not None:
+            end = np.searchsorted(values, predicate.high, side="right" if predicate.include_high else "left")
+        return positions[start:max(start, end)]
+    
+    def filter(
+        self,
+        predicates: List[RangePredicate],
+        candidates: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Intersect several range predicates.
+        
+        Args:
+            predicates: Conditions that must all hold
+            candidates: Optional boolean mask of products to restrict to
+        
+        Returns:
+            Boolean mask over snapshot positions
+        """
+        mask = np.ones(self.size, dtype=bool) if candidates is None else candidates.copy()
+        # Narrowest predicates first so later ones touch fewer survivors
+        ranges = sorted((self.range(p) for p in predicates), key=len)
+        for positions in ranges:
+            hit = np.zeros(self.size, dtype=bool)
+            hit[positions] = True
+            mask &= hit
+            if not mask.any():
+                break
+        return mask
+    
+    def top_k(
+        self,
+        attribute: str,
+        k: int,
+        descending: bool = True,
+        candidates: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Return positions of the k products with the highest (or lowest) value.
+        
+        Products without the attribute are never returned.
+        """
+        column = self.columns.get(attribute)
+        if column is None or k <= 0:
+            return np.empty(0, dtype=np.int32)
+        positions = column[1]
+        if candidates is not None:
+            positions = positions[candidates[positions]]
+        return positions[::-1][:k] if descending else positions[:k]
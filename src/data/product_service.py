@@ -1,8 +1,14 @@
 """Product data service for managing product information."""
-from sqlalchemy.orm import Session
+from sqlalchemy import func, distinct, exists
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Dict, Any, Optional
 from src.models.product import Product, ProductAttribute, VisualAsset
 from src.schemas.product import ProductCreate, ProductFullResponse
+from src.data.catalog_snapshot import parse_attribute_value, get_catalog_snapshot
+from src.data.change_log import record_changes, observe_changes, UPSERT
+from src.data.numeric_index import RangePredicate
+from src.data.readiness import update_product_readiness
+import numpy as np
 import json
 
 
@@ -15,9 +21,132 @@ class ProductService:
         return db.query(Product).filter(Product.product_id == product_id).first()
     
     @staticmethod
-    def get_all_products(db: Session) -> List[Product]:
-        """Get all products."""
-        return db.query(Product).all()
+    def get_products_with_details(db: Session, product_ids: List[str]) -> List[Product]:
+        """
+        Get products with their attributes and visual assets loaded (three queries in all).
+        
+        Returns:
+            The products that exist, in the order of ``product_ids``
+        """
+        if not product_ids:
+            return []
+        products = db.query(Product).options(
+            selectinload(Product.attributes),
+            selectinload(Product.visual_assets)
+        ).filter(Product.product_id.in_(product_ids)).all()
+        by_id = {product.product_id: product for product in products}
+        return [by_id[product_id] for product_id in product_ids if product_id in by_id]
+    
+    @staticmethod
+    def get_product_projections(
+        db: Session,
+        product_ids: Optional[List[str]],
+        fields: List[str],
+        attribute_names: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Product payloads (ProductFullResponse) restricted to some fields, read with column queries.
+        
+        Only the requested product columns are selected, attributes and
+        visual assets are only queried when requested, and ``attribute_names``
+        is applied in SQL, so unrequested data is never loaded.
+        
+        Args:
+            db: Database session
+            product_ids: Products to read, or None for all products
+            fields: ProductFullResponse fields to include (``product_id`` always is)
+            attribute_names: Optional projection of the attributes field
+        
+        Returns:
+            Payload dicts of the products that exist, in the order of
+            ``product_ids`` (creation order for all products)
+        """
+        if product_ids is not None and not product_ids:
+            return []
+        scalar_fields = [
+            field for field in ("id", "product_id", "name", "category")
+            if field == "product_id" or field in fields
+        ]
+        query = db.query(Product.id.label("pk"), *(getattr(Product, field) for field in scalar_fields))
+        if product_ids is not None:
+            query = query.filter(Product.product_id.in_(product_ids))
+        rows = query.order_by(Product.id).all()
+        if product_ids is not None:
+            position = {product_id: i for i, product_id in enumerate(product_ids)}
+            rows.sort(key=lambda row: position[row.product_id])
+        payloads = {row.pk: {field: getattr(row, field) for field in scalar_fields} for row in rows}
+        # Reading all products needs no key filter on their attributes and assets
+        pks = list(payloads) if product_ids is not None else None
+        
+        if "attributes" in fields:
+            for payload in payloads.values():
+                payload["attributes"] = []
+            if attribute_names is None or attribute_names:
+                query = db.query(
+                    ProductAttribute.product_id,
+                    ProductAttribute.attribute_name,
+                    ProductAttribute.attribute_type,
+                    ProductAttribute.attribute_value,
+                    ProductAttribute.unit,
+                    ProductAttribute.display_name
+                )
+                if pks is not None:
+                    query = query.filter(ProductAttribute.product_id.in_(pks))
+                if attribute_names is not None:
+                    query = query.filter(ProductAttribute.attribute_name.in_(attribute_names))
+                for pk, name, attribute_type, value, unit, display_name in query.order_by(ProductAttribute.id):
+                    payload = payloads.get(pk)
+                    if payload is not None:
+                        payload["attributes"].append({
+                            "attribute_name": name,
+                            "attribute_type": attribute_type,
+                            "attribute_value": value,
+                            "unit": unit,
+                            "display_name": display_name
+                        })
+        
+        if "visual_assets" in fields:
+            for payload in payloads.values():
+                payload["visual_assets"] = []
+            query = db.query(VisualAsset.product_id, VisualAsset.asset_type, VisualAsset.asset_url, VisualAsset.asset_metadata)
+            if pks is not None:
+                query = query.filter(VisualAsset.product_id.in_(pks))
+            for pk, asset_type, url, metadata in query.order_by(VisualAsset.id):
+                payload = payloads.get(pk)
+                if payload is not None:
+                    payload["visual_assets"].append({"asset_type": asset_type, "asset_url": url, "asset_metadata": metadata})
+        
+        return list(payloads.values())
+    
+    @staticmethod
+    def list_product_ids(db: Session) -> List[str]:
+        """IDs of all products, in creation order."""
+        return [product_id for (product_id,) in db.query(Product.product_id).order_by(Product.id)]
+    
+    @staticmethod
+    def get_all_products(db: Session, filters: Optional[Dict[str, List[str]]] = None) -> List[Product]:
+        """
+        Get all products, optionally filtered by categorical attribute values.
+        
+        Args:
+            db: Database session
+            filters: {attribute: [values]}; values of one attribute are OR'ed,
+                different attributes are AND'ed
+        """
+        if not filters:
+            return db.query(Product).all()
+        
+        product_ids = ProductService.filter_product_ids(db, filters)
+        if not product_ids:
+            return []
+        return db.query(Product).filter(Product.product_id.in_(product_ids)).order_by(Product.id).all()
+    
+    @staticmethod
+    def filter_product_ids(db: Session, filters: Dict[str, List[str]]) -> List[str]:
+        """Resolve attribute value filters to product IDs through the inverted index."""
+        snapshot = get_catalog_snapshot(db)
+        index = snapshot.inverted_index
+        return [snapshot.product_ids[position] for position in index.positions(index.match(filters)).tolist()]
     
     @staticmethod
     def get_product_attributes(db: Session, product_id: str) -> Dict[str, Any]:
@@ -29,31 +158,80 @@ class ProductService:
         attributes = {}
         for attr in product.attributes:
             # Parse attribute value based on type
-            if attr.attribute_type == "number":
-                try:
-                    attributes[attr.attribute_name] = float(attr.attribute_value)
-                except ValueError:
-                    attributes[attr.attribute_name] = attr.attribute_value
-            elif attr.attribute_type == "boolean":
-                attributes[attr.attribute_name] = attr.attribute_value.lower() == "true"
-            elif attr.attribute_type == "array":
-                try:
-                    attributes[attr.attribute_name] = json.loads(attr.attribute_value)
-                except json.JSONDecodeError:
-                    attributes[attr.attribute_name] = [attr.attribute_value]
-            else:
-                attributes[attr.attribute_name] = attr.attribute_value
+            attributes[attr.attribute_name] = parse_attribute_value(attr.attribute_type, attr.attribute_value)
         
         return attributes
     
     @staticmethod
-    def get_products_attributes(db: Session, product_ids: List[str]) -> Dict[str, Dict[str, Any]]:
-        """Get attributes for multiple products."""
-        result = {}
-        for product_id in product_ids:
-            result[product_id] = ProductService.get_product_attributes(db, product_id)
+    def get_products_attributes(
+        db: Session,
+        product_ids: List[str],
+        attribute_names: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get attributes for multiple products with one query.
+        
+        Args:
+            db: Database session
+            product_ids: Products to load
+            attribute_names: Optional projection; only these attributes are
+                fetched and parsed
+        
+        Returns:
+            Dict mapping each product_id to its attributes (empty for unknown products)
+        """
+        result = {product_id: {} for product_id in product_ids}
+        if not product_ids or attribute_names is not None and not attribute_names:
+            return result
+        
+        rows = ProductService._attribute_rows_query(db, product_ids, attribute_names)
+        for product_id, name, attribute_type, value in rows:
+            result[product_id][name] = parse_attribute_value(attribute_type, value)
         return result
     
+    @staticmethod
+    def _attribute_rows_query(db: Session, product_ids: List[str], attribute_names: Optional[List[str]] = None):
+        """(product_id, attribute_name, attribute_type, attribute_value) rows, projected to attribute_names."""
+        query = db.query(
+            Product.product_id,
+            ProductAttribute.attribute_name,
+            ProductAttribute.attribute_type,
+            ProductAttribute.attribute_value
+        ).join(ProductAttribute, ProductAttribute.product_id == Product.id).filter(
+            Product.product_id.in_(product_ids)
+        )
+        if attribute_names is not None:
+            query = query.filter(ProductAttribute.attribute_name.in_(attribute_names))
+        return query.order_by(ProductAttribute.id)
+    
+    @staticmethod
+    def attribute_coverage(db: Session, product_ids: List[str], attribute_names: List[str]) -> Dict[str, int]:
+        """
+        Count how many of the given products have each attribute.
+        
+        Aggregates in the database with one GROUP BY over the
+        (product_id, attribute_name) index instead of loading attribute rows.
+        
+        Args:
+            db: Database session
+            product_ids: Products to count over
+            attribute_names: Attributes to count
+        
+        Returns:
+            Dict mapping attribute name to product count; attributes no product
+            has are omitted
+        """
+        if not product_ids or not attribute_names:
+            return {}
+        rows = db.query(
+            ProductAttribute.attribute_name,
+            func.count(distinct(ProductAttribute.product_id))
+        ).join(Product, Product.id == ProductAttribute.product_id).filter(
+            Product.product_id.in_(product_ids),
+            ProductAttribute.attribute_name.in_(attribute_names)
+        ).group_by(ProductAttribute.attribute_name).all()
+        return {name: count for name, count in rows}
+    
     @staticmethod
     def create_product(db: Session, product_data: ProductCreate) -> Product:
         """Create a new product with attributes and visual assets."""
@@ -97,10 +275,76 @@ class ProductService:
                 )
                 db.add(asset)
         
+        # Readiness masks commit together with the product
+        update_product_readiness(
+            db,
+            product,
+            product_data.attributes.keys(),
+            product_data.visual_assets.keys()
+        )
+        # Delta sync clients learn about the product from the change log
+        record_changes(db, [product.product_id], UPSERT)
+        
         db.commit()
         db.refresh(product)
+        observe_changes(db)
         return product
     
+    @staticmethod
+    def search_products(
+        db: Session,
+        predicates: List[RangePredicate],
+        category: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Search products by numeric attribute ranges using the catalog snapshot.
+        
+        Args:
+            db: Database session
+            predicates: Range conditions that must all hold
+            category: Optional category to restrict to (case-insensitive)
+            sort_by: Optional numeric attribute to order results by
+            descending: Sort direction for sort_by
+            limit: Maximum number of results
+        
+        Returns:
+            Dict with 'total' (int) matches and 'results' (List[Dict])
+        """
+        snapshot = get_catalog_snapshot(db)
+        index = snapshot.numeric_index
+        
+        candidates = None
+        if category:
+            category_lower = category.lower()
+            candidates = np.fromiter(
+                ((c or "").lower() == category_lower for c in snapshot.categories),
+                dtype=bool,
+                count=len(snapshot)
+            )
+        mask = index.filter(predicates, candidates)
+        total = int(mask.sum())
+        
+        if sort_by:
+            positions = index.top_k(sort_by, limit, descending=descending, candidates=mask)
+        else:
+            positions = np.flatnonzero(mask)[:limit]
+        
+        shown_attributes = list(dict.fromkeys([p.attribute for p in predicates] + ([sort_by] if sort_by else [])))
+        results = []
+        for position in positions.tolist():
+            attrs = snapshot.attributes[position]
+            results.append({
+                "product_id": snapshot.product_ids[position],
+                "name": snapshot.names[position],
+                "category": snapshot.categories[position],
+                "values": {attr: attrs[attr] for attr in shown_attributes if attr in attrs}
+            })
+        
+        return {"total": total, "results": results}
+    
     @staticmethod
     def _infer_attribute_type(value: Any) -> str:
         """Infer attribute type from value."""
@@ -116,10 +360,11 @@ class ProductService:
     @staticmethod
     def attribute_exists(db: Session, product_id: str, attribute_name: str) -> bool:
         """Check if an attribute exists for a product."""
-        product = ProductService.get_product_by_id(db, product_id)
-        if not product:
-            return False
-        return any(attr.attribute_name == attribute_name for attr in product.attributes)
+        return db.query(exists().where(
+            ProductAttribute.product_id == Product.id,
+            Product.product_id == product_id,
+            ProductAttribute.attribute_name == attribute_name
+        )).scalar()
     
     @staticmethod
     def get_visual_assets(db: Session, product_id: str) -> List[VisualAsset]:
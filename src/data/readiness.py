@@ -0,0 +1,242 @@
+"""Per-product readiness bitmasks over asset types and attribute names."""
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List, Dict, Tuple, Iterable, Optional
+from src.models.product import Product, ProductAttribute, VisualAsset, ReadinessVocabulary, ProductReadiness
+import threading
+
+ASSET_TYPE = "asset_type"
+ATTRIBUTE = "attribute"
+
+# Asset types interned first so they keep the lowest, stable bits
+KNOWN_ASSET_TYPES = ["main_image", "detail_image", "spec_callout"]
+
+# Committed vocabulary per kind. The vocabulary is append-only and bits are
+# never reassigned, so a cached entry can only be missing, never wrong.
+_vocabulary_cache: Dict[str, Dict[str, int]] = {}
+
+# Serializes this process's interning; other processes are caught by the retry
+_intern_lock = threading.Lock()
+_INTERN_ATTEMPTS = 5
+
+
+def to_hex(mask: int) -> str:
+    """Serialize a bitmask for storage."""
+    return format(mask, "x")
+
+
+def from_hex(value: Optional[str]) -> int:
+    """Parse a stored bitmask."""
+    return int(value, 16) if value else 0
+
+
+def mask_of(names: Iterable[str], bits: Dict[str, int]) -> int:
+    """OR together the bits of the given names (names without a bit are ignored)."""
+    mask = 0
+    for name in names:
+        bit = bits.get(name)
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+def names_in(mask: int, names: List[str], bits: Dict[str, int]) -> List[str]:
+    """The given names whose bit is set in the mask."""
+    return [name for name in names if name in bits and mask >> bits[name] & 1]
+
+
+def _query_vocabulary(db: Session, kind: str) -> Dict[str, int]:
+    """Read the vocabulary of one kind from the database."""
+    rows = db.query(ReadinessVocabulary.name, ReadinessVocabulary.bit).filter(ReadinessVocabulary.kind == kind).all()
+    return {name: bit for name, bit in rows}
+
+
+def vocabulary_bits(db: Session, kind: str, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Look up the bits of names, reading the vocabulary from the cache.
+    
+    The cache is refreshed from the database when a name is not found.
+    """
+    names = list(names)
+    cached = _vocabulary_cache.get(kind)
+    if cached is None or any(name not in cached for name in names):
+        cached = _vocabulary_cache[kind] = _query_vocabulary(db, kind)
+    return {name: cached[name] for name in names if name in cached}
+
+
+def intern_names(db: Session, kind: str, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Assign bits to names not yet in the vocabulary.
+    
+    New entries are added to the caller's transaction; nothing is committed.
+    Each attempt runs in a savepoint: when a concurrent writer (another
+    thread's or process's transaction) committed the same bits or names
+    first, the insert fails on the vocabulary's unique constraints and is
+    retried with the vocabulary read again.
+    
+    Returns:
+        The full vocabulary of the kind, including the new names
+    """
+    names = list(dict.fromkeys(names))
+    with _intern_lock:
+        for attempt in range(_INTERN_ATTEMPTS):
+            bits = _query_vocabulary(db, kind)
+            new_names = KNOWN_ASSET_TYPES + names if kind == ASSET_TYPE and not bits else names
+            new_names = [name for name in dict.fromkeys(new_names) if name not in bits]
+            if not new_names:
+                return bits
+            
+            next_bit = max(bits.values(), default=-1) + 1
+            try:
+                with db.begin_nested():
+                    for bit, name in enumerate(new_names, next_bit):
+                        db.add(ReadinessVocabulary(kind=kind, name=name, bit=bit))
+            except IntegrityError:
+                if attempt == _INTERN_ATTEMPTS - 1:
+                    raise
+                continue
+            bits.update((name, bit) for bit, name in enumerate(new_names, next_bit))
+            return bits
+
+
+def update_product_readiness(
+    db: Session,
+    product: Product,
+    attribute_names: Iterable[str],
+    asset_types: Iterable[str]
+) -> ProductReadiness:
+    """
+    Write a product's readiness masks within the caller's transaction.
+    
+    Args:
+        db: Database session
+        product: Flushed product (its primary key must be set)
+        attribute_names: Names of the product's attributes
+        asset_types: Types of the product's visual assets
+    """
+    attribute_names = list(attribute_names)
+    asset_types = list(asset_types)
+    attribute_bits = intern_names(db, ATTRIBUTE, attribute_names)
+    asset_bits = intern_names(db, ASSET_TYPE, asset_types)
+    
+    readiness = db.get(ProductReadiness, product.id) or ProductReadiness(product_id=product.id)
+    readiness.attribute_mask = to_hex(mask_of(attribute_names, attribute_bits))
+    readiness.asset_mask = to_hex(mask_of(asset_types, asset_bits))
+    db.add(readiness)
+    return readiness
+
+
+def _names_by_product(db: Session, product_pks: Optional[List[int]]) -> Tuple[Dict[int, List[str]], Dict[int, List[str]]]:
+    """Attribute names and asset types per product primary key."""
+    attribute_query = db.query(ProductAttribute.product_id, ProductAttribute.attribute_name)
+    asset_query = db.query(VisualAsset.product_id, VisualAsset.asset_type)
+    if product_pks is not None:
+        attribute_query = attribute_query.filter(ProductAttribute.product_id.in_(product_pks))
+        asset_query = asset_query.filter(VisualAsset.product_id.in_(product_pks))
+    
+    attributes: Dict[int, List[str]] = {}
+    for product_pk, name in attribute_query.all():
+        attributes.setdefault(product_pk, []).append(name)
+    assets: Dict[int, List[str]] = {}
+    for product_pk, asset_type in asset_query.all():
+        assets.setdefault(product_pk, []).append(asset_type)
+    return attributes, assets
+
+
+def rebuild_readiness(db: Session, product_pks: Optional[List[int]] = None) -> int:
+    """
+    Recompute readiness masks from the stored attributes and assets.
+    
+    Adds to the caller's transaction; nothing is committed.
+    
+    Args:
+        db: Database session
+        product_pks: Product primary keys to recompute; all products if None
+    
+    Returns:
+        Number of products processed
+    """
+    attributes, assets = _names_by_product(db, product_pks)
+    attribute_bits = intern_names(db, ATTRIBUTE, (n for names in attributes.values() for n in names))
+    asset_bits = intern_names(db, ASSET_TYPE, (t for types in assets.values() for t in types))
+    
+    if product_pks is None:
+        db.query(ProductReadiness).delete()
+        product_pks = [pk for (pk,) in db.query(Product.id).all()]
+    else:
+        db.query(ProductReadiness).filter(ProductReadiness.product_id.in_(product_pks)).delete(synchronize_session=False)
+    
+    for product_pk in product_pks:
+        db.add(ProductReadiness(
+            product_id=product_pk,
+            attribute_mask=to_hex(mask_of(attributes.get(product_pk, []), attribute_bits)),
+            asset_mask=to_hex(mask_of(assets.get(product_pk, []), asset_bits))
+        ))
+    return len(product_pks)
+
+
+def backfill_readiness(db: Session) -> int:
+    """
+    Compute and commit masks for products that have none yet.
+    
+    Covers products created before readiness tracking existed.
+    
+    Returns:
+        Number of products backfilled
+    """
+    missing = [
+        pk for (pk,) in db.query(Product.id).outerjoin(
+            ProductReadiness, ProductReadiness.product_id == Product.id
+        ).filter(ProductReadiness.product_id.is_(None)).all()
+    ]
+    if missing:
+        rebuild_readiness(db, missing)
+        db.commit()
+    return len(missing)
+
+
+def load_readiness(db: Session, product_ids: List[str], compute_missing: bool = True) -> Dict[str, Tuple[int, int]]:
+    """
+    Read the readiness masks of products with one query.
+    
+    Products without a stored row (written after the startup backfill by
+    something other than ProductService) get masks computed from their
+    attributes and assets, without persisting them. Unknown product IDs are
+    omitted.
+    
+    Args:
+        db: Database session
+        product_ids: Products to read
+        compute_missing: Compute masks for products without a stored row;
+            if False those products are omitted
+    
+    Returns:
+        Dict mapping product_id to (asset_mask, attribute_mask)
+    """
+    rows = db.query(
+        Product.id,
+        Product.product_id,
+        ProductReadiness.asset_mask,
+        ProductReadiness.attribute_mask
+    ).outerjoin(ProductReadiness, ProductReadiness.product_id == Product.id).filter(
+        Product.product_id.in_(product_ids)
+    ).all()
+    
+    readiness = {}
+    unindexed = {}
+    for product_pk, product_id, asset_mask, attribute_mask in rows:
+        if asset_mask is None:
+            unindexed[product_pk] = product_id
+        else:
+            readiness[product_id] = (from_hex(asset_mask), from_hex(attribute_mask))
+    
+    if unindexed and compute_missing:
+        attributes, assets = _names_by_product(db, list(unindexed))
+        attribute_bits = vocabulary_bits(db, ATTRIBUTE, (n for names in attributes.values() for n in names))
+        asset_bits = vocabulary_bits(db, ASSET_TYPE, (t for types in assets.values() for t in types))
+        for product_pk, product_id in unindexed.items():
+            readiness[product_id] = (
+                mask_of(assets.get(product_pk, []), asset_bits),
+                mask_of(attributes.get(product_pk, []), attribute_bits)
+            )
+    return readiness
@@ -1,7 +1,9 @@
 """Database connection and session management."""
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from contextlib import contextmanager
+from typing import Iterator
 from src.config import settings
 
 # Create database engine
@@ -25,3 +27,17 @@ def get_db():
     finally:
         db.close()
 
+
+@contextmanager
+def read_session(db: Session) -> Iterator[Session]:
+    """
+    A short-lived session on the same engine as ``db``.
+    
+    For read-only pipeline stages, so they can query concurrently instead of
+    taking turns on the request's session.
+    """
+    session = Session(bind=db.get_bind())
+    try:
+        yield session
+    finally:
+        session.close()
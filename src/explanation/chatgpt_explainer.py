@@ -1,6 +1,6 @@
 """Main ChatGPT explanation generator."""
-from typing import Dict, Any, List
-from src.api.chatgpt_client import ChatGPTClient
+from typing import Dict, Any, List, Iterator
+from src.api.chatgpt_client import ChatGPTClient, ExplanationError
 from src.explanation.prompt_templates import generate_explanation_prompt
 from src.schemas.explanation import ExplanationRequest, ExplanationResponse
 
@@ -21,21 +21,38 @@ class ChatGPTExplainer:
         Returns:
             ExplanationResponse with generated explanation
         """
+        # Generate explanation
+        explanation = self.client.generate_explanation(self._prompt(request))
+        return self.build_response(request, explanation)
+    
+    def stream_explanation(self, request: ExplanationRequest) -> Iterator[str]:
+        """
+        Generate explanation for visualization, yielding text as it is generated.
+        
+        Pass the joined fragments to ``build_response`` for the validated
+        response, as an ExplanationError if any fragment was one.
+        """
+        return self.client.stream_explanation(self._prompt(request))
+    
+    def _prompt(self, request: ExplanationRequest) -> str:
+        """Explanation prompt for a request."""
         # Format selected attributes for prompt
         # Assuming selected_attributes is a dict of {product_id: {attr: value}}
         formatted_attributes = request.selected_attributes
         
-        # Generate prompt
-        prompt = generate_explanation_prompt(
+        return generate_explanation_prompt(
             selected_attributes=formatted_attributes,
             visual_effects_applied=request.visual_effects_applied,
             user_intent=request.user_intent,
             products=request.products,
-            user_query=request.user_query
+            user_query=request.user_query,
+            conversation=request.conversation
         )
-        
-        # Generate explanation
-        explanation = self.client.generate_explanation(prompt)
+    
+    def build_response(self, request: ExplanationRequest, explanation: str) -> ExplanationResponse:
+        """Validate a generated explanation against the request's data."""
+        if isinstance(explanation, ExplanationError):
+            return ExplanationResponse(explanation=explanation, source_data_verified=False)
         
         # Validate response
         source_data = {
@@ -0,0 +1,164 @@
+"""Complete flow: intent → visualization → explanation, as one stage pipeline."""
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
+from src.intents.intent_handler import IntentHandler
+from src.intents.session_store import ConversationSession
+from src.api.chatgpt_client import ExplanationError
+from src.explanation.chatgpt_explainer import ChatGPTExplainer
+from src.schemas.explanation import ExplanationRequest, ExplanationResponse
+from src.pipeline import Stage, Pipeline, PipelineRun, get_stage_executor
+import asyncio
+
+
+def unavailable_explanation() -> ExplanationResponse:
+    """Explanation response when no products or attributes were selected."""
+    return ExplanationResponse(
+        explanation="Unable to generate explanation: no products or attributes selected.",
+        source_data_verified=False
+    )
+
+
+class FullExplanationFlow:
+    """
+    Runs the intent pipeline, then the visual effects and the explanation.
+    
+    The explanation only needs the attribute selection, so the rest of the
+    visualization data and the visual effects are computed while the
+    explanation request is in flight. With a conversation session, the
+    prompt includes the earlier turns and the new turn is recorded.
+    """
+    
+    def __init__(self, explainer: Optional[ChatGPTExplainer] = None):
+        self.intent_handler = IntentHandler()
+        self.explainer = explainer or ChatGPTExplainer()
+    
+    def stages(self, explicit_products: bool) -> List[Stage]:
+        """Intent stages plus the effects and explanation stages."""
+        return self.intent_handler.intent_stages(explicit_products) + [
+            self.intent_handler.effects_stage(),
+            Stage("explanation", self._explanation_stage, ("detect", "products", "attributes", "selection"))
+        ]
+    
+    async def run(
+        self,
+        db: Session,
+        user_query: str,
+        product_ids: List[str] = None,
+        pareto_attributes: Optional[List[str]] = None,
+        session: Optional[ConversationSession] = None
+    ) -> PipelineRun:
+        """
+        Run the complete flow with independent stages running concurrently.
+        
+        Returns:
+            PipelineRun with 'response' (IntentResponse, VisualizationResponse),
+            'effects' (enhanced visualization data) and 'explanation'
+        """
+        inputs = self.intent_handler.intent_inputs(db, user_query, product_ids, pareto_attributes, session)
+        return await Pipeline(self.stages(bool(product_ids))).run(inputs)
+    
+    def run_sequential(
+        self,
+        db: Session,
+        user_query: str,
+        product_ids: List[str] = None,
+        pareto_attributes: Optional[List[str]] = None,
+        session: Optional[ConversationSession] = None
+    ) -> PipelineRun:
+        """Run the complete flow one stage at a time."""
+        inputs = self.intent_handler.intent_inputs(db, user_query, product_ids, pareto_attributes, session)
+        return Pipeline(self.stages(bool(product_ids))).run_sequential(inputs)
+    
+    async def stream(
+        self,
+        db: Session,
+        user_query: str,
+        product_ids: List[str] = None,
+        pareto_attributes: Optional[List[str]] = None,
+        session: Optional[ConversationSession] = None
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Run the complete flow, yielding the visualization before the explanation.
+        
+        The explanation is generated with streaming, so its text arrives in
+        fragments after the visualization is already on its way.
+        
+        Yields:
+            ('visualization', PipelineRun of the intent stages and effects),
+            then ('token', text fragment) for each fragment, then
+            ('explanation', ExplanationResponse)
+        """
+        stages = self.intent_handler.intent_stages(bool(product_ids)) + [self.intent_handler.effects_stage()]
+        inputs = self.intent_handler.intent_inputs(db, user_query, product_ids, pareto_attributes, session)
+        run = await Pipeline(stages).run(inputs)
+        yield "visualization", run
+        
+        explanation_request = self.explanation_request(run.results)
+        if explanation_request is None:
+            yield "explanation", unavailable_explanation()
+            return
+        
+        fragments = []
+        async for fragment in iterate_in_executor(self.explainer.stream_explanation(explanation_request)):
+            fragments.append(fragment)
+            yield "token", fragment
+        explanation = "".join(fragments).strip()
+        if any(isinstance(fragment, ExplanationError) for fragment in fragments):
+            explanation = ExplanationError(explanation)
+        explanation_response = self.explainer.build_response(explanation_request, explanation)
+        self._remember_turn(run.results, explanation_request, explanation_response)
+        yield "explanation", explanation_response
+    
+    def explanation_request(self, r: Dict[str, Any]) -> Optional[ExplanationRequest]:
+        """The explanation request for the selected attributes, or None if nothing was selected."""
+        product_ids = r["products"]
+        selected_attributes, visual_effects = r["selection"] or ([], [])
+        if not (product_ids and selected_attributes):
+            return None
+        
+        # Filter to selected attributes only
+        formatted_attrs = {}
+        for product_id, attrs in r["attributes"].items():
+            formatted_attrs[product_id] = {
+                attr: attrs.get(attr) for attr in selected_attributes if attr in attrs
+            }
+        
+        return ExplanationRequest(
+            user_intent=r["detect"].intent_type.value,
+            selected_attributes=formatted_attrs,
+            visual_effects_applied=[effect.value for effect in visual_effects],
+            products=product_ids,
+            user_query=r["user_query"],
+            conversation=r["session"].conversation() if r["session"] is not None else None
+        )
+    
+    def _explanation_stage(self, r: Dict[str, Any]) -> ExplanationResponse:
+        """Generate the explanation of the selected attributes."""
+        explanation_request = self.explanation_request(r)
+        if explanation_request is None:
+            return unavailable_explanation()
+        explanation_response = self.explainer.generate_explanation(explanation_request)
+        self._remember_turn(r, explanation_request, explanation_response)
+        return explanation_response
+    
+    @staticmethod
+    def _remember_turn(r: Dict[str, Any], request: ExplanationRequest, response: ExplanationResponse):
+        """
+        Record the question and its explanation in the conversation session.
+        
+        Unverified explanations, including API error messages, are not
+        recorded, since turns are resent in later prompts.
+        """
+        if r["session"] is not None and response.source_data_verified:
+            r["session"].remember_turn(r["user_query"], request.user_intent, response.explanation)
+
+
+async def iterate_in_executor(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """Iterate a blocking iterator on the stage thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    done = object()
+    while True:
+        item = await loop.run_in_executor(get_stage_executor(), next, iterator, done)
+        if item is done:
+            return
+        yield item
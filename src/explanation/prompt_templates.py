@@ -1,5 +1,8 @@
 """Prompt templates for ChatGPT explanations."""
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+# Earlier explanations are cut to this many characters in the prompt
+CONVERSATION_EXCERPT_CHARS = 400
 
 
 def generate_explanation_prompt(
@@ -7,7 +10,8 @@ def generate_explanation_prompt(
     visual_effects_applied: List[str],
     user_intent: str,
     products: List[str],
-    user_query: str = None
+    user_query: str = None,
+    conversation: Optional[List[Dict[str, str]]] = None
 ) -> str:
     """
     Generate explanation prompt for ChatGPT.
@@ -18,6 +22,7 @@ def generate_explanation_prompt(
         user_intent: Detected user intent
         products: List of product names/IDs
         user_query: Original user query
+        conversation: Earlier turns of the conversation, oldest first
     
     Returns:
         Formatted prompt string
@@ -42,10 +47,19 @@ DO:
 User Intent: {user_intent}
 Products: {', '.join(products)}
 User Query: {user_query or 'Not provided'}
-
-Selected Attributes and Values:
 """
     
+    if conversation:
+        prompt += "\nEarlier in this conversation (for context only; the data below is authoritative):\n"
+        for turn in conversation:
+            explanation = turn.get("explanation", "")
+            if len(explanation) > CONVERSATION_EXCERPT_CHARS:
+                explanation = explanation[:CONVERSATION_EXCERPT_CHARS].rstrip() + "..."
+            prompt += f"- User ({turn.get('intent', 'unknown')}): {turn.get('user_query', '')}\n"
+            prompt += f"  You: {explanation}\n"
+    
+    prompt += "\nSelected Attributes and Values:\n"
+    
     # Add attribute data
     for product, attrs in selected_attributes.items():
         prompt += f"\n{product}:\n"
@@ -1,6 +1,7 @@
 """Intent detection and handling."""
 from src.intents.intent_detector import IntentDetector
 from src.intents.intent_handler import IntentHandler
+from src.intents.batch_detector import BatchIntentDetector
 
-__all__ = ["IntentDetector", "IntentHandler"]
+__all__ = ["IntentDetector", "IntentHandler", "BatchIntentDetector"]
 
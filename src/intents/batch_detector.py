@@ -0,0 +1,117 @@
+"""Batch intent detection over streams of queries."""
+from typing import List, Dict, Any, Optional, AsyncIterator, Iterable, Union
+from pydantic import ValidationError
+from src.config import settings
+from src.intents.intent_detector import IntentDetector
+from src.intents.nlp_service import get_nlp_service
+from src.pipeline import get_stage_executor
+from src.schemas.intent import IntentBatchQuery
+import asyncio
+import json
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines as the chunks arrive."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def parse_query_line(line: bytes) -> IntentBatchQuery:
+    """
+    Parse one NDJSON line: a JSON string or an object with 'user_query'.
+    
+    Raises:
+        ValueError: If the line is not a valid query
+    """
+    value = json.loads(line)
+    if isinstance(value, str):
+        return IntentBatchQuery(user_query=value)
+    try:
+        return IntentBatchQuery.model_validate(value)
+    except ValidationError as e:
+        raise ValueError(e.errors(include_url=False)[0]["msg"])
+
+
+async def queries_from_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Union[IntentBatchQuery, Dict[str, Any]]]:
+    """
+    Parse queries from an NDJSON stream.
+    
+    Blank lines are skipped; invalid lines yield an error entry instead of a
+    query so one bad line does not fail the whole batch.
+    """
+    number = 0
+    async for line in iter_ndjson_lines(chunks):
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            yield parse_query_line(line)
+        except ValueError as e:
+            yield {"line": number, "error": str(e)}
+
+
+async def queries_from_list(queries: Iterable[Union[str, IntentBatchQuery]]) -> AsyncIterator[IntentBatchQuery]:
+    """Yield the queries of a JSON batch request."""
+    for query in queries:
+        yield IntentBatchQuery(user_query=query) if isinstance(query, str) else query
+
+
+class BatchIntentDetector:
+    """
+    Detects the intents of many queries and streams the results as NDJSON.
+    
+    Queries are detected in batches (parsed together with ``nlp.pipe`` when
+    spaCy is loaded, or in the NLP worker processes when enabled) off the
+    event loop. Nothing touches the database: product IDs missing from a
+    query are extracted from its text and the fuzzy index.
+    """
+    
+    def __init__(self, batch_size: Optional[int] = None):
+        self.batch_size = batch_size or settings.nlp_batch_size
+        self.detector = IntentDetector()
+        self.nlp_service = get_nlp_service()
+    
+    async def stream(self, queries: AsyncIterator[Union[IntentBatchQuery, Dict[str, Any]]]) -> AsyncIterator[bytes]:
+        """
+        Detect queries as they arrive.
+        
+        Args:
+            queries: Queries, or error entries passed through unchanged
+            
+        Yields:
+            One NDJSON line per query (an IntentResponse or an error), in input order
+        """
+        batch = []
+        async for query in queries:
+            batch.append(query)
+            if len(batch) >= self.batch_size:
+                yield await self._detect_lines(batch)
+                batch = []
+        if batch:
+            yield await self._detect_lines(batch)
+    
+    async def _detect_lines(self, batch: List[Union[IntentBatchQuery, Dict[str, Any]]]) -> bytes:
+        """Detect a batch and render it as NDJSON lines."""
+        pending = [(q.user_query, q.product_ids) for q in batch if isinstance(q, IntentBatchQuery)]
+        if self.nlp_service is not None:
+            responses = await asyncio.gather(*(
+                self.nlp_service.detect_intent(user_query, product_ids) for user_query, product_ids in pending
+            ))
+        else:
+            loop = asyncio.get_running_loop()
+            responses = await loop.run_in_executor(get_stage_executor(), self.detector.detect_intents, pending)
+        
+        lines = []
+        responses = iter(responses)
+        for query in batch:
+            if isinstance(query, IntentBatchQuery):
+                lines.append(next(responses).model_dump_json())
+            else:
+                lines.append(json.dumps(query, separators=(",", ":")))
+        return ("\n".join(lines) + "\n").encode()
@@ -1,13 +1,19 @@
 """CHOOSE intent handler with pre-decision checks."""
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
-from src.intents.intent_handler import IntentHandler
+from typing import Dict, Any, List, Optional
+from src.intents.intent_handler import IntentHandler, has_products
+from src.intents.session_store import ConversationSession
 from src.checks.attribute_completeness import AttributeCompletenessCheck
 from src.checks.user_context import UserContextCheck
 from src.checks.visualization_ready import VisualizationReadyCheck
 from src.checks.decision_confidence import DecisionConfidenceCheck
+from src.checks.batch_checks import BatchPreDecisionChecks
+from src.intents.choose_ranker import ChooseRanker
+from src.data.catalog_snapshot import get_catalog_snapshot
 from src.schemas.intent import IntentResponse
 from src.schemas.visualization import VisualizationResponse
+from src.pipeline import Stage, Pipeline, PipelineRun
+from src.database import read_session
 
 
 class ChooseHandler:
@@ -19,69 +25,165 @@ class ChooseHandler:
         self.context_check = UserContextCheck()
         self.visualization_check = VisualizationReadyCheck()
         self.confidence_check = DecisionConfidenceCheck()
+        self.batch_checks = BatchPreDecisionChecks()
+        self.ranker = ChooseRanker()
     
     def handle_choose_intent(
         self,
         db: Session,
         user_query: str,
-        product_ids: List[str] = None
+        product_ids: List[str] = None,
+        pareto_attributes: List[str] = None,
+        batch_checks: bool = False,
+        session: Optional[ConversationSession] = None
     ) -> tuple[IntentResponse, VisualizationResponse, Dict[str, Any]]:
         """
         Handle CHOOSE intent with pre-decision checks.
         
+        Runs the CHOOSE pipeline stages one after another; see
+        ``run_choose_pipeline`` for the concurrent variant.
+        
+        Args:
+            batch_checks: Also check every product on its own (vectorized);
+                the result then carries per-product results under 'products'
+            session: Optional conversation session to reuse and update
+        
         Returns:
             Tuple of (IntentResponse, VisualizationResponse, ChecksResult)
         """
-        # First, detect intent and get initial visualization
-        intent_response, visualization_response = self.intent_handler.process_intent(
-            db, user_query, product_ids
+        pipeline = Pipeline(self.choose_stages(bool(product_ids), batch_checks))
+        run = pipeline.run_sequential(
+            self.intent_handler.intent_inputs(db, user_query, product_ids, pareto_attributes, session)
         )
+        return run.results["choose"]
+    
+    async def run_choose_pipeline(
+        self,
+        db: Session,
+        user_query: str,
+        product_ids: List[str] = None,
+        pareto_attributes: List[str] = None,
+        batch_checks: bool = False,
+        with_effects: bool = False,
+        session: Optional[ConversationSession] = None
+    ) -> PipelineRun:
+        """
+        Handle CHOOSE intent with independent stages running concurrently.
         
-        if not visualization_response.product_ids:
-            return intent_response, visualization_response, {"checks": None, "message": "No products detected"}
+        The checks overlap with each other where they do not share the
+        database session, and with the visual effects.
         
-        # Run pre-decision checks
-        checks_result = self._run_pre_decision_checks(
-            db,
-            visualization_response.product_ids,
-            visualization_response.selected_attributes,
-            intent_response.extracted_context or {},
-            user_query
+        Returns:
+            PipelineRun whose 'choose' result is (IntentResponse, VisualizationResponse, ChecksResult)
+        """
+        stages = self.choose_stages(bool(product_ids), batch_checks)
+        if with_effects:
+            stages.append(self.intent_handler.effects_stage())
+        inputs = self.intent_handler.intent_inputs(db, user_query, product_ids, pareto_attributes, session)
+        return await Pipeline(stages).run(inputs)
+    
+    def choose_stages(self, explicit_products: bool, batch_checks: bool = False) -> List[Stage]:
+        """
+        Intent stages followed by the pre-decision checks.
+        
+        Args:
+            explicit_products: Whether product IDs were given with the request
+            batch_checks: Run the vectorized per-product checks instead
+        """
+        stages = self.intent_handler.intent_stages(explicit_products)
+        if batch_checks:
+            stages.append(Stage("checks", self._batch_checks_stage, ("selection",), when=has_products))
+        else:
+            stages += [
+                Stage("attribute_check", self._attribute_check_stage, ("selection",), when=has_products),
+                Stage("context_check", self._context_check_stage, ("detect", "products"), when=has_products),
+                Stage("visualization_check", self._visualization_check_stage, ("products",), when=has_products),
+                Stage(
+                    "checks", self._combine_checks_stage,
+                    ("attribute_check", "context_check", "visualization_check"),
+                    when=has_products, blocking=False
+                )
+            ]
+        stages.append(Stage("choose", self._choose_stage, ("response", "checks"), blocking=False))
+        return stages
+    
+    def _attribute_check_stage(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        """1. Attribute completeness check."""
+        with read_session(r["db"]) as session:
+            return self.attribute_check.check(session, r["products"], r["selection"][0])
+    
+    def _context_check_stage(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        """2. User context validation."""
+        with read_session(r["db"]) as session:
+            return self.context_check.check(session, r["products"], r["detect"].extracted_context or {})
+    
+    def _visualization_check_stage(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        """3. Visualization readiness check."""
+        with read_session(r["db"]) as session:
+            return self.visualization_check.check(session, r["products"], ["main_image"])
+    
+    def _combine_checks_stage(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        """4. Decision confidence score and overall result."""
+        return self._combine_checks(
+            r["attribute_check"], r["context_check"], r["visualization_check"], r["user_query"]
         )
+    
+    def _batch_checks_stage(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        """Vectorized checks for every product plus the aggregate."""
+        with read_session(r["db"]) as session:
+            return self._run_batch_checks(
+                session,
+                r["products"],
+                r["selection"][0],
+                r["detect"].extracted_context or {},
+                r["user_query"]
+            )
+    
+    def _choose_stage(self, r: Dict[str, Any]) -> tuple[IntentResponse, VisualizationResponse, Dict[str, Any]]:
+        """Attach the checks to the response."""
+        intent_response, visualization_response = r["response"]
+        if not visualization_response.product_ids:
+            return intent_response, visualization_response, {"checks": None, "message": "No products detected"}
         
         # If checks fail, modify visualization response
+        checks_result = r["checks"]
         if not checks_result.get("passed", False):
             visualization_response.message = checks_result.get("message", "Pre-decision checks failed")
         
         return intent_response, visualization_response, checks_result
     
-    def _run_pre_decision_checks(
+    def rank_candidates(
         self,
         db: Session,
         product_ids: List[str],
-        selected_attributes: List[str],
-        user_context: Dict[str, Any],
-        user_query: str
+        context: Dict[str, Any],
+        top_k: int = 10
     ) -> Dict[str, Any]:
-        """Run all pre-decision checks."""
-        # 1. Attribute completeness check
-        attribute_result = self.attribute_check.check(
-            db, product_ids, selected_attributes
-        )
-        
-        # 2. User context validation
-        context_result = self.context_check.check(
-            db, product_ids, user_context
-        )
+        """
+        Rank candidate products on the CHOOSE attributes.
         
-        # 3. Visualization readiness check
-        visualization_result = self.visualization_check.check(
-            db, product_ids, ["main_image"]
-        )
+        Args:
+            db: Database session
+            product_ids: Candidate product IDs
+            context: Intent context; may carry explicit attribute 'weights'
+            top_k: Number of ranked products to return
         
+        Returns:
+            Ranking result from ChooseRanker
+        """
+        snapshot = get_catalog_snapshot(db)
+        return self.ranker.rank(snapshot, product_ids, context, top_k)
+    
+    def _combine_checks(
+        self,
+        attribute_result: Dict[str, Any],
+        context_result: Dict[str, Any],
+        visualization_result: Dict[str, Any],
+        user_query: str
+    ) -> Dict[str, Any]:
+        """Score decision confidence and combine the check results."""
         # 4. Decision confidence score
-        # Estimate query clarity (simple heuristic)
-        query_clarity = min(len(user_query.split()) / 10.0, 1.0)
+        query_clarity = self._query_clarity(user_query)
         
         confidence_result = self.confidence_check.calculate(
             attribute_result,
@@ -108,4 +210,26 @@ class ChooseHandler:
             },
             "message": confidence_result.get("message", "Pre-decision checks completed")
         }
-
+    
+    def _run_batch_checks(
+        self,
+        db: Session,
+        product_ids: List[str],
+        selected_attributes: List[str],
+        user_context: Dict[str, Any],
+        user_query: str
+    ) -> Dict[str, Any]:
+        """Run all pre-decision checks for every product at once, plus the aggregate."""
+        return self.batch_checks.check(
+            db,
+            product_ids,
+            selected_attributes,
+            user_context,
+            ["main_image"],
+            self._query_clarity(user_query)
+        )
+    
+    @staticmethod
+    def _query_clarity(user_query: str) -> float:
+        """Estimate query clarity (simple heuristic)."""
+        return min(len(user_query.split()) / 10.0, 1.0)
@@ -0,0 +1,204 @@
+"""Vectorized ranking of CHOOSE candidates over mapped attributes."""
+from typing import List, Dict, Any, Optional
+from src.data.catalog_snapshot import CatalogSnapshot
+from src.intents.intent_mappings import INTENT_MAPPINGS, ATTRIBUTE_DIRECTIONS, ORDINAL_ATTRIBUTES
+import numpy as np
+
+
+def catalog_column(
+    snapshot: CatalogSnapshot,
+    attribute: str,
+    usage_context: Optional[str] = None
+) -> np.ndarray:
+    """
+    Dense float column of one attribute over the whole catalog.
+    
+    Numeric attributes come from the numeric index, ordinal and boolean
+    attributes are encoded from the inverted index, and ``usage_context`` is
+    1.0 where the product lists the given context (0.0 where it lists others).
+    Missing values are NaN. Columns are cached on the snapshot.
+    """
+    key = ("catalog_column", attribute, usage_context if attribute == "usage_context" else None)
+    return snapshot.cached(key, lambda: _build_catalog_column(snapshot, attribute, usage_context))
+
+
+def _build_catalog_column(
+    snapshot: CatalogSnapshot,
+    attribute: str,
+    usage_context: Optional[str]
+) -> np.ndarray:
+    """Build the column returned by catalog_column."""
+    numeric = snapshot.numeric_index
+    inverted = snapshot.inverted_index
+    column = np.full(len(snapshot), np.nan)
+    
+    if attribute == "usage_context":
+        if usage_context:
+            column[inverted.mask(inverted.has_attribute(attribute))] = 0.0
+            column[inverted.mask(inverted.bitmap(attribute, usage_context))] = 1.0
+    elif attribute in numeric.columns:
+        values, indexed_positions = numeric.columns[attribute]
+        column[indexed_positions] = values
+    elif attribute in ORDINAL_ATTRIBUTES:
+        for value, rank in ORDINAL_ATTRIBUTES[attribute].items():
+            column[inverted.mask(inverted.bitmap(attribute, value))] = rank
+    else:
+        column[inverted.mask(inverted.bitmap(attribute, False))] = 0.0
+        column[inverted.mask(inverted.bitmap(attribute, True))] = 1.0
+    return column
+
+
+class ChooseRanker:
+    """
+    Scores candidate products on the CHOOSE mapping's attributes.
+    
+    Attribute values are gathered from dense catalog columns into a
+    products × attributes matrix, min-max normalized per column (flipped for
+    attributes where lower is better), weighted from the intent context and
+    summed, all as whole-array operations.
+    """
+    
+    # Multipliers applied on top of the base weight of 1.0
+    MENTIONED_BOOST = 2.0
+    USAGE_CONTEXT_BOOST = 1.5
+    
+    def __init__(self, attributes: Optional[List[str]] = None):
+        self.attributes = attributes or INTENT_MAPPINGS["choose"]["attributes"]
+    
+    def load_columns(
+        self,
+        snapshot: CatalogSnapshot,
+        positions: np.ndarray,
+        usage_context: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Gather attribute values for the given snapshot positions.
+        
+        Returns:
+            Float matrix of shape (len(positions), len(attributes)); NaN marks
+            a missing value
+        """
+        matrix = np.full((len(positions), len(self.attributes)), np.nan)
+        for j, attribute in enumerate(self.attributes):
+            if attribute == "usage_context" and not usage_context:
+                continue
+            matrix[:, j] = catalog_column(snapshot, attribute, usage_context)[positions]
+        
+        return matrix
+    
+    def weights_for_context(self, context: Dict[str, Any]) -> np.ndarray:
+        """
+        Derive attribute weights from the intent context.
+        
+        Mentioned attributes are boosted, a usage context boosts the
+        attributes mapped to it, and an explicit ``weights`` dict in the
+        context overrides both (weights that are not finite numbers are
+        ignored).
+        """
+        weights = np.ones(len(self.attributes))
+        mentioned = context.get("mentioned_attributes", [])
+        usage_context = context.get("usage_context")
+        usage_attributes = INTENT_MAPPINGS["usage_context"]["attributes"]
+        
+        for j, attribute in enumerate(self.attributes):
+            if any(mention in attribute for mention in mentioned):
+                weights[j] *= self.MENTIONED_BOOST
+            if usage_context and attribute in usage_attributes:
+                weights[j] *= self.USAGE_CONTEXT_BOOST
+            if attribute == "usage_context" and not usage_context:
+                weights[j] = 0.0
+        
+        explicit = context.get("weights")
+        for attribute, weight in (explicit.items() if isinstance(explicit, dict) else ()):
+            if attribute in self.attributes:
+                try:
+                    weight = float(weight)
+                except (TypeError, ValueError):
+                    continue
+                if np.isfinite(weight):
+                    weights[self.attributes.index(attribute)] = max(weight, 0.0)
+        
+        return weights
+    
+    def score(self, matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Normalize columns and compute weighted per-attribute contributions.
+        
+        Returns:
+            Contribution matrix with the same shape as ``matrix``; row sums are
+            the product scores in [0, 1]
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            low = np.where(np.isnan(matrix), np.inf, matrix).min(axis=0, initial=np.inf)
+            high = np.where(np.isnan(matrix), -np.inf, matrix).max(axis=0, initial=-np.inf)
+            span = high - low
+            normalized = np.where(span > 0, (matrix - low) / span, 1.0)
+        
+        lower_is_better = np.array([ATTRIBUTE_DIRECTIONS.get(a) == "min" for a in self.attributes])
+        normalized = np.where(lower_is_better, 1.0 - normalized, normalized)
+        normalized = np.where(np.isnan(matrix), 0.0, normalized)
+        
+        total = weights.sum()
+        if total <= 0:
+            return np.zeros_like(matrix)
+        return normalized * (weights / total)
+    
+    def rank(
+        self,
+        snapshot: CatalogSnapshot,
+        product_ids: List[str],
+        context: Dict[str, Any],
+        top_k: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Rank candidate products for a CHOOSE intent.
+        
+        Args:
+            snapshot: Catalog snapshot holding the candidates
+            product_ids: Candidate product IDs
+            context: Intent context (usage_context, mentioned_attributes, weights)
+            top_k: Number of ranked products to return
+        
+        Returns:
+            Dict with 'ranking' (List[Dict]) of the top products and their
+            per-attribute contributions, plus the weights used
+        """
+        known = [product_id for product_id in product_ids if product_id in snapshot.position]
+        unknown = [product_id for product_id in product_ids if product_id not in snapshot.position]
+        positions = np.fromiter((snapshot.position[p] for p in known), dtype=np.int64, count=len(known))
+        
+        matrix = self.load_columns(snapshot, positions, context.get("usage_context"))
+        weights = self.weights_for_context(context)
+        contributions = self.score(matrix, weights)
+        scores = contributions.sum(axis=1)
+        
+        k = min(top_k, len(known))
+        if k < len(known):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(known))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        
+        ranking = []
+        for rank, row in enumerate(top.tolist(), start=1):
+            ranking.append({
+                "rank": rank,
+                "product_id": known[row],
+                "score": round(float(scores[row]), 4),
+                "contributions": {
+                    attribute: round(float(contributions[row, j]), 4)
+                    for j, attribute in enumerate(self.attributes)
+                    if weights[j] > 0
+                },
+                "missing_attributes": [
+                    attribute for j, attribute in enumerate(self.attributes)
+                    if weights[j] > 0 and np.isnan(matrix[row, j])
+                ]
+            })
+        
+        return {
+            "candidate_count": len(known),
+            "unknown_products": unknown,
+            "weights": {attribute: float(weights[j]) for j, attribute in enumerate(self.attributes)},
+            "ranking": ranking
+        }
@@ -0,0 +1,107 @@
+"""Bounded LRU memo of intent detection results."""
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional
+from src.config import settings
+from src.schemas.intent import IntentResponse
+import threading
+
+
+def normalize_query(user_query: str) -> str:
+    """Lowercase a query and collapse its whitespace (detection ignores both)."""
+    return " ".join(user_query.lower().split())
+
+
+def copy_response(response: IntentResponse) -> IntentResponse:
+    """
+    Copy a response, including its mutable lists and context.
+    
+    Cheaper than a deep copy: the values are strings or lists of strings,
+    and the response was validated when it was first built.
+    """
+    context = response.extracted_context
+    if context is not None:
+        context = {key: list(value) if isinstance(value, list) else value for key, value in context.items()}
+    return IntentResponse.model_construct(
+        intent_type=response.intent_type,
+        confidence=response.confidence,
+        detected_products=list(response.detected_products),
+        extracted_context=context
+    )
+
+
+class DetectionCache:
+    """
+    Thread-safe LRU of IntentResponses.
+    
+    Stored responses are private copies and every hit returns a fresh copy,
+    so callers may mutate what they get without corrupting the cache.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[IntentResponse]:
+        """Return a copy of the cached response, or None."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_response(response)
+    
+    def put(self, key: Hashable, response: IntentResponse) -> None:
+        """Store a copy of a response, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        response = copy_response(response)
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit-rate statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+_cache: Optional[DetectionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_detection_cache() -> Optional[DetectionCache]:
+    """
+    Return the process-wide detection cache.
+    
+    Returns:
+        The cache, or None if INTENT_CACHE_SIZE is 0
+    """
+    global _cache
+    if settings.intent_cache_size <= 0:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DetectionCache(settings.intent_cache_size)
+    return _cache
@@ -0,0 +1,190 @@
+"""Linear intent classifier over hashed bag-of-ngrams features."""
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterable, Optional
+from src.schemas.intent import IntentType
+from src.config import settings
+import numpy as np
+import math
+import os
+import re
+import zlib
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Classes in weight-column order
+LABELS = [intent_type.value for intent_type in IntentType]
+
+
+@lru_cache(maxsize=65536)
+def _token_buckets(token: str, dim: int) -> Tuple[int, ...]:
+    """Hash buckets of a word and of its character trigrams (cached: query vocabulary repeats)."""
+    padded = f"<{token}>"
+    features = [f"w:{token}"] + [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return tuple(zlib.crc32(feature.encode()) & (dim - 1) for feature in features)
+
+
+def feature_buckets(text: str, dim: int) -> List[int]:
+    """
+    Hash buckets of a text's word unigrams and bigrams and of each word's character trigrams.
+    
+    Character trigrams make inflections and typos ("comparing", "comapre")
+    share most features with the base word. Buckets repeat for repeated
+    features.
+    
+    Args:
+        text: Query text
+        dim: Number of hash buckets (a power of two)
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    buckets = [bucket for token in tokens for bucket in _token_buckets(token, dim)]
+    buckets.extend(zlib.crc32(f"b:{first} {second}".encode()) & (dim - 1) for first, second in zip(tokens, tokens[1:]))
+    return buckets
+
+
+def hash_batch(texts: Iterable[str], dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash many texts.
+    
+    Returns:
+        (row offsets, bucket indices); row i spans offsets[i]:offsets[i + 1]
+    """
+    rows = [feature_buckets(text, dim) for text in texts]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(buckets) for buckets in rows])
+    return offsets, np.fromiter((bucket for buckets in rows for bucket in buckets), dtype=np.int64, count=offsets[-1])
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax."""
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+class LinearIntentClassifier:
+    """
+    Multinomial logistic regression over hashed features.
+    
+    The model is a (dim x classes) weight matrix and a bias vector. A query
+    is a sparse vector over hash buckets in which each feature occurrence
+    weighs 1/sqrt(number of features); scoring gathers the weight rows of its
+    buckets and sums them, a sparse matrix-vector product that scores every
+    IntentType at once.
+    """
+    
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, labels: np.ndarray):
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.labels = [str(label) for label in labels]
+        self.dim = self.weights.shape[0]
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the model arrays."""
+        return self.weights.nbytes + self.bias.nbytes
+    
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Probability of each intent label for one query."""
+        buckets = feature_buckets(text, self.dim)
+        logits = self.bias
+        if buckets:
+            rows = self.weights.take(np.array(buckets, dtype=np.intp), axis=0)
+            logits = rows.sum(axis=0) / math.sqrt(len(buckets)) + self.bias
+        
+        # A handful of classes: plain floats beat array operations here
+        logits = logits.tolist()
+        top = max(logits)
+        exps = [math.exp(logit - top) for logit in logits]
+        total = sum(exps)
+        return {label: e / total for label, e in zip(self.labels, exps)}
+    
+    def predict_proba_batch(self, texts: List[str]) -> np.ndarray:
+        """Probabilities for many queries, shape (len(texts), classes)."""
+        offsets, indices = hash_batch(texts, self.dim)
+        return softmax(self._logits(offsets, indices))
+    
+    def _logits(self, offsets: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """Per-row sums of the feature weight rows, scaled, plus the bias."""
+        counts = np.diff(offsets)
+        logits = np.zeros((len(counts), len(self.labels)), dtype=np.float32)
+        nonempty = counts > 0
+        if nonempty.any():
+            sums = np.add.reduceat(self.weights[indices], offsets[:-1][nonempty], axis=0)
+            logits[nonempty] = sums / np.sqrt(counts[nonempty])[:, None]
+        return logits + self.bias
+    
+    @classmethod
+    def train(
+        cls,
+        texts: List[str],
+        labels: List[str],
+        dim: int = 1 << 14,
+        epochs: int = 300,
+        learning_rate: float = 2.0,
+        l2: float = 1e-4
+    ) -> "LinearIntentClassifier":
+        """
+        Fit the model with full-batch gradient descent on the cross-entropy loss.
+        
+        Args:
+            texts: Training queries
+            labels: IntentType value of each query
+            dim: Number of hash buckets (a power of two)
+            epochs: Gradient steps
+            learning_rate: Step size
+            l2: L2 penalty on the weights
+        
+        Raises:
+            ValueError: On an unknown label or a dim that is not a power of two
+        """
+        if dim & (dim - 1):
+            raise ValueError(f"dim must be a power of two, got {dim}")
+        unknown = set(labels) - set(LABELS)
+        if unknown:
+            raise ValueError(f"Unknown intent labels: {', '.join(sorted(unknown))}")
+        
+        model = cls(np.zeros((dim, len(LABELS)), dtype=np.float32), np.zeros(len(LABELS), dtype=np.float32), np.array(LABELS))
+        offsets, indices = hash_batch(texts, dim)
+        counts = np.diff(offsets)
+        rows = np.repeat(np.arange(len(texts)), counts)
+        values = (1 / np.sqrt(counts[rows])).astype(np.float32)
+        targets = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+        targets[np.arange(len(texts)), [LABELS.index(label) for label in labels]] = 1.0
+        
+        for _ in range(epochs):
+            error = (softmax(model._logits(offsets, indices)) - targets) / len(texts)
+            gradient = np.zeros_like(model.weights)
+            np.add.at(gradient, indices, values[:, None] * error[rows])
+            model.weights -= learning_rate * (gradient + l2 * model.weights)
+            model.bias -= learning_rate * error.sum(axis=0)
+        return model
+    
+    def save(self, path: str) -> None:
+        """Write the model to an uncompressed ``.npz`` file."""
+        np.savez(path, weights=self.weights, bias=self.bias, labels=np.array(self.labels))
+    
+    @classmethod
+    def load(cls, path: str) -> "LinearIntentClassifier":
+        """Load a model written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["weights"], data["bias"], data["labels"])
+
+
+_loaded_classifier: Optional[LinearIntentClassifier] = None
+_load_attempted = False
+
+
+def get_intent_classifier() -> Optional[LinearIntentClassifier]:
+    """
+    Return the trained classifier, loading it on first use.
+    
+    Returns None if no model has been trained yet.
+    """
+    global _loaded_classifier, _load_attempted
+    if not _load_attempted:
+        _load_attempted = True
+        if os.path.exists(settings.intent_model_path):
+            try:
+                _loaded_classifier = LinearIntentClassifier.load(settings.intent_model_path)
+            except (OSError, ValueError, KeyError):
+                _loaded_classifier = None
+    return _loaded_classifier
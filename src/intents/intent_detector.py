@@ -1,6 +1,10 @@
 """Intent detection engine using NLP."""
 from typing import List, Dict, Any, Optional
 from src.schemas.intent import IntentType, IntentResponse
+from src.data.fuzzy_index import get_fuzzy_index, fuzzy_index_generation
+from src.intents.detection_cache import get_detection_cache, normalize_query
+from src.intents.intent_classifier import LinearIntentClassifier, get_intent_classifier
+from src.config import settings
 import re
 import importlib
 
@@ -18,36 +22,116 @@ except (ImportError, ModuleNotFoundError, Exception) as e:
     SPACY_AVAILABLE = False
     _nlp_module = None
 
+# Only lemmas are used; the parser and entity recognizer are not needed
+UNUSED_COMPONENTS = ["parser", "ner", "senter"]
 
-class IntentDetector:
-    """Detects user intent from natural language queries."""
+# Loaded model, shared by all detectors in the process (False: load failed)
+_nlp = None
+
+
+def load_nlp():
+    """
+    Return the spaCy model, loading it once per process.
     
-    def __init__(self):
-        """Initialize the intent detector with spaCy model (optional)."""
-        self.nlp = None
+    Returns:
+        The model, or None if spaCy or the model is not available
+    """
+    global _nlp
+    if _nlp is None:
+        _nlp = False
         if SPACY_AVAILABLE and _nlp_module is not None:
             try:
-                self.nlp = _nlp_module.load("en_core_web_sm")
+                _nlp = _nlp_module.load(settings.spacy_model, disable=UNUSED_COMPONENTS)
             except (OSError, ImportError, Exception):
                 # Fallback to basic pattern matching if spaCy model not available
-                self.nlp = None
+                _nlp = False
+    return _nlp or None
+
+
+class IntentDetector:
+    """
+    Detects user intent from natural language queries.
+    
+    Intents are scored by one of two engines: "pattern" (additive keyword
+    scores, matched against spaCy lemmas too when a model is installed) or
+    "linear" (a trained classifier giving a probability for every intent,
+    UNKNOWN included). Product and context extraction are the same for both.
+    """
+    
+    def __init__(
+        self,
+        engine: Optional[str] = None,
+        use_spacy: bool = True,
+        classifier: Optional[LinearIntentClassifier] = None,
+        use_cache: bool = True
+    ):
+        """
+        Initialize the intent detector.
+        
+        Args:
+            engine: "pattern" or "linear" (default: INTENT_ENGINE setting); the
+                linear engine falls back to patterns if no model was trained
+            use_spacy: Load the spaCy model (optional) for the pattern engine
+            classifier: Model for the linear engine (default: the trained model
+                at INTENT_MODEL_PATH)
+            use_cache: Memoize results in the process-wide detection cache
+                (INTENT_CACHE_SIZE entries)
+        """
+        engine = engine or settings.intent_engine
+        if engine not in ("pattern", "linear"):
+            raise ValueError(f"Unknown intent engine: {engine}")
+        self.classifier = (classifier or get_intent_classifier()) if engine == "linear" else None
+        self.engine = "linear" if self.classifier is not None else "pattern"
+        self.nlp = load_nlp() if self.engine == "pattern" and use_spacy else None
+        self.cache = get_detection_cache() if use_cache else None
     
-    def detect_intent(self, user_query: str, product_ids: Optional[List[str]] = None) -> IntentResponse:
+    def detect_intent(self, user_query: str, product_ids: Optional[List[str]] = None, doc: Any = None) -> IntentResponse:
         """
         Detect intent from user query.
         
+        Results are memoized (see ``_cache_key``); the returned response is the
+        caller's own copy.
+        
         Args:
             user_query: User's natural language query
             product_ids: Optional list of product IDs mentioned
+            doc: Optional spaCy Doc of the query (parsed here if spaCy is loaded)
             
         Returns:
             IntentResponse with detected intent and confidence
         """
-        query_lower = user_query.lower()
+        if self.cache is None:
+            return self._detect(user_query, product_ids, doc)
+        key = self._cache_key(user_query, product_ids)
+        response = self.cache.get(key)
+        if response is None:
+            response = self._detect(user_query, product_ids, doc)
+            self.cache.put(key, response)
+        return response
+    
+    def _cache_key(self, user_query: str, product_ids: Optional[List[str]]) -> tuple:
+        """
+        Memo key of a detection.
         
-        # Extract product IDs from query if not provided
-        if product_ids is None:
-            product_ids = self._extract_product_ids(user_query)
+        Scoring and context extraction ignore case and repeated whitespace.
+        Product names extracted from the query keep its casing, so without
+        product IDs only whitespace is normalized, and the key includes the
+        fuzzy index generation so a rebuilt index is not shadowed by old results.
+        """
+        if product_ids is not None:
+            return (self.engine, self.nlp is not None, normalize_query(user_query), tuple(product_ids))
+        query = " ".join(user_query.split())
+        return (self.engine, self.nlp is not None, query, None, fuzzy_index_generation())
+    
+    def _detect(self, user_query: str, product_ids: Optional[List[str]], doc: Any = None) -> IntentResponse:
+        """Detect intent without the memo."""
+        if self.classifier is not None:
+            probabilities = self.classifier.predict_proba(user_query)
+            return self._build_response(user_query, product_ids, *self._most_likely(probabilities))
+        
+        if doc is None and self.nlp is not None:
+            doc = self.nlp(user_query)
+        query_lower = self._scoring_text(user_query, doc)
         
         # Pattern-based intent detection (more reliable than pure NLP for this use case)
         intent_scores = {
@@ -61,16 +145,89 @@ class IntentDetector:
         best_intent = max(intent_scores.items(), key=lambda x: x[1])
         intent_type, confidence = best_intent
         
+        return self._build_response(
+            user_query, product_ids, intent_type if confidence > 0.3 else IntentType.UNKNOWN, confidence
+        )
+    
+    def _build_response(
+        self,
+        user_query: str,
+        product_ids: Optional[List[str]],
+        intent_type: IntentType,
+        confidence: float
+    ) -> IntentResponse:
+        """Add the extracted products and context to a scored intent."""
+        # Extract product IDs from query if not provided
+        if product_ids is None:
+            product_ids = self._extract_product_ids(user_query)
+        
         # Extract context
         extracted_context = self._extract_context(user_query)
         
         return IntentResponse(
-            intent_type=intent_type if confidence > 0.3 else IntentType.UNKNOWN,
+            intent_type=intent_type,
             confidence=confidence,
             detected_products=product_ids,
             extracted_context=extracted_context
         )
     
+    @staticmethod
+    def _most_likely(probabilities: Dict[str, float]) -> tuple[IntentType, float]:
+        """The most probable intent and its probability."""
+        label, probability = max(probabilities.items(), key=lambda item: item[1])
+        return IntentType(label), probability
+    
+    def detect_intents(self, queries: List[tuple[str, Optional[List[str]]]]) -> List[IntentResponse]:
+        """
+        Detect the intents of many queries.
+        
+        The linear engine scores all queries together; with spaCy loaded,
+        the queries are parsed together with ``nlp.pipe``.
+        
+        Args:
+            queries: (user_query, product_ids) pairs
+            
+        Returns:
+            One IntentResponse per query, in order
+        """
+        if self.cache is None:
+            return self._detect_batch(queries)
+        
+        keys = [self._cache_key(user_query, product_ids) for user_query, product_ids in queries]
+        responses = [self.cache.get(key) for key in keys]
+        misses = [i for i, response in enumerate(responses) if response is None]
+        if misses:
+            detected = self._detect_batch([queries[i] for i in misses])
+            for i, response in zip(misses, detected):
+                self.cache.put(keys[i], response)
+                responses[i] = response
+        return responses
+    
+    def _detect_batch(self, queries: List[tuple[str, Optional[List[str]]]]) -> List[IntentResponse]:
+        """Detect many queries without the memo."""
+        if self.classifier is not None:
+            probabilities = self.classifier.predict_proba_batch([user_query for user_query, _ in queries])
+            return [
+                self._build_response(user_query, product_ids, *self._most_likely(dict(zip(self.classifier.labels, row))))
+                for (user_query, product_ids), row in zip(queries, probabilities.tolist())
+            ]
+        if self.nlp is None:
+            return [self._detect(user_query, product_ids) for user_query, product_ids in queries]
+        docs = self.nlp.pipe((user_query for user_query, _ in queries), batch_size=settings.nlp_batch_size)
+        return [
+            self._detect(user_query, product_ids, doc)
+            for (user_query, product_ids), doc in zip(queries, docs)
+        ]
+    
+    @staticmethod
+    def _scoring_text(user_query: str, doc: Any) -> str:
+        """Lowercased query, followed by its lemmas when parsed (so "chose" matches "choose")."""
+        query_lower = user_query.lower()
+        if doc is None:
+            return query_lower
+        lemmas = " ".join(token.lemma_.lower() or token.lower_ for token in doc)
+        return f"{query_lower} {lemmas}"
+    
     def _score_compare_intent(self, query: str) -> float:
         """Score how likely the query is a compare intent."""
         compare_keywords = [
@@ -134,6 +291,12 @@ class IntentDetector:
             matches = re.findall(pattern, query, re.IGNORECASE)
             product_ids.extend(matches)
         
+        # Fall back to typo-tolerant lookup when nothing matched exactly
+        if not product_ids:
+            fuzzy_index = get_fuzzy_index()
+            if fuzzy_index is not None:
+                return fuzzy_index.lookup(query)
+        
         return list(set(product_ids))
     
     def _extract_context(self, query: str) -> Dict[str, Any]:
@@ -1,11 +1,32 @@
 """Intent handler that processes intents and returns visualization data."""
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.intents.intent_detector import IntentDetector
-from src.intents.intent_mappings import get_attributes_for_intent, get_visual_effects_for_intent
+from src.intents.nlp_service import get_nlp_service
+from src.intents.session_store import ConversationSession, get_session_store
+from src.intents.intent_mappings import get_attributes_for_intent, get_visual_effects_for_intent, ATTRIBUTE_DIRECTIONS
+from src.intents.choose_ranker import catalog_column
 from src.data.product_service import ProductService
-from src.schemas.intent import IntentResponse
+from src.database import read_session
+from src.data.catalog_snapshot import CatalogSnapshot, get_catalog_snapshot
+from src.visualization.skyline import compute_skyline
+from src.visualization.similarity_index import find_reference_products
+from src.visualization.comparison_builder import ComparisonBuilder
+from src.visualization.image_derivatives import derivatives_for_products
+from src.visualization.visualization_engine import VisualizationEngine
+from src.pipeline import Stage, Pipeline, PipelineRun, get_stage_executor, run_blocking
+from src.schemas.intent import IntentRequest, IntentResponse, IntentType
 from src.schemas.visualization import VisualizationResponse, VisualEffect
+import numpy as np
+import asyncio
+
+# Effects that use the precomputed image derivatives
+DERIVATIVE_EFFECTS = {VisualEffect.ZOOM_EARCUP_FRAME, VisualEffect.HIGHLIGHT_MATERIALS}
+
+
+def has_products(r: Dict[str, Any]) -> bool:
+    """Stage predicate: the pipeline resolved at least one product."""
+    return bool(r["products"])
 
 
 class IntentHandler:
@@ -13,27 +34,300 @@ class IntentHandler:
     
     def __init__(self):
         self.intent_detector = IntentDetector()
+        self.nlp_service = get_nlp_service()
         self.product_service = ProductService()
+        self.comparison_builder = ComparisonBuilder()
+        self.visualization_engine = VisualizationEngine()
     
     def process_intent(
         self,
         db: Session,
         user_query: str,
-        product_ids: List[str] = None
+        product_ids: List[str] = None,
+        pareto_attributes: Optional[List[str]] = None,
+        session: Optional[ConversationSession] = None
     ) -> tuple[IntentResponse, VisualizationResponse]:
         """
         Process user query: detect intent and generate visualization response.
         
+        Runs the intent pipeline stages one after another; see
+        ``run_intent_pipeline`` for the concurrent variant.
+        
+        Args:
+            db: Database session
+            user_query: User's natural language query
+            product_ids: Optional product IDs; detected from the query if omitted
+            pareto_attributes: Optional attributes (with optional ':min'/':max'
+                direction) for a Pareto frontier over the products
+            session: Optional conversation session to reuse and update
+        
         Returns:
             Tuple of (IntentResponse, VisualizationResponse)
         """
-        # Detect intent
-        intent_response = self.intent_detector.detect_intent(user_query, product_ids)
+        pipeline = Pipeline(self.intent_stages(bool(product_ids)))
+        run = pipeline.run_sequential(self.intent_inputs(db, user_query, product_ids, pareto_attributes, session))
+        return run.results["response"]
+    
+    async def run_intent_pipeline(
+        self,
+        db: Session,
+        user_query: str,
+        product_ids: List[str] = None,
+        pareto_attributes: Optional[List[str]] = None,
+        with_effects: bool = False,
+        session: Optional[ConversationSession] = None
+    ) -> PipelineRun:
+        """
+        Process user query with independent stages running concurrently.
         
-        # Get product IDs from intent if not provided
-        if not product_ids:
-            product_ids = intent_response.detected_products
+        Args:
+            db: Database session
+            user_query: User's natural language query
+            product_ids: Optional product IDs; detected from the query if omitted
+            pareto_attributes: Optional attributes for a Pareto frontier
+            with_effects: Also apply the visual effects (result 'effects')
+            session: Optional conversation session to reuse and update
         
+        Returns:
+            PipelineRun whose 'response' result is (IntentResponse, VisualizationResponse)
+        """
+        stages = self.intent_stages(bool(product_ids))
+        if with_effects:
+            stages.append(self.effects_stage())
+        return await Pipeline(stages).run(self.intent_inputs(db, user_query, product_ids, pareto_attributes, session))
+    
+    async def run_intent_batch(
+        self,
+        db: Session,
+        requests: List[IntentRequest],
+        with_effects: bool = False
+    ) -> List[PipelineRun]:
+        """
+        Process many queries together, e.g. the widgets of one dashboard page.
+        
+        Intents are detected as one batch, and the attributes of every product
+        any query needs are fetched with one query (the union of the plans'
+        projections). Each query's pipeline then runs with those stages
+        provided, so per-query work is only what differs between them.
+        
+        Args:
+            db: Database session
+            requests: Queries to process
+            with_effects: Also apply the visual effects (result 'effects')
+        
+        Returns:
+            One PipelineRun per request, in order
+        """
+        queries = [(request.user_query, request.product_ids) for request in requests]
+        if self.nlp_service is None:
+            detections = await run_blocking(self.intent_detector.detect_intents, queries)
+        else:
+            detections = await asyncio.gather(*(
+                self.nlp_service.detect_intent(user_query, product_ids) for user_query, product_ids in queries
+            ))
+        
+        inputs = []
+        for request, intent_response in zip(requests, detections):
+            r = self.intent_inputs(db, request.user_query, request.product_ids, request.pareto_attributes)
+            r["detect"] = intent_response
+            r["products"] = self._products_stage(r)
+            r["plan"] = self._plan_stage(r)
+            inputs.append(r)
+        
+        # One fetch for all queries, sliced per query below
+        product_ids = list(dict.fromkeys(product_id for r in inputs for product_id in r["products"]))
+        attribute_names = list(dict.fromkeys(name for r in inputs if r["products"] for name in r["plan"][0]))
+        if product_ids:
+            products_attributes = await run_blocking(self._load_attributes, db, product_ids, attribute_names)
+            for r in inputs:
+                if r["products"]:
+                    names = set(r["plan"][0])
+                    r["attributes"] = {
+                        product_id: {
+                            name: value for name, value in products_attributes[product_id].items() if name in names
+                        }
+                        for product_id in r["products"]
+                    }
+        
+        # The remaining stages are CPU-bound: run them back to back on one thread
+        # rather than hopping between threads for every stage of every query
+        pipelines = {}
+        for explicit_products in {bool(r["product_ids"]) for r in inputs}:
+            stages = self.intent_stages(explicit_products)
+            if with_effects:
+                stages.append(self.effects_stage())
+            pipelines[explicit_products] = Pipeline(stages)
+        
+        def run_remaining() -> List[PipelineRun]:
+            return [pipelines[bool(r["product_ids"])].run_sequential(r) for r in inputs]
+        
+        return await run_blocking(run_remaining)
+    
+    def _load_attributes(
+        self,
+        db: Session,
+        product_ids: List[str],
+        attribute_names: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load attributes of products through a session of their own."""
+        with read_session(db) as session:
+            return self.product_service.get_products_attributes(session, product_ids, attribute_names)
+    
+    @staticmethod
+    def intent_inputs(
+        db: Session,
+        user_query: str,
+        product_ids: Optional[List[str]],
+        pareto_attributes: Optional[List[str]],
+        session: Optional[ConversationSession] = None
+    ) -> Dict[str, Any]:
+        """Initial pipeline values for the intent stages."""
+        return {
+            "db": db,
+            "user_query": user_query,
+            "product_ids": product_ids,
+            "pareto_attributes": pareto_attributes,
+            "session": session
+        }
+    
+    def intent_stages(self, explicit_products: bool) -> List[Stage]:
+        """
+        Stages from the user query to the visualization response.
+        
+        With explicit product IDs, product-only work (catalog snapshot, Pareto
+        frontier) does not wait for intent detection. Database stages only
+        read, each through a session of its own, so they can overlap. With
+        the NLP worker processes enabled, detection is awaited from them.
+        
+        With a conversation session, a follow-up that names no products
+        reuses the previous product set, an undetected intent reuses the
+        previous plan, and only attributes the session has not loaded yet are
+        fetched; the 'remember' stage then records the new state.
+        
+        Args:
+            explicit_products: Whether product IDs were given with the request
+        """
+        return [
+            Stage("detect", self._detect_stage if self.nlp_service is None else self._detect_async_stage),
+            Stage("products", self._products_stage, () if explicit_products else ("detect",), blocking=False),
+            Stage("plan", self._plan_stage, ("detect",), blocking=False),
+            Stage("attributes", self._attributes_stage, ("products", "plan"), when=has_products),
+            Stage("selection", self._selection_stage, ("attributes", "plan"), when=has_products, blocking=False),
+            Stage("snapshot", self._snapshot_stage, when=lambda r: bool(r["pareto_attributes"])),
+            Stage(
+                "pareto", self._pareto_stage, ("products", "snapshot"),
+                when=lambda r: bool(r["products"] and r["pareto_attributes"])
+            ),
+            Stage(
+                "lighter", self._lighter_stage, ("products", "plan", "snapshot"),
+                when=lambda r: bool(r["products"]) and VisualEffect.COMPARISON_VS_LIGHTER in r["plan"][1]
+            ),
+            Stage(
+                "derivatives", self._derivatives_stage, ("products", "plan"), blocking=False,
+                when=lambda r: bool(r["products"]) and bool(DERIVATIVE_EFFECTS & set(r["plan"][1]))
+            ),
+            Stage("response", self._response_stage, ("selection", "pareto", "lighter", "derivatives")),
+            Stage(
+                "remember", self._remember_stage, ("response",), blocking=False,
+                when=lambda r: r["session"] is not None
+            )
+        ]
+    
+    def effects_stage(self) -> Stage:
+        """Stage applying the visual effects to the visualization response."""
+        return Stage(
+            "effects",
+            lambda r: self.visualization_engine.apply_visual_effects(r["response"][1]),
+            ("response",)
+        )
+    
+    def _detect_stage(self, r: Dict[str, Any]) -> IntentResponse:
+        """Detect intent."""
+        return self.intent_detector.detect_intent(r["user_query"], r["product_ids"])
+    
+    async def _detect_async_stage(self, r: Dict[str, Any]) -> IntentResponse:
+        """Detect intent in the NLP worker processes."""
+        return await self.detect_intent(r["user_query"], r["product_ids"])
+    
+    async def detect_intent(self, user_query: str, product_ids: Optional[List[str]] = None) -> IntentResponse:
+        """
+        Detect intent without blocking the event loop.
+        
+        Runs in the NLP worker processes when enabled, otherwise on the stage
+        thread pool.
+        """
+        if self.nlp_service is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                get_stage_executor(), self.intent_detector.detect_intent, user_query, product_ids
+            )
+        return await self.nlp_service.detect_intent(user_query, product_ids)
+    
+    def _products_stage(self, r: Dict[str, Any]) -> List[str]:
+        """Get product IDs from intent if not provided (or from the session's previous request)."""
+        product_ids = r["product_ids"] or r["detect"].detected_products
+        if not product_ids and r["session"] is not None:
+            return list(r["session"].product_ids)
+        return product_ids
+    
+    def _plan_stage(self, r: Dict[str, Any]) -> tuple[List[str], List[VisualEffect]]:
+        """Get attributes and visual effects for intent."""
+        intent_response = r["detect"]
+        session = r["session"]
+        if intent_response.intent_type == IntentType.UNKNOWN and session is not None and session.plan is not None:
+            # A follow-up without a recognizable intent continues the previous view
+            return list(session.plan[0]), list(session.plan[1])
+        context = intent_response.extracted_context or {}
+        return (
+            get_attributes_for_intent(intent_response.intent_type.value, context),
+            get_visual_effects_for_intent(intent_response.intent_type.value, context)
+        )
+    
+    def _attributes_stage(self, r: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Load the plan's attributes of the products (only those are fetched)."""
+        if r["session"] is not None:
+            return r["session"].get_attributes(
+                r["products"], r["plan"][0],
+                lambda product_ids, attribute_names: self._load_attributes(r["db"], product_ids, attribute_names)
+            )
+        return self._load_attributes(r["db"], r["products"], r["plan"][0])
+    
+    def _selection_stage(self, r: Dict[str, Any]) -> tuple[List[str], List[VisualEffect]]:
+        """
+        The attributes to show and the effects to apply.
+        
+        Known before the optional effect data is computed, so stages that
+        only need the selection (e.g. the explanation) can start early.
+        """
+        # Filter attributes that exist in products
+        available_attributes = self._filter_available_attributes(r["plan"][0], r["attributes"])
+        visual_effects = list(r["plan"][1])
+        if r["pareto_attributes"]:
+            visual_effects.append(VisualEffect.PARETO_FRONTIER)
+        return available_attributes, visual_effects
+    
+    def _snapshot_stage(self, r: Dict[str, Any]) -> CatalogSnapshot:
+        """Load the catalog snapshot."""
+        with read_session(r["db"]) as session:
+            return get_catalog_snapshot(session)
+    
+    def _pareto_stage(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        """Pareto trade-off view over the requested attributes."""
+        return self._compute_pareto(r["snapshot"], r["products"], r["pareto_attributes"])
+    
+    def _lighter_stage(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        """Comparable lighter products for the weight comparison."""
+        with read_session(r["db"]) as session:
+            return find_reference_products(get_catalog_snapshot(session), r["products"])
+    
+    def _derivatives_stage(self, r: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Precomputed image derivatives for zoom and material highlights."""
+        return derivatives_for_products(r["products"])
+    
+    def _response_stage(self, r: Dict[str, Any]) -> tuple[IntentResponse, VisualizationResponse]:
+        """Assemble the visualization response."""
+        intent_response = r["detect"]
+        product_ids = r["products"]
         if not product_ids:
             # No products detected, return empty visualization
             return intent_response, VisualizationResponse(
@@ -43,32 +337,21 @@ class IntentHandler:
                 message="No products detected in query. Please specify product names or IDs."
             )
         
-        # Get attributes for intent
-        context = intent_response.extracted_context or {}
-        selected_attributes = get_attributes_for_intent(
-            intent_response.intent_type.value,
-            context
-        )
-        
-        # Filter attributes that exist in products
-        products_attributes = self.product_service.get_products_attributes(db, product_ids)
-        available_attributes = self._filter_available_attributes(
-            selected_attributes,
-            products_attributes
-        )
-        
-        # Get visual effects
-        visual_effects = get_visual_effects_for_intent(
-            intent_response.intent_type.value,
-            context
-        )
+        available_attributes, visual_effects = r["selection"]
         
         # Build visualization data
         visualization_data = self._build_visualization_data(
             product_ids,
             available_attributes,
-            products_attributes
+            r["attributes"],
+            visual_effects
         )
+        if r["lighter"] is not None:
+            visualization_data["lighter_alternatives"] = r["lighter"]
+        if r["derivatives"] is not None:
+            visualization_data["image_derivatives"] = r["derivatives"]
+        if r["pareto"] is not None:
+            visualization_data["pareto"] = r["pareto"]
         
         visualization_response = VisualizationResponse(
             product_ids=product_ids,
@@ -79,6 +362,42 @@ class IntentHandler:
         
         return intent_response, visualization_response
     
+    def _remember_stage(self, r: Dict[str, Any]) -> None:
+        """Record this request's products and plan in the conversation session."""
+        session = r["session"]
+        session.remember_view(r["products"], r["detect"].intent_type.value, r["plan"])
+        store = get_session_store()
+        if store is not None:
+            store.save(session)
+    
+    def _compute_pareto(
+        self,
+        snapshot: CatalogSnapshot,
+        product_ids: List[str],
+        pareto_attributes: List[str]
+    ) -> Dict[str, Any]:
+        """Compute the non-dominated products over the requested attributes."""
+        attributes = []
+        directions = []
+        for spec in pareto_attributes:
+            attribute, _, direction = spec.partition(":")
+            attribute = attribute.strip()
+            direction = direction.strip().lower() or ATTRIBUTE_DIRECTIONS.get(attribute, "max")
+            attributes.append(attribute)
+            directions.append("min" if direction == "min" else "max")
+        
+        known = [product_id for product_id in product_ids if product_id in snapshot.position]
+        positions = np.array([snapshot.position[product_id] for product_id in known], dtype=np.int64)
+        matrix = np.column_stack([catalog_column(snapshot, attribute)[positions] for attribute in attributes])
+        
+        frontier_rows = set(compute_skyline(matrix, directions).tolist())
+        return {
+            "attributes": attributes,
+            "directions": dict(zip(attributes, directions)),
+            "frontier": [product_id for row, product_id in enumerate(known) if row in frontier_rows],
+            "dominated": [product_id for row, product_id in enumerate(known) if row not in frontier_rows]
+        }
+    
     def _filter_available_attributes(
         self,
         requested_attributes: List[str],
@@ -101,7 +420,8 @@ class IntentHandler:
         self,
         product_ids: List[str],
         attributes: List[str],
-        products_attributes: Dict[str, Dict[str, Any]]
+        products_attributes: Dict[str, Dict[str, Any]],
+        visual_effects: List[VisualEffect]
     ) -> Dict[str, Any]:
         """Build visualization data structure."""
         data = {
@@ -117,14 +437,17 @@ class IntentHandler:
         
         # Build comparison data if multiple products
         if len(product_ids) > 1:
-            for attr in attributes:
-                values = {}
-                for product_id in product_ids:
-                    product_attrs = products_attributes.get(product_id, {})
-                    if attr in product_attrs:
-                        values[product_id] = product_attrs[attr]
-                if values:
-                    data["comparison"][attr] = values
+            # Difference details are only shown by the highlight effect
+            highlight = VisualEffect.HIGHLIGHT_DIFFERENCES in visual_effects
+            comparison = self.comparison_builder.build(
+                product_ids, attributes, products_attributes, differences=highlight
+            )
+            data["comparison"] = comparison["values"]
+            if highlight:
+                data["differences"] = {
+                    "differing_attributes": comparison["differing_attributes"],
+                    "attributes": comparison["attributes"]
+                }
         
         return data
 
@@ -75,6 +75,29 @@ INTENT_MAPPINGS: Dict[str, Dict[str, List[str]]] = {
 }
 
 
+# Preferred direction per attribute when ranking or building trade-off views:
+# "min" means lower values are better, "max" means higher values are better
+ATTRIBUTE_DIRECTIONS: Dict[str, str] = {
+    "price": "min",
+    "base_price_usd": "min",
+    "weight": "min",
+    "weight_g": "min",
+    "battery_life": "max",
+    "battery_hr": "max",
+    "noise_cancellation": "max",
+    "noise_cancel": "max",
+    "foldability": "max",
+    "case_size": "min",
+    "clamp_force": "min",
+    "usage_context": "max"
+}
+
+# Ordinal encodings for categorical attributes with a natural order
+ORDINAL_ATTRIBUTES: Dict[str, Dict[str, float]] = {
+    "case_size": {"small": 0.0, "medium": 1.0, "large": 2.0}
+}
+
+
 def get_attributes_for_intent(intent_type: str, context: Dict = None) -> List[str]:
     """Get attributes for a given intent type."""
     context = context or {}
@@ -0,0 +1,187 @@
+"""Process-pool intent detection service."""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from src.config import settings
+from src.schemas.intent import IntentResponse
+from src.intents.intent_detector import IntentDetector
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+
+# Detector of a worker process, created once by the pool initializer
+_worker_detector: Optional[IntentDetector] = None
+
+
+def _init_worker():
+    """Load the spaCy model once in each worker process."""
+    global _worker_detector
+    _worker_detector = IntentDetector()
+
+
+def _detect_batch(queries: List[tuple[str, Optional[List[str]]]]) -> List[IntentResponse]:
+    """Detect a batch of queries in a worker process."""
+    return _worker_detector.detect_intents(queries)
+
+
+class NLPService:
+    """
+    Runs intent detection in worker processes.
+    
+    spaCy parsing is CPU-bound and holds the GIL, so in the request process it
+    stalls every other request. Here each worker process loads the model once,
+    and a dispatcher thread groups queued queries into batches (up to
+    ``batch_size`` queries, waiting at most ``batch_wait_ms`` for a batch to
+    fill) that workers parse together with ``nlp.pipe``. At most one batch per
+    worker is in flight, so under load queries accumulate into larger batches.
+    
+    If a worker process dies, the pool is replaced and the batches it was
+    running are retried once on the new pool.
+    """
+    
+    def __init__(self, processes: int, batch_size: int = 32, batch_wait_ms: float = 2.0):
+        self.processes = processes
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self._pool = self._new_pool()
+        self._pool_lock = threading.Lock()
+        self._slots = threading.Semaphore(processes)
+        self._queue: queue.Queue = queue.Queue()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="nlp-dispatcher", daemon=True)
+        self._dispatcher.start()
+    
+    def submit(self, user_query: str, product_ids: Optional[List[str]] = None) -> Future:
+        """
+        Queue a query for detection.
+        
+        Returns:
+            Future resolving to the IntentResponse
+        """
+        future: Future = Future()
+        self._queue.put((user_query, product_ids, future))
+        return future
+    
+    async def detect_intent(self, user_query: str, product_ids: Optional[List[str]] = None) -> IntentResponse:
+        """Detect intent without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(user_query, product_ids))
+    
+    def warm_up(self):
+        """Start every worker process and load its model."""
+        futures = [self._pool.submit(_detect_batch, []) for _ in range(self.processes)]
+        for future in futures:
+            future.result()
+    
+    def shutdown(self):
+        """Stop the dispatcher and the worker processes."""
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._pool.shutdown()
+    
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Spawn rather than fork: the server process runs threads
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+    
+    def _replace_pool(self, broken: ProcessPoolExecutor):
+        """Swap a broken pool for a new one (once, however many batches notice)."""
+        with self._pool_lock:
+            if self._pool is not broken:
+                return
+            self._pool = self._new_pool()
+        broken.shutdown(wait=False)
+    
+    def _dispatch(self):
+        """Collect queued queries into batches and hand them to free workers."""
+        while True:
+            self._slots.acquire()
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            
+            queries = [(user_query, product_ids) for user_query, product_ids, _ in batch]
+            self._submit(queries, [future for _, _, future in batch], retries=1)
+    
+    def _submit(self, queries: List[tuple], futures: List[Future], retries: int):
+        """Hand a batch to the pool (its worker slot is already held)."""
+        pool = self._pool
+        try:
+            result = pool.submit(_detect_batch, queries)
+        except BrokenProcessPool as e:
+            self._replace_pool(pool)
+            if retries > 0:
+                self._submit(queries, futures, retries - 1)
+            else:
+                self._fail(futures, e)
+            return
+        except Exception as e:
+            self._fail(futures, e)
+            return
+        result.add_done_callback(lambda done: self._resolve(done, pool, queries, futures, retries))
+    
+    def _resolve(self, done: Future, pool: ProcessPoolExecutor, queries: List[tuple], futures: List[Future], retries: int):
+        """Pass a batch's results (or its error) to the waiting callers."""
+        error = done.exception()
+        if isinstance(error, BrokenProcessPool):
+            # A worker died mid-batch; later batches go to a new pool
+            self._replace_pool(pool)
+            if retries > 0:
+                self._submit(queries, futures, retries - 1)
+                return
+        if error is not None:
+            self._fail(futures, error)
+            return
+        self._slots.release()
+        for future, intent_response in zip(futures, done.result()):
+            future.set_result(intent_response)
+    
+    def _fail(self, futures: List[Future], error: BaseException):
+        self._slots.release()
+        for future in futures:
+            future.set_exception(error)
+
+
+_service: Optional[NLPService] = None
+_service_lock = threading.Lock()
+
+
+def get_nlp_service() -> Optional[NLPService]:
+    """
+    Return the shared service, starting it on first use.
+    
+    Returns:
+        The service, or None if ``NLP_PROCESSES`` is 0 (detect in-process)
+    """
+    global _service
+    if settings.nlp_processes <= 0:
+        return None
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = NLPService(settings.nlp_processes, settings.nlp_batch_size, settings.nlp_batch_wait_ms)
+    return _service
+
+
+def shutdown_nlp_service():
+    """Stop the shared service if it was started."""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
+            _service = None
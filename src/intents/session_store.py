@@ -0,0 +1,275 @@
+"""In-memory conversation sessions for follow-up questions."""
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable
+from src.config import settings
+from src.data.catalog_snapshot import product_generation
+import sys
+import threading
+import time
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a value of dicts, lists, tuples, sets and scalars."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class ConversationSession:
+    """
+    State carried from one request of a conversation to the next.
+    
+    Holds the resolved product set, the product attributes loaded so far
+    (with the names requested per product, so absent attributes are not
+    fetched again), the previous intent and plan, and the last question and
+    explanation turns for the explanation prompt. A product's attributes are
+    reloaded once the change log records a write to it.
+    """
+    
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.product_ids: List[str] = []
+        self.attributes: Dict[str, Dict[str, Any]] = {}
+        self.loaded: Dict[str, set] = {}
+        # Product generation (change log seq) each product's attributes were loaded at
+        self.generations: Dict[str, int] = {}
+        self.intent_type: Optional[str] = None
+        self.plan: Optional[tuple] = None
+        self.history: List[Dict[str, str]] = []
+        self.last_access = time.monotonic()
+        self.nbytes = 0
+        self._lock = threading.Lock()
+    
+    def get_attributes(
+        self,
+        product_ids: List[str],
+        attribute_names: List[str],
+        load: Callable[[List[str], List[str]], Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Attributes of products, loading only what this session has not loaded yet.
+        
+        Args:
+            product_ids: Products to return
+            attribute_names: Attributes to return
+            load: Fetches (product_ids, attribute_names) from the database
+        
+        Returns:
+            Dict mapping each product_id to its requested attributes, like
+            ProductService.get_products_attributes
+        """
+        names = set(attribute_names)
+        with self._lock:
+            for product_id in product_ids:
+                if product_id in self.loaded and self.generations.get(product_id) != product_generation(product_id):
+                    # The product changed since its attributes were loaded
+                    self._forget(product_id)
+            missing_products = [
+                product_id for product_id in product_ids if not names <= self.loaded.get(product_id, set())
+            ]
+            missing_names = [
+                name for name in attribute_names
+                if any(name not in self.loaded.get(product_id, ()) for product_id in missing_products)
+            ]
+            # Read before loading: a write during the load makes the next call reload
+            generations = {product_id: product_generation(product_id) for product_id in missing_products}
+        
+        if missing_products:
+            fetched = load(missing_products, missing_names)
+            with self._lock:
+                for product_id in missing_products:
+                    if product_id in self.loaded:
+                        generations[product_id] = min(generations[product_id], self.generations[product_id])
+                    self.generations[product_id] = generations[product_id]
+                    self.attributes.setdefault(product_id, {}).update(fetched.get(product_id, {}))
+                    self.loaded.setdefault(product_id, set()).update(missing_names)
+        
+        with self._lock:
+            return {
+                product_id: {
+                    name: value for name, value in self.attributes.get(product_id, {}).items() if name in names
+                }
+                for product_id in product_ids
+            }
+    
+    def remember_view(self, product_ids: List[str], intent_type: str, plan: tuple) -> None:
+        """Record the products and plan of the latest request."""
+        with self._lock:
+            if product_ids:
+                self.product_ids = list(product_ids)
+            self.intent_type = intent_type
+            self.plan = (list(plan[0]), list(plan[1]))
+    
+    def remember_turn(self, user_query: str, intent_type: str, explanation: str) -> None:
+        """Record a question and its explanation, keeping the last SESSION_HISTORY_TURNS."""
+        with self._lock:
+            self.history.append({"user_query": user_query, "intent": intent_type, "explanation": explanation})
+            excess = len(self.history) - settings.session_history_turns
+            if excess > 0:
+                del self.history[:excess]
+    
+    def conversation(self) -> List[Dict[str, str]]:
+        """Earlier turns, oldest first."""
+        with self._lock:
+            return [dict(turn) for turn in self.history]
+    
+    def trim(self, max_bytes: int) -> int:
+        """
+        Shrink the session to at most ``max_bytes`` and return its size.
+        
+        Drops the oldest turns first, then attributes of products outside the
+        current product set, then all loaded attributes.
+        """
+        with self._lock:
+            nbytes = self._size()
+            while nbytes > max_bytes and self.history:
+                self.history.pop(0)
+                nbytes = self._size()
+            if nbytes > max_bytes:
+                current = set(self.product_ids)
+                for product_id in [product_id for product_id in self.attributes if product_id not in current]:
+                    self._forget(product_id)
+                nbytes = self._size()
+            if nbytes > max_bytes:
+                self.attributes.clear()
+                self.loaded.clear()
+                self.generations.clear()
+                nbytes = self._size()
+            self.nbytes = nbytes
+            return nbytes
+    
+    def _forget(self, product_id: str) -> None:
+        self.attributes.pop(product_id, None)
+        self.loaded.pop(product_id, None)
+        self.generations.pop(product_id, None)
+    
+    def _size(self) -> int:
+        return estimate_size([self.product_ids, self.attributes, self.loaded, self.plan, self.history])
+
+
+class SessionStore:
+    """
+    Bounded in-memory store of conversation sessions.
+    
+    Sessions expire ``ttl_seconds`` after their last use. Each session is
+    trimmed to ``max_session_bytes``; when there are more than ``max_sessions``
+    sessions or they hold more than ``max_total_bytes`` together, the least
+    recently used ones are evicted.
+    """
+    
+    def __init__(self, ttl_seconds: float, max_sessions: int, max_session_bytes: int, max_total_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_session_bytes = max_session_bytes
+        self.max_total_bytes = max_total_bytes
+        self._sessions: OrderedDict = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, session_id: str) -> Optional[ConversationSession]:
+        """Return a live session, or None."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_access = now
+                self._sessions.move_to_end(session_id)
+            return session
+    
+    def get_or_create(self, session_id: str) -> ConversationSession:
+        """Return the session, starting a new one if it does not exist or expired."""
+        session = self.get(session_id)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = ConversationSession(session_id)
+                self._sessions[session_id] = session
+                self._evict()
+            return session
+    
+    def save(self, session: ConversationSession) -> None:
+        """Account for a session's new size, trimming it and evicting other sessions as needed."""
+        with self._lock:
+            if self._sessions.get(session.session_id) is not session:
+                # Evicted or replaced while the request ran
+                return
+            nbytes = session.nbytes
+            self._total_bytes += session.trim(self.max_session_bytes) - nbytes
+            self._evict()
+    
+    def delete(self, session_id: str) -> bool:
+        """End a session; returns whether it existed."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self._total_bytes -= session.nbytes
+            return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Number of sessions and the memory they hold."""
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._total_bytes,
+                "max_sessions": self.max_sessions,
+                "max_total_bytes": self.max_total_bytes
+            }
+    
+    def _expire(self, now: float) -> None:
+        """Drop expired sessions; they are at the least recently used end."""
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access < self.ttl_seconds:
+                break
+            self._drop_oldest()
+    
+    def _evict(self) -> None:
+        """Drop least recently used sessions until the store is within its caps."""
+        while len(self._sessions) > self.max_sessions or (self._total_bytes > self.max_total_bytes and len(self._sessions) > 1):
+            self._drop_oldest()
+    
+    def _drop_oldest(self) -> None:
+        _, session = self._sessions.popitem(last=False)
+        self._total_bytes -= session.nbytes
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """
+    Return the process-wide session store.
+    
+    Returns:
+        The store, or None if SESSION_MAX_COUNT is 0
+    """
+    global _store
+    if settings.session_max_count <= 0:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore(
+                    settings.session_ttl_seconds,
+                    settings.session_max_count,
+                    settings.session_max_bytes,
+                    settings.session_max_total_bytes
+                )
+    return _store
+
+
+def open_session(session_id: Optional[str]) -> Optional[ConversationSession]:
+    """The session a request belongs to, or None without a session ID or store."""
+    store = get_session_store()
+    if session_id is None or store is None:
+        return None
+    return store.get_or_create(session_id)
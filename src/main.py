@@ -1,13 +1,24 @@
 """FastAPI application entry point."""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.database import engine, Base
+from fastapi.staticfiles import StaticFiles
+from src.database import engine, Base, SessionLocal
 from src.api.routes import router
 from src.config import settings
+from src.data.readiness import backfill_readiness
+from src.data.change_log import backfill_change_log
+from src.intents.nlp_service import get_nlp_service, shutdown_nlp_service
+import os
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Compute readiness masks for products created before they were tracked, and
+# log them for delta sync if the change log is new
+with SessionLocal() as db:
+    backfill_readiness(db)
+    backfill_change_log(db)
+
 # Create FastAPI app
 app = FastAPI(
     title="Akari Phase 3 - Product Decision Support System",
@@ -27,6 +38,24 @@ app.add_middleware(
 # Include routers
 app.include_router(router, prefix="/api/v1", tags=["api"])
 
+# Serve precomputed image derivatives (see scripts/build_image_derivatives.py)
+os.makedirs(settings.derivative_cache_dir, exist_ok=True)
+app.mount(settings.derivative_url_prefix, StaticFiles(directory=settings.derivative_cache_dir), name="derivatives")
+
+
+@app.on_event("startup")
+async def start_nlp_service():
+    """Start the NLP worker processes (if enabled) before serving requests."""
+    service = get_nlp_service()
+    if service is not None:
+        service.warm_up()
+
+
+@app.on_event("shutdown")
+async def stop_nlp_service():
+    """Stop the NLP worker processes."""
+    shutdown_nlp_service()
+
 
 @app.get("/")
 async def root():
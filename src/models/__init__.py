@@ -1,6 +1,6 @@
 """Database models."""
-from src.models.product import Product, ProductAttribute, VisualAsset
+from src.models.product import Product, ProductAttribute, VisualAsset, ReadinessVocabulary, ProductReadiness, CatalogChange
 from src.database import Base
 
-__all__ = ["Product", "ProductAttribute", "VisualAsset", "Base"]
+__all__ = ["Product", "ProductAttribute", "VisualAsset", "ReadinessVocabulary", "ProductReadiness", "CatalogChange", "Base"]
 
@@ -1,5 +1,5 @@
 """Product data models."""
-from sqlalchemy import Column, Integer, String, Float, Boolean, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, JSON, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 
@@ -13,9 +13,14 @@ class Product(Base):
     name = Column(String, nullable=False)
     category = Column(String, nullable=True)
     
-    # Relationships
-    attributes = relationship("ProductAttribute", back_populates="product", cascade="all, delete-orphan")
-    visual_assets = relationship("VisualAsset", back_populates="product", cascade="all, delete-orphan")
+    # Relationships (attributes and assets in insertion order, as ProductService projections return them)
+    attributes = relationship(
+        "ProductAttribute", back_populates="product", cascade="all, delete-orphan", order_by="ProductAttribute.id"
+    )
+    visual_assets = relationship(
+        "VisualAsset", back_populates="product", cascade="all, delete-orphan", order_by="VisualAsset.id"
+    )
+    readiness = relationship("ProductReadiness", back_populates="product", uselist=False, cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Product(id={self.id}, name='{self.name}')>"
@@ -24,6 +29,10 @@ class Product(Base):
 class ProductAttribute(Base):
     """Product attribute model."""
     __tablename__ = "product_attributes"
+    __table_args__ = (
+        # Serves per-product lookups and attribute coverage aggregates
+        Index("ix_product_attributes_product_id_attribute_name", "product_id", "attribute_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -56,3 +65,52 @@ class VisualAsset(Base):
     def __repr__(self):
         return f"<VisualAsset(type='{self.asset_type}', url='{self.asset_url}')>"
 
+
+
+class ReadinessVocabulary(Base):
+    """Interned asset type or attribute name and its bit in readiness masks."""
+    __tablename__ = "readiness_vocabulary"
+    __table_args__ = (
+        UniqueConstraint("kind", "name"),
+        UniqueConstraint("kind", "bit"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # 'asset_type' or 'attribute'
+    name = Column(String, nullable=False)
+    bit = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<ReadinessVocabulary(kind='{self.kind}', name='{self.name}', bit={self.bit})>"
+
+
+class ProductReadiness(Base):
+    """Per-product bitmasks of the asset types and attributes a product has."""
+    __tablename__ = "product_readiness"
+    
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    asset_mask = Column(Text, nullable=False, default="0")  # Hex bitmask over asset_type bits
+    attribute_mask = Column(Text, nullable=False, default="0")  # Hex bitmask over attribute bits
+    
+    # Relationships
+    product = relationship("Product", back_populates="readiness")
+    
+    def __repr__(self):
+        return f"<ProductReadiness(product_id={self.product_id})>"
+
+
+class CatalogChange(Base):
+    """Latest logged change of a product, read by delta sync clients."""
+    __tablename__ = "catalog_changes"
+    __table_args__ = (
+        Index("ix_catalog_changes_product_id", "product_id"),
+        # Sequence numbers are generations clients sync from; never reuse them
+        {"sqlite_autoincrement": True},
+    )
+    
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    product_id = Column(String, nullable=False)  # Public product ID (outlives a deleted product)
+    change = Column(String, nullable=False)  # 'upsert' or 'delete'
+    
+    def __repr__(self):
+        return f"<CatalogChange(seq={self.seq}, product_id='{self.product_id}', change='{self.change}')>"
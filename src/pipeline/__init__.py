@@ -0,0 +1,4 @@
+"""Stage pipelines for the intent flows."""
+from src.pipeline.executor import Stage, StageTiming, Pipeline, PipelineRun, get_stage_executor, run_blocking
+
+__all__ = ["Stage", "StageTiming", "Pipeline", "PipelineRun", "get_stage_executor", "run_blocking"]
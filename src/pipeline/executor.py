@@ -0,0 +1,234 @@
+"""Stage DAG executor for the intent pipelines."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Iterable, NamedTuple
+from src.config import settings
+import asyncio
+import inspect
+import time
+
+# Shared pool for blocking stages
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_stage_executor() -> ThreadPoolExecutor:
+    """Return the thread pool blocking stages run on, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.pipeline_workers, thread_name_prefix="pipeline")
+    return _executor
+
+
+async def run_blocking(func: Callable, *args) -> Any:
+    """
+    Run a blocking function on the stage executor.
+    
+    If the awaiting task is cancelled, the function is waited for before the
+    cancellation propagates: its thread cannot be interrupted, and it may
+    still be using resources the caller releases next (e.g. the request's
+    database session, which ``get_db`` closes).
+    """
+    future = asyncio.get_running_loop().run_in_executor(get_stage_executor(), func, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            try:
+                await asyncio.wait({future})
+            except asyncio.CancelledError:
+                pass
+        if not future.cancelled():
+            future.exception()
+        raise
+
+
+class Stage(NamedTuple):
+    """
+    One step of a pipeline.
+    
+    ``func`` receives the results dict (initial inputs plus the results of
+    finished stages, keyed by stage name) and returns this stage's result.
+    Coroutine functions run on the event loop, as do plain functions marked
+    ``blocking=False`` (cheap glue that is not worth a thread hop); other
+    plain functions run on the stage thread pool. Stages naming the same
+    resource never run at the same time (e.g. "db" for stages sharing one
+    SQLAlchemy session). A stage whose ``when`` predicate is false is skipped
+    and its result is None.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: tuple = ()
+    resources: tuple = ()
+    when: Optional[Callable[[Dict[str, Any]], bool]] = None
+    blocking: bool = True
+
+
+class StageTiming(NamedTuple):
+    """When a stage ran, in seconds from the start of the run."""
+    start: float
+    end: float
+    status: str  # 'done', 'provided', 'skipped', 'failed' or 'cancelled'
+    
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class PipelineRun(NamedTuple):
+    """Results and per-stage timings of one pipeline run."""
+    results: Dict[str, Any]
+    timings: Dict[str, StageTiming]
+    elapsed: float
+    
+    def server_timing(self) -> str:
+        """Stage durations as a Server-Timing header value."""
+        entries = [
+            f"{name};dur={timing.duration * 1000:.1f}"
+            for name, timing in self.timings.items() if timing.status == "done"
+        ]
+        entries.append(f"total;dur={self.elapsed * 1000:.1f}")
+        return ", ".join(entries)
+
+
+class Pipeline:
+    """
+    A DAG of stages.
+    
+    ``run`` starts every stage as soon as its dependencies have finished, so
+    independent stages overlap. If a stage fails or the run itself is
+    cancelled, the stages still pending are cancelled and the error
+    propagates once blocking stages already running on a thread have
+    returned (see ``run_blocking``); their results are discarded. ``run_sequential`` executes the
+    same stages one at a time in dependency order in the calling thread.
+    
+    A stage whose result is already among the inputs (e.g. computed for
+    several runs at once) is not run; its dependents use the given value.
+    """
+    
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages = list(stages)
+        self._order = self._topological_order(self.stages)
+    
+    @staticmethod
+    def _topological_order(stages: List[Stage]) -> List[Stage]:
+        """
+        Order stages so that every stage follows its dependencies.
+        
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles
+        """
+        by_name = {}
+        for stage in stages:
+            if stage.name in by_name:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            by_name[stage.name] = stage
+        
+        order = []
+        state: Dict[str, str] = {}
+        
+        def visit(stage: Stage, path: tuple):
+            if state.get(stage.name) == "done":
+                return
+            if state.get(stage.name) == "visiting":
+                raise ValueError(f"Stage dependency cycle: {' -> '.join(path + (stage.name,))}")
+            state[stage.name] = "visiting"
+            for dependency in stage.depends_on:
+                if dependency not in by_name:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+                visit(by_name[dependency], path + (stage.name,))
+            state[stage.name] = "done"
+            order.append(stage)
+        
+        for stage in stages:
+            visit(stage, ())
+        return order
+    
+    async def run(self, inputs: Optional[Dict[str, Any]] = None) -> PipelineRun:
+        """
+        Run the stages concurrently.
+        
+        Args:
+            inputs: Initial values visible to every stage
+        
+        Returns:
+            PipelineRun with the results of all stages
+        """
+        results = dict(inputs or {})
+        provided = set(results)
+        timings: Dict[str, StageTiming] = {}
+        locks = {resource: asyncio.Lock() for stage in self.stages for resource in stage.resources}
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def run_stage(stage: Stage):
+            if stage.name in provided:
+                timings[stage.name] = StageTiming(0.0, 0.0, "provided")
+                return
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[name] for name in stage.depends_on))
+            start = time.perf_counter() - started
+            if stage.when is not None and not stage.when(results):
+                results[stage.name] = None
+                timings[stage.name] = StageTiming(start, start, "skipped")
+                return
+            
+            # Acquire resources in a fixed order so stages cannot deadlock
+            acquired = []
+            try:
+                for resource in sorted(stage.resources):
+                    await locks[resource].acquire()
+                    acquired.append(locks[resource])
+                start = time.perf_counter() - started
+                if inspect.iscoroutinefunction(stage.func):
+                    result = await stage.func(results)
+                elif stage.blocking:
+                    result = await run_blocking(stage.func, results)
+                else:
+                    result = stage.func(results)
+            except asyncio.CancelledError:
+                timings[stage.name] = StageTiming(start, time.perf_counter() - started, "cancelled")
+                raise
+            except Exception:
+                timings[stage.name] = StageTiming(start, time.perf_counter() - started, "failed")
+                raise
+            finally:
+                for lock in reversed(acquired):
+                    lock.release()
+            results[stage.name] = result
+            timings[stage.name] = StageTiming(start, time.perf_counter() - started, "done")
+        
+        for stage in self._order:
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return PipelineRun(results, timings, time.perf_counter() - started)
+    
+    def run_sequential(self, inputs: Optional[Dict[str, Any]] = None) -> PipelineRun:
+        """
+        Run the stages one at a time in dependency order in the calling thread.
+        
+        Coroutine stages are driven to completion with ``asyncio.run``, so this
+        must not be called from a running event loop when there are any.
+        """
+        results = dict(inputs or {})
+        timings: Dict[str, StageTiming] = {}
+        started = time.perf_counter()
+        for stage in self._order:
+            start = time.perf_counter() - started
+            if stage.name in (inputs or {}):
+                timings[stage.name] = StageTiming(start, start, "provided")
+                continue
+            if stage.when is not None and not stage.when(results):
+                results[stage.name] = None
+                timings[stage.name] = StageTiming(start, start, "skipped")
+                continue
+            result = stage.func(results)
+            if inspect.iscoroutine(result):
+                result = asyncio.run(result)
+            results[stage.name] = result
+            timings[stage.name] = StageTiming(start, time.perf_counter() - started, "done")
+        return PipelineRun(results, timings, time.perf_counter() - started)
@@ -4,12 +4,22 @@ from src.schemas.product import (
     ProductResponse,
     ProductAttributeResponse,
     VisualAssetResponse,
-    ProductFullResponse
+    ProductFullResponse,
+    ProductSearchResult,
+    ProductSearchResponse,
+    ProductChange,
+    ProductChangesResponse
 )
 from src.schemas.intent import (
     IntentRequest,
     IntentResponse,
-    IntentType
+    IntentType,
+    IntentBatchQuery,
+    IntentBatchRequest,
+    IntentProcessBatchRequest,
+    IntentProcessResponse,
+    IntentProcessBatchResponse,
+    ChooseResponse
 )
 from src.schemas.visualization import (
     VisualizationRequest,
@@ -18,7 +28,8 @@ from src.schemas.visualization import (
 )
 from src.schemas.explanation import (
     ExplanationRequest,
-    ExplanationResponse
+    ExplanationResponse,
+    FullExplanationResponse
 )
 
 __all__ = [
@@ -27,13 +38,24 @@ __all__ = [
     "ProductAttributeResponse",
     "VisualAssetResponse",
     "ProductFullResponse",
+    "ProductSearchResult",
+    "ProductSearchResponse",
+    "ProductChange",
+    "ProductChangesResponse",
     "IntentRequest",
     "IntentResponse",
     "IntentType",
+    "IntentBatchQuery",
+    "IntentBatchRequest",
+    "IntentProcessBatchRequest",
+    "IntentProcessResponse",
+    "IntentProcessBatchResponse",
+    "ChooseResponse",
     "VisualizationRequest",
     "VisualizationResponse",
     "VisualEffect",
     "ExplanationRequest",
-    "ExplanationResponse"
+    "ExplanationResponse",
+    "FullExplanationResponse"
 ]
 
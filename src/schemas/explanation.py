@@ -1,6 +1,8 @@
 """Explanation-related Pydantic schemas."""
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+from src.schemas.intent import IntentResponse
+from src.schemas.visualization import VisualizationResponse
 
 
 class ExplanationRequest(BaseModel):
@@ -10,6 +12,9 @@ class ExplanationRequest(BaseModel):
     visual_effects_applied: List[str]
     products: List[str]
     user_query: Optional[str] = None
+    conversation: Optional[List[Dict[str, str]]] = Field(
+        None, description="Earlier turns of the conversation ('user_query', 'intent', 'explanation'), oldest first"
+    )
 
 
 class ExplanationResponse(BaseModel):
@@ -18,3 +23,9 @@ class ExplanationResponse(BaseModel):
     confidence: Optional[float] = None
     source_data_verified: bool = True
 
+
+class FullExplanationResponse(BaseModel):
+    """Complete flow response: intent, visualization and explanation."""
+    intent: IntentResponse
+    visualization: VisualizationResponse
+    explanation: ExplanationResponse
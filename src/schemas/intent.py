@@ -1,7 +1,8 @@
 """Intent-related Pydantic schemas."""
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from enum import Enum
+from src.schemas.visualization import VisualizationResponse
 
 
 class IntentType(str, Enum):
@@ -18,6 +19,41 @@ class IntentRequest(BaseModel):
     user_query: str = Field(..., description="User's natural language query")
     product_ids: Optional[List[str]] = Field(None, description="Optional product IDs mentioned in query")
     context: Optional[Dict[str, Any]] = Field(None, description="Additional context")
+    top_k: Optional[int] = Field(None, ge=1, le=1000, description="Rank CHOOSE candidates and return the top k")
+    pareto_attributes: Optional[List[str]] = Field(
+        None,
+        description="Attributes for a Pareto trade-off view, optionally with a direction (e.g. ['price:min', 'battery_life:max'])"
+    )
+    batch_checks: bool = Field(
+        False,
+        description="Run the CHOOSE pre-decision checks for every product individually and return per-product results"
+    )
+    session_id: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=128,
+        description="Conversation ID; follow-up requests with the same ID reuse the products and data of earlier ones"
+    )
+
+
+class IntentBatchQuery(BaseModel):
+    """One query of a batch intent detection request."""
+    user_query: str = Field(..., description="User's natural language query")
+    product_ids: Optional[List[str]] = Field(None, description="Optional product IDs mentioned in query")
+
+
+class IntentBatchRequest(BaseModel):
+    """Batch intent detection request schema."""
+    queries: List[Union[str, IntentBatchQuery]] = Field(
+        ..., description="Queries, as plain strings or objects with product IDs"
+    )
+
+
+class IntentProcessBatchRequest(BaseModel):
+    """Batch intent processing request schema."""
+    requests: List[IntentRequest] = Field(
+        ..., min_length=1, max_length=100, description="Queries to process, e.g. one per dashboard widget"
+    )
 
 
 class IntentResponse(BaseModel):
@@ -27,3 +63,21 @@ class IntentResponse(BaseModel):
     detected_products: List[str] = Field(default_factory=list)
     extracted_context: Optional[Dict[str, Any]] = None
 
+
+class IntentProcessResponse(BaseModel):
+    """Processed intent: the detected intent and its visualization, effects applied."""
+    intent: IntentResponse
+    visualization: VisualizationResponse
+
+
+class IntentProcessBatchResponse(BaseModel):
+    """Batch intent processing response schema."""
+    results: List[IntentProcessResponse]
+
+
+class ChooseResponse(BaseModel):
+    """CHOOSE intent response with the pre-decision checks."""
+    intent: IntentResponse
+    visualization: VisualizationResponse
+    pre_decision_checks: Dict[str, Any]
+    ranking: Optional[Dict[str, Any]] = Field(None, description="Present when top_k was requested")
@@ -59,3 +59,32 @@ class ProductCreate(BaseModel):
     attributes: Dict[str, Any] = Field(default_factory=dict)
     visual_assets: Dict[str, Union[str, List[str]]] = Field(default_factory=dict)
 
+
+class ProductSearchResult(BaseModel):
+    """Single product matched by a numeric attribute search."""
+    product_id: str
+    name: str
+    category: Optional[str] = None
+    values: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ProductSearchResponse(BaseModel):
+    """Numeric attribute search response schema."""
+    total: int
+    results: List[ProductSearchResult] = []
+
+
+class ProductChange(BaseModel):
+    """Latest change of one product since the requested generation."""
+    product_id: str
+    change: str  # 'upsert' or 'delete'
+    generation: int
+    product: Optional[ProductFullResponse] = None  # Current data of an upserted product
+
+
+class ProductChangesResponse(BaseModel):
+    """Delta sync response schema."""
+    generation: int  # Pass as `since` on the next call
+    has_more: bool = False  # More changes follow; call again right away
+    reset: bool = False  # `since` is unknown (the catalog was recreated): drop the replica and apply these changes to an empty one
+    changes: List[ProductChange] = []
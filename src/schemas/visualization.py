@@ -16,6 +16,7 @@ class VisualEffect(str, Enum):
     COMPARISON_VS_LIGHTER = "comparison_vs_lighter"
     HIGHLIGHT_TRAVEL_SPECS = "highlight_travel_specs"
     DIM_IRRELEVANT_SPECS = "dim_irrelevant_specs"
+    PARETO_FRONTIER = "pareto_frontier"
 
 
 class VisualizationRequest(BaseModel):
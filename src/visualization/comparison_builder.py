@@ -0,0 +1,152 @@
+"""Vectorized attribute comparison across products."""
+from typing import List, Dict, Any
+import json
+import numpy as np
+
+
+_MISSING = object()
+
+
+def _value_key(value: Any) -> Any:
+    """Hashable key under which equal attribute values compare equal."""
+    if isinstance(value, list):
+        key = tuple(value)
+        try:
+            hash(key)
+        except TypeError:
+            # Nested lists or objects
+            return ("array", repr(value))
+        return ("array", key)
+    if isinstance(value, dict):
+        return ("json", json.dumps(value, sort_keys=True))
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return ("number", float(value))
+    return value
+
+
+def _rounded(value: float) -> float:
+    """Round a float for the response."""
+    return round(float(value), 4)
+
+
+class ComparisonBuilder:
+    """
+    Builds the comparison of several products over a set of attributes.
+    
+    The products × attributes values are read once, in a single pass, into
+    an object matrix and a matrix of their types. Column types come from
+    the type matrix, numeric columns are cast to a float matrix (NaN where
+    missing) and the other values are interned into an integer code matrix
+    (-1 where missing). Which attributes differ, and the min/max, spread,
+    deltas and bar lengths of numeric attributes, are then computed for all
+    columns at once; only the response dicts are built per attribute.
+    """
+    
+    def build(
+        self,
+        product_ids: List[str],
+        attributes: List[str],
+        products_attributes: Dict[str, Dict[str, Any]],
+        differences: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Compare products over attributes.
+        
+        Args:
+            product_ids: Products to compare, in display order
+            attributes: Attributes to compare
+            products_attributes: Dict mapping product_id to its attributes
+            differences: Whether to compute the difference details
+        
+        Returns:
+            Dict with 'values' ({attribute: {product_id: value}}, only for
+            attributes some product has) and, if differences is set,
+            'differing_attributes' and 'attributes' holding per-attribute
+            difference details
+        """
+        shape = (len(product_ids), len(attributes))
+        rows = [products_attributes.get(product_id, {}) for product_id in product_ids]
+        # Per-cell Python work is one read of each value and of its type; the
+        # rest runs on the products x attributes object and type matrices
+        flat = [row.get(attribute, _MISSING) for row in rows for attribute in attributes]
+        cells = np.fromiter(flat, dtype=object, count=len(flat)).reshape(shape)
+        types = np.fromiter(map(type, flat), dtype=object, count=len(flat)).reshape(shape)
+        
+        present = types != type(_MISSING)
+        if not differences:
+            values = {}
+            for j, attribute in enumerate(attributes):
+                held = np.flatnonzero(present[:, j])
+                if len(held):
+                    values[attribute] = dict(zip([product_ids[i] for i in held.tolist()], cells[held, j].tolist()))
+            return {"values": values}
+        
+        is_number = (types == float) | (types == int)
+        # Columns whose values are all numbers are compared as floats, the
+        # others as codes of interned values (-1 where missing)
+        numeric = (is_number | ~present).all(axis=0)
+        numbers = np.full(shape, np.nan)
+        number_cells = is_number & numeric
+        numbers[number_cells] = cells[number_cells].astype(float)
+        codes = np.full(shape, -1, dtype=np.int64)
+        codes[number_cells] = 0
+        categorical_cells = present & ~numeric
+        keys = cells[categorical_cells]
+        key_types = types[categorical_cells]
+        converted = (key_types != str) & (key_types != bool)
+        keys[converted] = np.fromiter(map(_value_key, keys[converted].tolist()), dtype=object, count=int(converted.sum()))
+        keys = keys.tolist()
+        interned = {key: code for code, key in enumerate(dict.fromkeys(keys))}
+        codes[categorical_cells] = np.fromiter(map(interned.__getitem__, keys), dtype=np.int64, count=len(keys))
+        
+        present_count = present.sum(axis=0)
+        missing = np.isnan(numbers)
+        low = np.where(missing, np.inf, numbers).min(axis=0, initial=np.inf)
+        high = np.where(missing, -np.inf, numbers).max(axis=0, initial=-np.inf)
+        highest_code = codes.max(axis=0, initial=-1)
+        lowest_code = np.where(present, codes, np.iinfo(np.int64).max).min(axis=0, initial=np.iinfo(np.int64).max)
+        # Values differ if two products disagree or only some products have one
+        disagree = np.where(numeric, low != high, highest_code != lowest_code)
+        differs = (present_count > 0) & (disagree | (present_count < len(product_ids)))
+        min_row = np.where(missing, np.inf, numbers).argmin(axis=0) if len(product_ids) else low
+        max_row = np.where(missing, -np.inf, numbers).argmax(axis=0) if len(product_ids) else high
+        with np.errstate(invalid="ignore", divide="ignore"):
+            spread = high - low
+            mean = np.where(missing, 0.0, numbers).sum(axis=0) / np.maximum((~missing).sum(axis=0), 1)
+            relative_spread = np.where(mean != 0, spread / np.abs(mean), 0.0)
+            deltas = numbers - low
+            bars = np.where(spread > 0, deltas / spread, 1.0)
+        deltas = np.round(deltas, 4)
+        bars = np.round(bars, 4)
+        
+        values: Dict[str, Dict[str, Any]] = {}
+        details: Dict[str, Dict[str, Any]] = {}
+        for j, attribute in enumerate(attributes):
+            if not present_count[j]:
+                continue
+            held = np.flatnonzero(present[:, j])
+            held_ids = [product_ids[i] for i in held.tolist()]
+            values[attribute] = dict(zip(held_ids, cells[held, j].tolist()))
+            detail = {
+                "type": "numeric" if numeric[j] else "categorical",
+                "differs": bool(differs[j]),
+                "missing_products": [product_ids[i] for i in np.flatnonzero(~present[:, j]).tolist()]
+            }
+            if numeric[j]:
+                detail.update({
+                    "min": _rounded(low[j]),
+                    "max": _rounded(high[j]),
+                    "min_product": product_ids[min_row[j]],
+                    "max_product": product_ids[max_row[j]],
+                    "spread": _rounded(spread[j]),
+                    "relative_spread": _rounded(relative_spread[j]),
+                    "deltas": dict(zip(held_ids, deltas[held, j].tolist())),
+                    "bars": dict(zip(held_ids, bars[held, j].tolist()))
+                })
+            details[attribute] = detail
+        
+        return {
+            "values": values,
+            "differing_attributes": [a for j, a in enumerate(attributes) if differs[j]],
+            "attributes": details
+        }
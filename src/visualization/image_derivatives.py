@@ -0,0 +1,280 @@
+"""Precomputed image derivatives (thumbnails, zoom crops, WebP) for local visual assets."""
+from typing import List, Dict, Any, Optional, Tuple, NamedTuple
+from concurrent.futures import ProcessPoolExecutor
+from src.config import settings
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+
+# Optional Pillow import - without it no derivatives are generated and effects
+# fall back to the original asset URLs
+PIL_AVAILABLE = False
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+THUMBNAIL_SIZE = (320, 320)
+DISPLAY_SIZE = (1280, 1280)
+ZOOM_WIDTH = 800
+WEBP_QUALITY = 80
+
+
+class DerivativeSpec(NamedTuple):
+    """One derivative of a source image."""
+    name: str
+    width: int
+    height: int
+    box: Optional[Tuple[float, float, float, float]] = None
+    format: str = "webp"
+    quality: int = WEBP_QUALITY
+    
+    def cache_key(self, source_digest: str) -> str:
+        """Content address of this derivative of a source with the given digest."""
+        recipe = f"{source_digest}:{self.width}x{self.height}:{self.box}:{self.format}:{self.quality}"
+        return hashlib.sha256(recipe.encode("utf-8")).hexdigest()
+
+
+def plan_derivatives(asset_metadata: Optional[Dict[str, Any]]) -> List[DerivativeSpec]:
+    """
+    Derivatives to produce for one asset.
+    
+    Every asset gets a thumbnail and a display-size WebP variant. Each entry of
+    ``asset_metadata["bounding_boxes"]`` ({target: [x0, y0, x1, y1]}, as
+    fractions of the image size or in pixels) becomes a zoom crop named
+    ``crop:<target>``.
+    """
+    specs = [
+        DerivativeSpec("thumbnail", *THUMBNAIL_SIZE),
+        DerivativeSpec("webp", *DISPLAY_SIZE)
+    ]
+    for target, box in ((asset_metadata or {}).get("bounding_boxes") or {}).items():
+        if isinstance(box, (list, tuple)) and len(box) == 4:
+            specs.append(DerivativeSpec(f"crop:{target}", ZOOM_WIDTH, 0, tuple(float(v) for v in box)))
+    return specs
+
+
+def resolve_local_path(asset_url: str, asset_root: Optional[str] = None) -> Optional[str]:
+    """
+    Map an asset URL to a file under the local asset root.
+    
+    Returns None for remote URLs, paths escaping the root and missing files.
+    """
+    if "://" in asset_url:
+        return None
+    root = os.path.abspath(asset_root or settings.asset_root)
+    path = os.path.abspath(os.path.join(root, asset_url.lstrip("/")))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        return None
+    return path
+
+
+def render_derivative(image: "Image.Image", spec: DerivativeSpec) -> bytes:
+    """Render one derivative of an opened image."""
+    if spec.box is not None:
+        x0, y0, x1, y1 = spec.box
+        if max(spec.box) <= 1.0:
+            x0, x1 = x0 * image.width, x1 * image.width
+            y0, y1 = y0 * image.height, y1 * image.height
+        image = image.crop((int(x0), int(y0), int(x1), int(y1)))
+    if spec.width or spec.height:
+        image = image.copy()
+        image.thumbnail((spec.width or image.width, spec.height or image.height))
+    if spec.format == "jpeg" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    
+    buffer = io.BytesIO()
+    image.save(buffer, format=spec.format.upper(), quality=spec.quality)
+    return buffer.getvalue()
+
+
+class DerivativeCache:
+    """Content-addressed store of derivative files under one directory."""
+    
+    def __init__(self, root: Optional[str] = None, url_prefix: Optional[str] = None):
+        self.root = root or settings.derivative_cache_dir
+        self.url_prefix = (url_prefix or settings.derivative_url_prefix).rstrip("/")
+    
+    def relative_path(self, key: str, spec: DerivativeSpec) -> str:
+        """Path of a derivative relative to the cache root."""
+        return f"{key[:2]}/{key}.{spec.format}"
+    
+    def url(self, relative_path: str) -> str:
+        """Public URL of a cached derivative."""
+        return f"{self.url_prefix}/{relative_path}"
+    
+    def contains(self, relative_path: str) -> bool:
+        """Whether the derivative is already cached."""
+        return os.path.exists(os.path.join(self.root, relative_path))
+    
+    def write(self, relative_path: str, content: bytes) -> None:
+        """Write a derivative atomically so readers never see partial files."""
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(content)
+        os.replace(temporary, path)
+    
+    def manifest_path(self) -> str:
+        """Location of the manifest mapping products to derivative URLs."""
+        return os.path.join(self.root, MANIFEST_NAME)
+
+
+def generate_derivatives(
+    source_path: str,
+    specs: List[DerivativeSpec],
+    cache_root: str
+) -> Dict[str, str]:
+    """
+    Produce the missing derivatives of one source image.
+    
+    Runs in worker processes, so it takes plain arguments. The source is
+    hashed once; derivatives already in the cache are not re-rendered.
+    
+    Returns:
+        Dict mapping spec name to the derivative path relative to the cache root
+    """
+    cache = DerivativeCache(cache_root)
+    with open(source_path, "rb") as handle:
+        content = handle.read()
+    digest = hashlib.sha256(content).hexdigest()
+    
+    paths = {spec.name: cache.relative_path(spec.cache_key(digest), spec) for spec in specs}
+    missing = [spec for spec in specs if not cache.contains(paths[spec.name])]
+    if missing:
+        with Image.open(io.BytesIO(content)) as image:
+            image = ImageOps.exif_transpose(image)
+            image.load()
+            for spec in missing:
+                cache.write(paths[spec.name], render_derivative(image, spec))
+    return paths
+
+
+def build_derivatives(
+    assets: List[Dict[str, Any]],
+    workers: int = 4,
+    cache: Optional[DerivativeCache] = None,
+    asset_root: Optional[str] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate derivatives for many assets with a process pool and write the manifest.
+    
+    Assets whose image cannot be read or rendered are logged and left out of
+    the manifest; the others are still processed.
+    
+    Args:
+        assets: Dicts with product_id, asset_type, asset_url and asset_metadata
+        workers: Worker processes
+        cache: Derivative cache (defaults to the configured directory)
+        asset_root: Directory local asset URLs are resolved against
+    
+    Returns:
+        The manifest: {product_id: [{asset_type, asset_url, thumbnail, webp, crops}]}
+    
+    Raises:
+        RuntimeError: If Pillow is not installed
+    """
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Pillow is required to generate image derivatives (pip install Pillow)")
+    cache = cache or DerivativeCache()
+    
+    jobs = []
+    for asset in assets:
+        source_path = resolve_local_path(asset["asset_url"], asset_root)
+        if source_path is not None:
+            jobs.append((asset, source_path, plan_derivatives(asset.get("asset_metadata"))))
+    
+    manifest: Dict[str, List[Dict[str, Any]]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate_derivatives, path, specs, cache.root) for _, path, specs in jobs]
+        for (asset, _, _), future in zip(jobs, futures):
+            try:
+                paths = future.result()
+            except Exception as e:
+                logger.warning(
+                    "Skipping %s asset %s of product %s: %s",
+                    asset["asset_type"], asset["asset_url"], asset["product_id"], e
+                )
+                continue
+            manifest.setdefault(asset["product_id"], []).append({
+                "asset_type": asset["asset_type"],
+                "asset_url": asset["asset_url"],
+                "thumbnail": cache.url(paths["thumbnail"]),
+                "webp": cache.url(paths["webp"]),
+                "crops": {
+                    name.split(":", 1)[1]: cache.url(path)
+                    for name, path in paths.items() if name.startswith("crop:")
+                }
+            })
+    
+    os.makedirs(cache.root, exist_ok=True)
+    # Replace the manifest atomically so servers never load a partial one
+    temporary = f"{cache.manifest_path()}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle)
+    os.replace(temporary, cache.manifest_path())
+    reset_derivative_manifest()
+    return manifest
+
+
+_manifest: Dict[str, List[Dict[str, Any]]] = {}
+# (inode, mtime_ns, size) of the manifest file last loaded; None if there was none
+_manifest_signature: Optional[Tuple[int, int, int]] = None
+_manifest_loaded = False
+_manifest_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def get_derivative_manifest() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return the derivative manifest, reloading it when the file changes.
+    
+    The build script may run while servers are up, so each call compares
+    the manifest's inode, modification time and size with those of the
+    loaded one. Empty if no manifest has been built.
+    """
+    global _manifest, _manifest_signature, _manifest_loaded
+    path = DerivativeCache().manifest_path()
+    signature = _file_signature(path)
+    if not _manifest_loaded or signature != _manifest_signature:
+        with _manifest_lock:
+            if not _manifest_loaded or signature != _manifest_signature:
+                manifest = {}
+                if signature is not None:
+                    try:
+                        with open(path, encoding="utf-8") as handle:
+                            manifest = json.load(handle)
+                    except (OSError, ValueError):
+                        manifest = _manifest
+                _manifest, _manifest_signature, _manifest_loaded = manifest, signature, True
+    return _manifest
+
+
+def reset_derivative_manifest() -> None:
+    """Drop the loaded manifest so the next lookup re-reads it."""
+    global _manifest_loaded
+    with _manifest_lock:
+        _manifest_loaded = False
+
+
+def derivatives_for_products(product_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Manifest entries of the given products that have derivatives."""
+    manifest = get_derivative_manifest()
+    return {product_id: manifest[product_id] for product_id in product_ids if product_id in manifest}
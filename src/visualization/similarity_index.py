@@ -0,0 +1,285 @@
+"""Per-category nearest-neighbour index for finding comparable reference products."""
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import heapq
+import threading
+import numpy as np
+
+
+# Weight attributes used for "lighter" comparisons, in order of preference
+WEIGHT_ATTRIBUTES = ("weight", "weight_g")
+
+
+class SimilarityIndex:
+    """
+    KD-tree over the normalized numeric attributes of one product category.
+    
+    Attributes held by at least ``MIN_COVERAGE`` of the category become
+    dimensions; values are min-max normalized per dimension and missing
+    values are filled with the column median for distance purposes. Each
+    tree node keeps two bounding boxes: one over the filled points to bound
+    distances, and one over the raw values to prune subtrees that cannot
+    satisfy a "strictly better on attribute X" constraint.
+    """
+    
+    LEAF_SIZE = 128
+    MIN_COVERAGE = 0.5
+    RESULT_CACHE_SIZE = 4096
+    
+    def __init__(self, positions: np.ndarray, attributes: List[str], raw: np.ndarray):
+        """
+        Args:
+            positions: Snapshot positions of the category's products
+            attributes: Dimension names
+            raw: Normalized values of shape (products, attributes), NaN if missing
+        """
+        self.attributes = attributes
+        self._dimension = {attribute: j for j, attribute in enumerate(attributes)}
+        # LRU of search results; the index is shared by request threads
+        self._results: OrderedDict = OrderedDict()
+        self._results_lock = threading.Lock()
+        
+        filled = np.where(np.isnan(raw), np.nanmedian(raw, axis=0) if len(raw) else 0.0, raw)
+        filled = np.nan_to_num(filled, nan=0.0)
+        self._build(positions, raw, filled)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, category: Optional[str]) -> "SimilarityIndex":
+        """Build the index for one category of a catalog snapshot."""
+        in_category = np.array([c == category for c in snapshot.categories], dtype=bool)
+        positions = np.flatnonzero(in_category)
+        row_of = np.full(len(snapshot), -1, dtype=np.int64)
+        row_of[positions] = np.arange(len(positions))
+        
+        attributes, columns = [], []
+        for attribute in snapshot.numeric_index.attributes():
+            values, indexed_positions = snapshot.numeric_index.columns[attribute]
+            rows = row_of[indexed_positions]
+            held = rows >= 0
+            if not len(positions) or held.sum() < cls.MIN_COVERAGE * len(positions):
+                continue
+            column = np.full(len(positions), np.nan)
+            column[rows[held]] = values[held]
+            low, high = np.nanmin(column), np.nanmax(column)
+            attributes.append(attribute)
+            columns.append((column - low) / (high - low) if high > low else np.where(np.isnan(column), np.nan, 0.0))
+        
+        raw = np.column_stack(columns) if columns else np.empty((len(positions), 0))
+        return cls(positions, attributes, raw)
+    
+    def _build(self, positions: np.ndarray, raw: np.ndarray, filled: np.ndarray) -> None:
+        """Build the tree into flat node arrays, reordering points by leaf."""
+        order = np.arange(len(positions))
+        starts, ends, lefts, rights = [], [], [], []
+        stack = [(0, len(positions), -1, False)]
+        while stack:
+            start, end, parent, is_right = stack.pop()
+            node = len(starts)
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            if parent >= 0:
+                (rights if is_right else lefts)[parent] = node
+            
+            if end - start <= self.LEAF_SIZE or not filled.shape[1]:
+                continue
+            points = filled[order[start:end]]
+            spread = points.max(axis=0) - points.min(axis=0)
+            dim = int(spread.argmax())
+            if spread[dim] <= 0:
+                continue
+            middle = (end - start) // 2
+            split = np.argpartition(points[:, dim], middle)
+            order[start:end] = order[start:end][split]
+            stack.append((start + middle, end, node, True))
+            stack.append((start, start + middle, node, False))
+        
+        self.positions = positions[order]
+        self.raw = raw[order]
+        self.points = filled[order]
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.lefts = np.array(lefts, dtype=np.int64)
+        self.rights = np.array(rights, dtype=np.int64)
+        self.row_of_position = {int(p): i for i, p in enumerate(self.positions.tolist())}
+        
+        # Bounding boxes of each node's point range
+        nodes = len(starts)
+        dims = filled.shape[1]
+        self.low = np.empty((nodes, dims))
+        self.high = np.empty((nodes, dims))
+        self.raw_low = np.empty((nodes, dims))
+        self.raw_high = np.empty((nodes, dims))
+        with np.errstate(invalid="ignore"):
+            for node in range(nodes):
+                start, end = starts[node], ends[node]
+                if end > start:
+                    self.low[node] = self.points[start:end].min(axis=0)
+                    self.high[node] = self.points[start:end].max(axis=0)
+                    raw_slice = np.where(np.isnan(self.raw[start:end]), np.inf, self.raw[start:end])
+                    self.raw_low[node] = raw_slice.min(axis=0)
+                    raw_slice = np.where(np.isnan(self.raw[start:end]), -np.inf, self.raw[start:end])
+                    self.raw_high[node] = raw_slice.max(axis=0)
+                else:
+                    self.low[node] = self.raw_low[node] = np.inf
+                    self.high[node] = self.raw_high[node] = -np.inf
+        
+        # Traversal touches a handful of scalars per node, which plain lists
+        # serve faster than NumPy indexing
+        self._children = list(zip(lefts, rights))
+        self._boxes = list(zip(self.low.tolist(), self.high.tolist()))
+        self._raw_low = self.raw_low.tolist()
+        self._raw_high = self.raw_high.tolist()
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    def nearest_better(
+        self,
+        position: int,
+        attribute: str,
+        direction: str = "min",
+        k: int = 3
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the k nearest products strictly better on one attribute.
+        
+        Args:
+            position: Snapshot position of the reference product
+            attribute: Attribute the results must beat the reference on
+            direction: "min" if lower values are better, "max" otherwise
+            k: Number of products to return
+        
+        Returns:
+            List of (snapshot position, distance) pairs, nearest first; empty
+            if the product or attribute is not indexed or the product has no
+            value for the attribute
+        """
+        key = (position, attribute, direction, k)
+        with self._results_lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+        
+        row = self.row_of_position.get(position)
+        dim = self._dimension.get(attribute)
+        if row is None or dim is None or k <= 0 or np.isnan(self.raw[row, dim]):
+            return []
+        
+        result = self._search(self.points[row], dim, self.raw[row, dim], direction == "min", k)
+        with self._results_lock:
+            self._results[key] = result
+            while len(self._results) > self.RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return result
+    
+    def _search(
+        self,
+        query: np.ndarray,
+        dim: int,
+        threshold: float,
+        lower_is_better: bool,
+        k: int
+    ) -> List[Tuple[int, float]]:
+        """Best-first KD-tree search with the constraint applied to whole subtrees."""
+        best: List[Tuple[float, int]] = []  # max-heap of (-distance², row)
+        frontier = [(0.0, 0)]
+        query_values = query.tolist()
+        while frontier:
+            bound, node = heapq.heappop(frontier)
+            if len(best) == k and bound >= -best[0][0]:
+                break
+            # Skip subtrees where no product beats the threshold
+            if lower_is_better and not self._raw_low[node][dim] < threshold:
+                continue
+            if not lower_is_better and not self._raw_high[node][dim] > threshold:
+                continue
+            
+            left, right = self._children[node]
+            if left >= 0:
+                for child in (left, right):
+                    low, high = self._boxes[child]
+                    bound = 0.0
+                    for value, box_low, box_high in zip(query_values, low, high):
+                        gap = box_low - value if value < box_low else value - box_high if value > box_high else 0.0
+                        bound += gap * gap
+                    heapq.heappush(frontier, (bound, child))
+                continue
+            
+            start, end = self.starts[node], self.ends[node]
+            values = self.raw[start:end, dim]
+            eligible = values < threshold if lower_is_better else values > threshold
+            if not eligible.any():
+                continue
+            rows = np.flatnonzero(eligible) + start
+            offsets = self.points[rows] - query
+            distances = np.einsum("ij,ij->i", offsets, offsets)
+            if len(best) == k:
+                closer = distances < -best[0][0]
+                rows, distances = rows[closer], distances[closer]
+            for row, distance in zip(rows.tolist(), distances.tolist()):
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, row))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, row))
+        
+        return [
+            (int(self.positions[row]), float(np.sqrt(-negative)))
+            for negative, row in sorted(best, reverse=True)
+        ]
+
+
+def get_similarity_index(snapshot, category: Optional[str]) -> SimilarityIndex:
+    """Return the category's similarity index, building it on first use."""
+    return snapshot.cached(("similarity_index", category), lambda: SimilarityIndex.from_snapshot(snapshot, category))
+
+
+def find_reference_products(
+    snapshot,
+    product_ids: List[str],
+    attribute: Optional[str] = None,
+    direction: str = "min",
+    k: int = 3
+) -> Dict[str, Any]:
+    """
+    Find comparable products that beat each given product on one attribute.
+    
+    Args:
+        snapshot: Catalog snapshot
+        product_ids: Products to find references for
+        attribute: Attribute to beat; defaults to the product category's
+            weight attribute, i.e. "strictly lighter"
+        direction: "min" if lower values are better, "max" otherwise
+        k: References per product
+    
+    Returns:
+        Dict mapping product_id to {'attribute', 'value', 'references'}; each
+        reference carries product_id, name, value and distance
+    """
+    references = {}
+    for product_id in product_ids:
+        position = snapshot.position.get(product_id)
+        if position is None:
+            continue
+        index = get_similarity_index(snapshot, snapshot.categories[position])
+        target = attribute or next((a for a in WEIGHT_ATTRIBUTES if a in index.attributes), None)
+        if target is None:
+            continue
+        
+        matches = index.nearest_better(position, target, direction, k)
+        references[product_id] = {
+            "attribute": target,
+            "value": snapshot.attributes[position].get(target),
+            "references": [
+                {
+                    "product_id": snapshot.product_ids[match],
+                    "name": snapshot.names[match],
+                    "value": snapshot.attributes[match].get(target),
+                    "distance": round(distance, 4)
+                }
+                for match, distance in matches
+            ]
+        }
+    return references
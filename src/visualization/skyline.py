@@ -0,0 +1,100 @@
+"""Pareto skyline (non-dominated set) computation over numeric attributes."""
+from typing import List
+import numpy as np
+
+
+def _dominated_by(
+    candidates: np.ndarray,
+    candidate_sums: np.ndarray,
+    reference: np.ndarray,
+    reference_sums: np.ndarray,
+    max_cells: int = 4_000_000
+) -> np.ndarray:
+    """
+    Flag candidate rows dominated by any reference row (minimization).
+    
+    A reference row that is <= a candidate on every dimension dominates it
+    unless the two rows are equal, and two such rows are equal exactly when
+    their coordinate sums are equal, so one comparison per dimension plus a
+    sum comparison decides dominance.
+    """
+    dominated = np.zeros(len(candidates), dtype=bool)
+    if len(candidates) == 0 or len(reference) == 0:
+        return dominated
+    rows_per_chunk = max(1, max_cells // len(reference))
+    for start in range(0, len(candidates), rows_per_chunk):
+        chunk = candidates[start:start + rows_per_chunk]
+        le = reference_sums[None, :] < candidate_sums[start:start + rows_per_chunk, None]
+        for j in range(candidates.shape[1]):
+            le &= reference[None, :, j] <= chunk[:, None, j]
+        dominated[start:start + rows_per_chunk] = le.any(axis=1)
+    return dominated
+
+
+def compute_skyline(matrix: np.ndarray, directions: List[str], block_size: int = 512) -> np.ndarray:
+    """
+    Compute the Pareto skyline of a products × attributes matrix.
+    
+    Uses sort-filter-skyline: rows are oriented so lower is better, presorted
+    by the sum of their min-max normalized values (a dominating row always
+    sorts before the rows it dominates), then scanned in blocks. Each block is
+    filtered against the skyline found so far and against itself with
+    vectorized dominance tests, and its survivors join the skyline. The
+    skyline of the first block is strong enough to prune most of the
+    remaining rows in one pass before the block scan continues.
+    
+    Args:
+        matrix: Float matrix of shape (products, attributes); NaN is treated
+            as the worst possible value
+        directions: "min" or "max" per attribute, the preferred direction
+        block_size: Rows compared per vectorized step
+    
+    Returns:
+        Sorted row indices of the non-dominated products
+    """
+    if matrix.shape[0] == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    oriented = np.where(np.array([d == "max" for d in directions]), -matrix, matrix).astype(np.float64)
+    
+    # Missing values rank below every real value of their column
+    finite = np.where(np.isnan(oriented), -np.inf, oriented)
+    worst = finite.max(axis=0, initial=0.0)
+    oriented = np.where(np.isnan(oriented), worst + 1.0, oriented)
+    
+    # Normalizing keeps dominance intact and makes the presort key balanced
+    low = oriented.min(axis=0)
+    span = oriented.max(axis=0) - low
+    normalized = (oriented - low) / np.where(span > 0, span, 1.0)
+    sums = normalized.sum(axis=1)
+    order = np.argsort(sums, kind="stable")
+    presorted = normalized[order]
+    presorted_sums = sums[order]
+    
+    remaining = np.arange(len(presorted))
+    skyline_rows: List[np.ndarray] = []
+    skyline = np.empty((0, presorted.shape[1]))
+    skyline_sums = np.empty(0)
+    first_block = True
+    while len(remaining):
+        block_index, remaining = remaining[:block_size], remaining[block_size:]
+        block, block_sums = presorted[block_index], presorted_sums[block_index]
+        
+        keep = ~_dominated_by(block, block_sums, skyline, skyline_sums)
+        block, block_sums, block_index = block[keep], block_sums[keep], block_index[keep]
+        keep = ~_dominated_by(block, block_sums, block, block_sums)
+        block, block_sums, block_index = block[keep], block_sums[keep], block_index[keep]
+        
+        if len(block):
+            skyline = np.vstack([skyline, block])
+            skyline_sums = np.concatenate([skyline_sums, block_sums])
+            skyline_rows.append(block_index)
+        
+        if first_block and len(remaining):
+            first_block = False
+            keep = ~_dominated_by(presorted[remaining], presorted_sums[remaining], skyline, skyline_sums)
+            remaining = remaining[keep]
+    
+    if not skyline_rows:
+        return np.empty(0, dtype=np.int64)
+    return np.sort(order[np.concatenate(skyline_rows)])
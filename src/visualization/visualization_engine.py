@@ -1,10 +1,173 @@
 """Visualization engine for rendering visual effects."""
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 from src.schemas.visualization import VisualEffect, VisualizationResponse
 
 
+EffectGenerator = Callable[[List[str], List[str], Dict[str, Any]], Dict[str, Any]]
+
+
+def _primary_images(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Derivative URLs of each product's main image (or first image)."""
+    primary = {}
+    for product_id, entries in (data.get("image_derivatives") or {}).items():
+        main = [entry for entry in entries if entry["asset_type"] == "main_image"]
+        primary[product_id] = (main or entries)[0]
+    return primary
+
+
+def _split_screen(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Side-by-side layout of all products."""
+    return {
+        "type": "split_screen",
+        "products": product_ids,
+        "layout": "side_by_side"
+    }
+
+
+def _highlight_differences(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Highlight attributes whose values differ between products."""
+    pareto = data.get("pareto") or {}
+    differences = data.get("differences") or {}
+    return {
+        "type": "highlight",
+        "target": "differences",
+        "attributes": attributes,
+        "differing_attributes": differences.get("differing_attributes", []),
+        "differences": differences.get("attributes", {}),
+        **({"focus_products": pareto["frontier"]} if pareto else {})
+    }
+
+
+def _highlight_materials(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Highlight material attributes."""
+    return {
+        "type": "highlight",
+        "target": "materials",
+        "attributes": [attr for attr in attributes if "material" in attr.lower()],
+        "images": {
+            product_id: {"thumbnail": image["thumbnail"], "crops": image["crops"]}
+            for product_id, image in _primary_images(data).items()
+        }
+    }
+
+
+def _zoom_earcup_frame(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Zoom into the earcup frame."""
+    return {
+        "type": "zoom",
+        "target": "earcup_frame",
+        "magnification": 1.5,
+        # Precomputed crop of the target where available; otherwise the client
+        # magnifies the WebP variant
+        "images": {
+            product_id: {
+                "crop": image["crops"].get("earcup_frame"),
+                "thumbnail": image["thumbnail"],
+                "full": image["webp"]
+            }
+            for product_id, image in _primary_images(data).items()
+        }
+    }
+
+
+def _show_spec_callouts(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Callouts for the selected specs."""
+    return {
+        "type": "callout",
+        "target": "specs",
+        "attributes": attributes
+    }
+
+
+def _weight_label(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Weight label in the top right corner."""
+    return {
+        "type": "label",
+        "target": "weight",
+        "position": "top_right"
+    }
+
+
+def _comfort_indicator(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Comfort indicator over comfort-related attributes."""
+    return {
+        "type": "indicator",
+        "target": "comfort",
+        "attributes": [attr for attr in attributes if attr in ["weight", "clamp_force", "padding_material"]]
+    }
+
+
+def _comparison_vs_lighter(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare against comparable lighter products."""
+    return {
+        "type": "comparison",
+        "target": "weight_comparison",
+        "reference": "lighter_products",
+        "reference_products": data.get("lighter_alternatives", {})
+    }
+
+
+def _highlight_travel_specs(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Highlight travel-related specs."""
+    return {
+        "type": "highlight",
+        "target": "travel_specs",
+        "attributes": [attr for attr in attributes if attr in ["weight", "foldability", "battery_life", "case_size"]]
+    }
+
+
+def _dim_irrelevant_specs(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Dim everything except the selected attributes."""
+    return {
+        "type": "dim",
+        "target": "irrelevant",
+        "keep_highlighted": attributes
+    }
+
+
+def _pareto_frontier(product_ids: List[str], attributes: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Highlight the Pareto-optimal products."""
+    pareto = data.get("pareto") or {}
+    return {
+        "type": "highlight",
+        "target": "pareto_frontier",
+        "products": pareto.get("frontier", []),
+        "dominated_products": pareto.get("dominated", []),
+        "attributes": pareto.get("attributes", []),
+        "directions": pareto.get("directions", {})
+    }
+
+
 class VisualizationEngine:
-    """Engine for generating visualization data."""
+    """
+    Engine for generating visualization data.
+    
+    Each effect has a generator registered once in ``EFFECT_GENERATORS``,
+    called with the product IDs, the selected attributes and the computed
+    visualization data; unregistered effects get an "unknown" payload.
+    """
+    
+    EFFECT_GENERATORS: Dict[VisualEffect, EffectGenerator] = {
+        VisualEffect.SPLIT_SCREEN: _split_screen,
+        VisualEffect.HIGHLIGHT_DIFFERENCES: _highlight_differences,
+        VisualEffect.HIGHLIGHT_MATERIALS: _highlight_materials,
+        VisualEffect.ZOOM_EARCUP_FRAME: _zoom_earcup_frame,
+        VisualEffect.SHOW_SPEC_CALLOUTS: _show_spec_callouts,
+        VisualEffect.WEIGHT_LABEL: _weight_label,
+        VisualEffect.COMFORT_INDICATOR: _comfort_indicator,
+        VisualEffect.COMPARISON_VS_LIGHTER: _comparison_vs_lighter,
+        VisualEffect.HIGHLIGHT_TRAVEL_SPECS: _highlight_travel_specs,
+        VisualEffect.DIM_IRRELEVANT_SPECS: _dim_irrelevant_specs,
+        VisualEffect.PARETO_FRONTIER: _pareto_frontier
+    }
+    
+    # visualization_data entries an effect's payload carries in full; when the
+    # effect is applied they are left out of the top level, so each is sent once
+    EFFECT_DATA_KEYS: Dict[VisualEffect, str] = {
+        VisualEffect.HIGHLIGHT_DIFFERENCES: "differences",
+        VisualEffect.COMPARISON_VS_LIGHTER: "lighter_alternatives",
+        VisualEffect.PARETO_FRONTIER: "pareto"
+    }
     
     def apply_visual_effects(
         self,
@@ -17,21 +180,24 @@ class VisualizationEngine:
             visualization_response: VisualizationResponse with products and effects
         
         Returns:
-            Enhanced visualization data with effect instructions
+            Enhanced visualization data with effect instructions, without the
+            entries an applied effect carries (see EFFECT_DATA_KEYS); the
+            input data is shared, not copied
         """
-        visualization_data = visualization_response.visualization_data.copy()
-        visualization_data["effects"] = []
-        
-        for effect in visualization_response.visual_effects:
-            effect_data = self._generate_effect_data(
-                effect,
-                visualization_response.product_ids,
-                visualization_response.selected_attributes,
-                visualization_data
-            )
-            visualization_data["effects"].append(effect_data)
-        
-        return visualization_data
+        visualization_data = visualization_response.visualization_data
+        carried = {self.EFFECT_DATA_KEYS.get(effect) for effect in visualization_response.visual_effects}
+        return {
+            **{key: value for key, value in visualization_data.items() if key not in carried},
+            "effects": [
+                self._generate_effect_data(
+                    effect,
+                    visualization_response.product_ids,
+                    visualization_response.selected_attributes,
+                    visualization_data
+                )
+                for effect in visualization_response.visual_effects
+            ]
+        }
     
     def _generate_effect_data(
         self,
@@ -41,58 +207,7 @@ class VisualizationEngine:
         visualization_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate data for a specific visual effect."""
-        effect_map = {
-            VisualEffect.SPLIT_SCREEN: {
-                "type": "split_screen",
-                "products": product_ids,
-                "layout": "side_by_side"
-            },
-            VisualEffect.HIGHLIGHT_DIFFERENCES: {
-                "type": "highlight",
-                "target": "differences",
-                "attributes": attributes
-            },
-            VisualEffect.HIGHLIGHT_MATERIALS: {
-                "type": "highlight",
-                "target": "materials",
-                "attributes": [attr for attr in attributes if "material" in attr.lower()]
-            },
-            VisualEffect.ZOOM_EARCUP_FRAME: {
-                "type": "zoom",
-                "target": "earcup_frame",
-                "magnification": 1.5
-            },
-            VisualEffect.SHOW_SPEC_CALLOUTS: {
-                "type": "callout",
-                "target": "specs",
-                "attributes": attributes
-            },
-            VisualEffect.WEIGHT_LABEL: {
-                "type": "label",
-                "target": "weight",
-                "position": "top_right"
-            },
-            VisualEffect.COMFORT_INDICATOR: {
-                "type": "indicator",
-                "target": "comfort",
-                "attributes": [attr for attr in attributes if attr in ["weight", "clamp_force", "padding_material"]]
-            },
-            VisualEffect.COMPARISON_VS_LIGHTER: {
-                "type": "comparison",
-                "target": "weight_comparison",
-                "reference": "lighter_products"
-            },
-            VisualEffect.HIGHLIGHT_TRAVEL_SPECS: {
-                "type": "highlight",
-                "target": "travel_specs",
-                "attributes": [attr for attr in attributes if attr in ["weight", "foldability", "battery_life", "case_size"]]
-            },
-            VisualEffect.DIM_IRRELEVANT_SPECS: {
-                "type": "dim",
-                "target": "irrelevant",
-                "keep_highlighted": attributes
-            }
-        }
-        
-        return effect_map.get(effect, {"type": "unknown", "effect": str(effect)})
-
+        generator = self.EFFECT_GENERATORS.get(effect)
+        if generator is None:
+            return {"type": "unknown", "effect": str(effect)}
+        return generator(product_ids, attributes, visualization_data)